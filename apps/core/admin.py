@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import StudentInformation, OtpCode, Teacher
+from .models import StudentInformation, OtpCode, Teacher, OutboundMessage, UploadSession, SearchDocument
 
 
 @admin.register(StudentInformation)
@@ -11,11 +11,32 @@ class StudentInformationAdmin(admin.ModelAdmin):
 
 @admin.register(OtpCode)
 class OtpCodeAdmin(admin.ModelAdmin):
-    list_display = ("user", "code", "create_at")   # Fields displayed in list view
-    search_fields = ("user__username", "code")   # Searchable fields in admin
+    list_display = ("phone_number", "code", "attempts", "create_at")   # Fields displayed in list view
+    search_fields = ("phone_number", "code")   # Searchable fields in admin
 
 
 @admin.register(Teacher)
 class TeacherAdmin(admin.ModelAdmin):
     list_display = ("full_name",)   # Fields displayed in list view
     search_fields = ("full_name",)  # Searchable fields in admin
+
+
+@admin.register(OutboundMessage)
+class OutboundMessageAdmin(admin.ModelAdmin):
+    list_display = ("phone_number", "provider", "status", "attempts", "next_attempt_at", "sent_at")
+    search_fields = ("phone_number",)
+    list_filter = ("status", "provider")
+
+
+@admin.register(UploadSession)
+class UploadSessionAdmin(admin.ModelAdmin):
+    list_display = ("filename", "target", "user", "offset", "size", "status", "expires_at")
+    search_fields = ("filename", "user__username")
+    list_filter = ("status", "target")
+
+
+@admin.register(SearchDocument)
+class SearchDocumentAdmin(admin.ModelAdmin):
+    list_display = ("title", "doc_type", "object_id", "update_at")
+    search_fields = ("title",)
+    list_filter = ("doc_type",)
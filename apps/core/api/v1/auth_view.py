@@ -1,102 +1,108 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import User
-from ...models import OtpCode, StudentInformation
-from rest_framework.permissions import IsAuthenticated
-from rest_framework_simplejwt.tokens import RefreshToken
+from django.db.models import Exists, OuterRef
+from ...models import StudentInformation
+from ...otp import get_otp_store, VERIFIED, EXPIRED, MISSING, LOCKED
+from ...authentication import CachedJWTAuthentication, AuthRefreshToken
+from ...metrics import OTP_REQUESTS
+from ...ratelimit import IPRateThrottle, PhoneNumberRateThrottle, get_rate_limiter
+from ...sms.queue import enqueue_sms
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 import random
 import string
-from django.utils import timezone
-import requests  # Placeholder for SMS service
 
 
-class SendOtpView(APIView):
+class OtpView(APIView):
+    """
+    Base of the OTP views: rate limited per IP and phone number, outcomes counted in OTP_REQUESTS.
+    """
+    throttle_classes = [IPRateThrottle, PhoneNumberRateThrottle]
+
+    def throttled(self, request, wait):
+        OTP_REQUESTS.inc(self.throttle_scope, 'throttled')
+        super().throttled(request, wait)
+
+
+class SendOtpView(OtpView):
+    throttle_scope = 'send_otp'
+
     def post(self, request):
         phone_number = request.data.get('phone_number')
         if not phone_number:
+            OTP_REQUESTS.inc(self.throttle_scope, 'bad_request')
             return Response({'error': 'Phone number is required'}, status=status.HTTP_400_BAD_REQUEST)
 
-        # Check if user exists or create new
-        try:
-            user = User.objects.get(username=phone_number)
-        except User.DoesNotExist:
-            user = User.objects.create_user(
-                username=phone_number,
-                password=''.join(random.choices(string.ascii_letters + string.digits, k=12))
-            )
+        # The user row is only created once the OTP is verified (see VerifyOtpView)
 
         # Generate 6-digit OTP
         otp_code = ''.join(random.choices(string.digits, k=6))
 
-        # Save or update OTP
-        OtpCode.objects.update_or_create(
-            user=user,
-            defaults={'code': otp_code, 'create_at': timezone.now()}
-        )
+        # Save or replace OTP
+        get_otp_store().issue(phone_number, otp_code)
 
-        # Placeholder for SMS sending
-        try:
-            # Replace with your SMS service provider API
-            sms_response = requests.post(
-                'YOUR_SMS_PROVIDER_API',
-                data={'phone': phone_number, 'message': f'Your OTP code is: {otp_code}'}
-            )
-            if sms_response.status_code != 200:
-                return Response({'error': 'Failed to send OTP'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-        except Exception as e:
-            return Response({'error': f'SMS sending failed: {str(e)}'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        # Queue the SMS; delivery happens in the `run_sms_worker` process
+        enqueue_sms(phone_number, f'Your OTP code is: {otp_code}')
 
+        OTP_REQUESTS.inc(self.throttle_scope, 'sent')
         return Response({'message': 'OTP sent successfully'}, status=status.HTTP_200_OK)
 
 
-class VerifyOtpView(APIView):
+class VerifyOtpView(OtpView):
+    throttle_scope = 'verify_otp'
+
     def post(self, request):
         phone_number = request.data.get('phone_number')
         code = request.data.get('code')
 
         if not phone_number or not code:
+            OTP_REQUESTS.inc(self.throttle_scope, 'bad_request')
             return Response({'error': 'Phone number and code are required'}, status=status.HTTP_400_BAD_REQUEST)
 
-        try:
-            user = User.objects.get(username=phone_number)
-            otp = OtpCode.objects.get(user=user)
-
-            if not otp.is_valid():
-                return Response({'error': 'OTP expired'}, status=status.HTTP_400_BAD_REQUEST)
-
-            if otp.code != code:
-                return Response({'error': 'Invalid OTP'}, status=status.HTTP_400_BAD_REQUEST)
-
-            # Generate tokens
-            refresh = RefreshToken.for_user(user)
-
-            # Check if user is admin
-            is_admin = user.is_staff or user.is_superuser
-
-            # Check if student information exists
-            has_student_info = StudentInformation.objects.filter(user=user).exists()
-
-            # Delete OTP after successful verification
-            otp.delete()
+        # Check and consume the OTP before touching the user table
+        result = get_otp_store().verify(phone_number, code)
+        OTP_REQUESTS.inc(self.throttle_scope, result)
+        if result == MISSING:
+            return Response({'error': 'No OTP found'}, status=status.HTTP_404_NOT_FOUND)
+        if result == EXPIRED:
+            return Response({'error': 'OTP expired'}, status=status.HTTP_400_BAD_REQUEST)
+        if result == LOCKED:
+            return Response({'error': 'Too many attempts, request a new OTP'}, status=status.HTTP_429_TOO_MANY_REQUESTS)
+        if result != VERIFIED:
+            return Response({'error': 'Invalid OTP'}, status=status.HTTP_400_BAD_REQUEST)
 
-            response_data = {
-                'refresh': str(refresh),
-                'access': str(refresh.access_token),
-                'user': {
-                    'id': user.id,
-                    'username': user.username,
-                    'is_admin': is_admin,
-                    'has_student_info': has_student_info
-                }
+        try:
+            # Load the user and whether student information exists in a single query
+            user = User.objects.annotate(
+                has_student_info=Exists(StudentInformation.objects.filter(user=OuterRef('pk')))
+            ).get(username=phone_number)
+        except User.DoesNotExist:
+            # First successful login for this phone number. The password is unusable,
+            # so no password hashing runs here.
+            user, _ = User.objects.get_or_create(username=phone_number, defaults={'password': make_password(None)})
+            user.has_student_info = False
+
+        # Generate tokens (carrying the claims CachedJWTAuthentication needs to skip the user query)
+        refresh = AuthRefreshToken.for_user(user)
+
+        # Check if user is admin
+        is_admin = user.is_staff or user.is_superuser
+
+        response_data = {
+            'refresh': str(refresh),
+            'access': str(refresh.access_token),
+            'user': {
+                'id': user.id,
+                'username': user.username,
+                'is_admin': is_admin,
+                'has_student_info': user.has_student_info
             }
+        }
 
-            return Response(response_data, status=status.HTTP_200_OK)
-
-        except User.DoesNotExist:
-            return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
-        except OtpCode.DoesNotExist:
-            return Response({'error': 'No OTP found'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(response_data, status=status.HTTP_200_OK)
 
 
 class RefreshTokenView(APIView):
@@ -106,7 +112,7 @@ class RefreshTokenView(APIView):
             return Response({'error': 'Refresh token is required'}, status=status.HTTP_400_BAD_REQUEST)
 
         try:
-            refresh = RefreshToken(refresh_token)
+            refresh = AuthRefreshToken(refresh_token)
             access_token = str(refresh.access_token)
             return Response({'access': access_token}, status=status.HTTP_200_OK)
         except Exception as e:
@@ -122,9 +128,24 @@ class LogoutView(APIView):
             if not refresh_token:
                 return Response({'error': 'Refresh token is required'}, status=status.HTTP_400_BAD_REQUEST)
 
-            token = RefreshToken(refresh_token)
+            token = AuthRefreshToken(refresh_token)
             token.blacklist()  # Invalidate refresh token
 
             return Response({'message': 'Successfully logged out'}, status=status.HTTP_205_RESET_CONTENT)
         except Exception as e:
-            return Response({'error': 'Invalid token'}, status=status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+            return Response({'error': 'Invalid token'}, status=status.HTTP_400_BAD_REQUEST)
+
+
+class RateLimitStatsView(APIView):
+    """
+    Admin-only view of the configured auth rate limits and how many requests each has rejected.
+    """
+    authentication_classes = [CachedJWTAuthentication]
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        stats = {}
+        for scope in settings.RATE_LIMIT['RATES']:
+            limiter = get_rate_limiter(scope)
+            stats[scope] = {'rate': limiter.rate, 'dropped': limiter.dropped}
+        return Response(stats, status=status.HTTP_200_OK)
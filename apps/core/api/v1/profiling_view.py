@@ -0,0 +1,32 @@
+import os
+
+from rest_framework import status
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from ...authentication import CachedJWTAuthentication
+from ...profiling import get_aggregate, profiling_setting
+
+
+class ProfilingStatsView(APIView):
+    """
+    Admin-only view of the per-view request profiles (settings.PROFILING) of the process that answers:
+    p50/p95/max of total, database and serializer time and of the query count, and the N+1 suspects.
+    DELETE starts a new window.
+    """
+    authentication_classes = [CachedJWTAuthentication]
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        aggregate = get_aggregate()
+        return Response({
+            'enabled': profiling_setting('ENABLED'),
+            'pid': os.getpid(),
+            'since': aggregate.since,
+            'views': aggregate.snapshot(),
+        }, status=status.HTTP_200_OK)
+
+    def delete(self, request):
+        get_aggregate().reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
@@ -1,7 +1,10 @@
 from django.urls import path
 from rest_framework.routers import DefaultRouter
 
-from apps.core.api.v1.auth_view import SendOtpView, RefreshTokenView, LogoutView, VerifyOtpView
+from apps.core.api.v1.auth_view import SendOtpView, RefreshTokenView, LogoutView, VerifyOtpView, RateLimitStatsView
+from apps.core.api.v1.profiling_view import ProfilingStatsView
+from apps.core.api.v1.search_view import SearchView
+from apps.core.api.v1.upload_view import UploadCreateView, UploadSessionView
 from apps.core.api.v1.view import StudentInformationAdminAPIView, StudentInformationUserAPIView, TeacherPublicAPIView, \
     TeacherAdminAPIView
 
@@ -18,6 +21,11 @@ urlpatterns = [
     path('auth/verify-otp/', VerifyOtpView.as_view(), name='verify_otp'),
     path('auth/refresh-token/', RefreshTokenView.as_view(), name='refresh_token'),
     path('auth/logout/', LogoutView.as_view(), name='logout'),
+    path('auth/rate-limit-stats/', RateLimitStatsView.as_view(), name='rate_limit_stats'),
+    path('admin/uploads/', UploadCreateView.as_view(), name='upload_create'),
+    path('admin/uploads/<uuid:token>/', UploadSessionView.as_view(), name='upload_session'),
+    path('search/', SearchView.as_view(), name='search'),
+    path('admin/profiling/', ProfilingStatsView.as_view(), name='profiling_stats'),
 ]
 
 urlpatterns += router.urls
@@ -0,0 +1,48 @@
+from rest_framework import status
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from ...authentication import CachedJWTAuthentication
+from ...search import query_terms, search, search_setting
+
+
+class SearchView(APIView):
+    """
+    Ranked full-text search across courses, lessons, FAQs and textbooks:
+    GET ?q=<text>[&type=course&type=lesson][&limit=20].
+    Document types marked AUTHENTICATED in settings.SEARCH (textbooks) are only searched for signed-in users.
+    """
+    authentication_classes = [CachedJWTAuthentication]
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        text = request.query_params.get('q', '')
+        if not query_terms(text):
+            return Response({'error': 'Query must contain at least one word'}, status=status.HTTP_400_BAD_REQUEST)
+
+        documents = search_setting('DOCUMENTS')
+        doc_types = request.query_params.getlist('type') or list(documents)
+        unknown = [doc_type for doc_type in doc_types if doc_type not in documents]
+        if unknown:
+            return Response(
+                {'error': f'Unknown type(s): {", ".join(unknown)}. Use {", ".join(documents)}'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if not request.user.is_authenticated:
+            doc_types = [doc_type for doc_type in doc_types if not documents[doc_type].get('AUTHENTICATED')]
+
+        try:
+            limit = int(request.query_params.get('limit', search_setting('LIMIT')))
+        except ValueError:
+            return Response({'error': 'Limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        limit = max(1, min(limit, search_setting('MAX_LIMIT')))
+
+        results = search(text, doc_types, limit) if doc_types else []
+        return Response({
+            'query': text,
+            'results': [
+                {'type': document.doc_type, 'id': document.object_id, 'title': document.title, 'rank': document.rank}
+                for document in results
+            ],
+        })
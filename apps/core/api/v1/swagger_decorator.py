@@ -265,12 +265,12 @@ admin_list_teacher_swagger = swagger_auto_schema(
     operation_description=(
         'This endpoint allows administrators to retrieve a list of all teacher records in the system. '
         'The response includes details for each teacher, such as ID, user, and other teacher information. '
-        'Optional search functionality is available using the "search" query parameter to filter by user username. '
+        'Optional search functionality is available using the "search" query parameter to filter by full name. '
         'This operation is restricted to admin users only and requires JWT authentication.'
     ),
     tags=['admin.teacher'],
     manual_parameters=[
-        openapi.Parameter('search', openapi.IN_QUERY, description="Filter teachers by user username (partial match).", type=openapi.TYPE_STRING)
+        openapi.Parameter('search', openapi.IN_QUERY, description="Filter teachers by full name (partial match).", type=openapi.TYPE_STRING)
     ],
     responses={
         200: TeacherSerializer(many=True),
@@ -302,12 +302,12 @@ public_list_teacher_swagger = swagger_auto_schema(
     operation_description=(
         'This endpoint allows public access to retrieve a list of all teacher records in the system. '
         'The response includes details for each teacher, such as ID, user, and other teacher information. '
-        'Optional search functionality is available using the "search" query parameter to filter by user username. '
+        'Optional search functionality is available using the "search" query parameter to filter by full name. '
         'No authentication is required for this operation.'
     ),
     tags=['public.teacher'],
     manual_parameters=[
-        openapi.Parameter('search', openapi.IN_QUERY, description="Filter teachers by user username (partial match).", type=openapi.TYPE_STRING)
+        openapi.Parameter('search', openapi.IN_QUERY, description="Filter teachers by full name (partial match).", type=openapi.TYPE_STRING)
     ],
     responses={
         200: TeacherSerializer(many=True)
@@ -0,0 +1,97 @@
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from ...authentication import CachedJWTAuthentication
+from ...models import UploadSession
+from ...uploads import UploadError, abort_upload, start_upload, upload_setting, write_chunk
+
+
+def session_response(session, status_code=status.HTTP_200_OK):
+    """
+    Session state in the body and in tus-style `Upload-Offset` / `Upload-Length` headers.
+    """
+    response = Response({
+        'token': session.token,
+        'target': session.target,
+        'filename': session.filename,
+        'size': session.size,
+        'offset': session.offset,
+        'status': session.status,
+        'chunk_size': upload_setting('CHUNK_SIZE'),
+        'expires_at': session.expires_at,
+    }, status=status_code)
+    response['Upload-Offset'] = session.offset
+    response['Upload-Length'] = session.size
+    response['Cache-Control'] = 'no-store'
+    return response
+
+
+class UploadCreateView(APIView):
+    """
+    Start a resumable upload: POST {"target": "textbook.pdf_file", "filename": "...", "size": <bytes>}.
+    """
+    authentication_classes = [CachedJWTAuthentication]
+    permission_classes = [IsAdminUser]
+
+    def post(self, request):
+        target = request.data.get('target')
+        filename = request.data.get('filename')
+        try:
+            size = int(request.data.get('size'))
+        except (TypeError, ValueError):
+            return Response({'error': 'Target, filename and size are required'}, status=status.HTTP_400_BAD_REQUEST)
+        if not target or not filename:
+            return Response({'error': 'Target, filename and size are required'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            session = start_upload(request.user, target, filename, size)
+        except UploadError as e:
+            return Response({'error': str(e)}, status=e.status)
+
+        response = session_response(session, status.HTTP_201_CREATED)
+        response['Location'] = reverse('upload_session', args=[session.token])
+        return response
+
+
+class UploadSessionView(APIView):
+    """
+    GET/HEAD: current offset, to resume after a dropped connection.
+    PATCH: append one chunk. The body is the raw bytes, `Upload-Offset` must equal the current offset
+    and `Upload-Checksum: sha256 <base64>` must match the chunk.
+    DELETE: abort the upload.
+    """
+    authentication_classes = [CachedJWTAuthentication]
+    permission_classes = [IsAdminUser]
+
+    def get_session(self, request, token):
+        return get_object_or_404(UploadSession, token=token, user=request.user)
+
+    def get(self, request, token):
+        return session_response(self.get_session(request, token))
+
+    def patch(self, request, token):
+        session = self.get_session(request, token)
+        try:
+            offset = int(request.headers['Upload-Offset'])
+            length = int(request.headers['Content-Length'])
+        except (KeyError, ValueError):
+            return Response(
+                {'error': 'Upload-Offset and Content-Length headers are required'}, status=status.HTTP_400_BAD_REQUEST
+            )
+        if 'Upload-Checksum' not in request.headers:
+            return Response({'error': 'Upload-Checksum header is required'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            # Read from the request stream into a spooled file; the chunk is never held in memory as a whole
+            session = write_chunk(session, offset, length, request.stream, request.headers['Upload-Checksum'])
+        except UploadError as e:
+            return Response({'error': str(e)}, status=e.status)
+        return session_response(session)
+
+    def delete(self, request, token):
+        abort_upload(self.get_session(request, token))
+        return Response(status=status.HTTP_204_NO_CONTENT)
@@ -2,7 +2,8 @@ from django.utils.decorators import method_decorator
 from rest_framework import filters
 from rest_framework.viewsets import ModelViewSet, ReadOnlyModelViewSet
 from rest_framework.permissions import IsAdminUser, IsAuthenticated, AllowAny
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from apps.core.authentication import CachedJWTAuthentication
+from apps.core.conditional import ConditionalGetMixin
 from apps.core.models import StudentInformation, Teacher
 from apps.core.serializers import StudentInformationSerializer, TeacherSerializer
 from .swagger_decorator import (
@@ -35,9 +36,10 @@ class StudentInformationAdminAPIView(ModelViewSet):
     """
     Admin-only API ViewSet for managing StudentInformation records.
     """
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [CachedJWTAuthentication]
     permission_classes = [IsAdminUser]
     serializer_class = StudentInformationSerializer
+    cursor_ordering = '-id'
     queryset = StudentInformation.objects.all()
     filter_backends = [filters.SearchFilter]
     search_fields = ['user__username']
@@ -49,9 +51,10 @@ class StudentInformationUserAPIView(ReadOnlyModelViewSet):
     """
     Authenticated user API ViewSet for viewing own StudentInformation records.
     """
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [CachedJWTAuthentication]
     permission_classes = [IsAuthenticated]
     serializer_class = StudentInformationSerializer
+    cursor_ordering = '-id'
 
     def get_queryset(self):
         """
@@ -70,23 +73,25 @@ class TeacherAdminAPIView(ModelViewSet):
     """
     Admin-only API ViewSet for managing Teacher records.
     """
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [CachedJWTAuthentication]
     permission_classes = [IsAdminUser]
     serializer_class = TeacherSerializer
+    cursor_ordering = 'id'
     queryset = Teacher.objects.all()
     filter_backends = [filters.SearchFilter]
-    search_fields = ['user__username']
+    search_fields = ['full_name']
 
 
 @method_decorator(name='retrieve', decorator=public_retrieve_teacher_swagger)
 @method_decorator(name='list', decorator=public_list_teacher_swagger)
-class TeacherPublicAPIView(ReadOnlyModelViewSet):
+class TeacherPublicAPIView(ConditionalGetMixin, ReadOnlyModelViewSet):
     """
     Public API ViewSet for viewing Teacher records.
     """
     authentication_classes = []
     permission_classes = [AllowAny]
     serializer_class = TeacherSerializer
+    cursor_ordering = 'id'
     queryset = Teacher.objects.all()
     filter_backends = [filters.SearchFilter]
-    search_fields = ['user__username']
+    search_fields = ['full_name']
@@ -0,0 +1,213 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import router
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.core.blacklist import blacklist_checker
+from apps.core.metrics import JWT_AUTH_CACHE
+
+# Claims copied from the user into every token, so requests can be authorized without a query
+SNAPSHOT_CLAIMS = ('username', 'is_active', 'is_staff', 'is_superuser')
+
+
+def auth_cache_setting(key, default):
+    return getattr(settings, 'JWT_AUTH_CACHE', {}).get(key, default)
+
+
+class TokenUserCache:
+    """
+    Bounded, thread-safe LRU of raw access token -> (user field values, validated token).
+    Entries expire at the token's `exp` or after JWT_AUTH_CACHE['MAX_AGE'] seconds, whichever is first.
+    Only the field values are shared: every request builds its own User from them.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._entries = OrderedDict()  # raw token -> (user_fields, validated_token, expires_at)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, raw_token):
+        with self._lock:
+            entry = self._entries.get(raw_token)
+            if entry is None or entry[2] <= time.time():
+                if entry is not None:
+                    del self._entries[raw_token]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(raw_token)
+            self.hits += 1
+            return entry[0], entry[1]
+
+    def set(self, raw_token, user_fields, validated_token, expires_at):
+        with self._lock:
+            self._entries[raw_token] = (user_fields, validated_token, expires_at)
+            self._entries.move_to_end(raw_token)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def evict_user(self, user_id):
+        pk_name = get_user_model()._meta.pk.attname
+        with self._lock:
+            for raw_token in [key for key, entry in self._entries.items() if str(entry[0][pk_name]) == str(user_id)]:
+                del self._entries[raw_token]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+token_user_cache = TokenUserCache(auth_cache_setting('MAX_SIZE', 10_000))
+
+
+def _changed_key(user_id):
+    return f'jwt-auth:user-changed:{user_id}'
+
+
+def mark_user_changed(user_id):
+    """
+    Record that a user's flags may have changed. Tokens issued before now stop being trusted
+    for their claims and are checked against the database instead.
+    """
+    token_lifetime = max(api_settings.ACCESS_TOKEN_LIFETIME, api_settings.REFRESH_TOKEN_LIFETIME)
+    cache = caches[auth_cache_setting('CACHE_ALIAS', 'default')]
+    # Rounded up so a token issued in the same second as the change is not trusted
+    cache.set(_changed_key(user_id), math.ceil(time.time()), timeout=int(token_lifetime.total_seconds()))
+    token_user_cache.evict_user(user_id)
+
+
+def changes_are_shared():
+    """
+    Whether the change stamps are visible to every process. A local-memory cache is per process:
+    a stamp written by the worker that saved the user would never reach the others.
+    """
+    cache = caches[auth_cache_setting('CACHE_ALIAS', 'default')]
+    return not isinstance(cache, (LocMemCache, DummyCache))
+
+
+def user_changed_at(user_id):
+    cache = caches[auth_cache_setting('CACHE_ALIAS', 'default')]
+    return cache.get(_changed_key(user_id))
+
+
+class AuthRefreshToken(RefreshToken):
+    """
+    Refresh token used by the auth views.
+    Carries the username, active and admin flags, plus the time they were read; access tokens created
+    from it (including via the refresh endpoint) copy these claims. Blacklist lookups go through
+    blacklist_checker instead of querying the blacklist table on every refresh.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token['username'] = user.get_username()
+        token['is_active'] = user.is_active
+        token['is_staff'] = user.is_staff
+        token['is_superuser'] = user.is_superuser
+        token['auth_time'] = int(time.time())
+        return token
+
+    def check_blacklist(self):
+        if blacklist_checker.is_blacklisted(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_('Token is blacklisted'))
+
+    def blacklist(self):
+        result = super().blacklist()
+        blacklist_checker.add(self.payload[api_settings.JTI_CLAIM])
+        return result
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that avoids loading the User row on every request.
+
+    Validated tokens are kept in a per-process LRU, and users are built from the token claims
+    as partial User instances (other fields load lazily if accessed), a new instance for every
+    request so changes a view makes to `request.user` stay in that request. The database is used
+    instead when the token predates the claims, when the user was changed after the token
+    was issued (see mark_user_changed, called from the User save/delete signals), or when
+    CACHE_ALIAS is not shared between processes, so the change could not be seen here.
+    """
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        cached = token_user_cache.get(raw_token)
+        if cached is not None:
+            JWT_AUTH_CACHE.inc('hit')
+            user_fields, validated_token = cached
+            return self.build_user(user_fields), validated_token
+        JWT_AUTH_CACHE.inc('miss')
+
+        validated_token = self.get_validated_token(raw_token)
+        user_fields = self.get_user_fields(validated_token)
+
+        expires_at = min(validated_token['exp'], time.time() + auth_cache_setting('MAX_AGE', 60))
+        token_user_cache.set(raw_token, user_fields, validated_token, expires_at)
+        return self.build_user(user_fields), validated_token
+
+    def get_user(self, validated_token):
+        return self.build_user(self.get_user_fields(validated_token))
+
+    def get_user_fields(self, validated_token):
+        """
+        Field values (by attname) of the token's user: from the claims when they can be trusted,
+        otherwise from the database row.
+        """
+        if not self.can_trust_claims(validated_token):
+            user = super().get_user(validated_token)
+            return {field.attname: getattr(user, field.attname) for field in user._meta.concrete_fields}
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not validated_token['is_active']:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+
+        user_model = get_user_model()
+        # simplejwt may store the id as a string
+        user_id = user_model._meta.get_field(api_settings.USER_ID_FIELD).to_python(validated_token[api_settings.USER_ID_CLAIM])
+
+        snapshot = {claim: validated_token[claim] for claim in SNAPSHOT_CLAIMS}
+        snapshot[api_settings.USER_ID_FIELD] = user_id
+        return snapshot
+
+    def build_user(self, user_fields):
+        """
+        A new User instance holding `user_fields`.
+        """
+        user_model = get_user_model()
+        # from_db expects the values in model field order and marks the remaining fields as deferred,
+        # so save() only writes the loaded ones
+        field_names = [field.attname for field in user_model._meta.concrete_fields if field.attname in user_fields]
+        return user_model.from_db(
+            router.db_for_read(user_model), field_names, [user_fields[name] for name in field_names]
+        )
+
+    def can_trust_claims(self, validated_token):
+        if api_settings.CHECK_REVOKE_TOKEN or api_settings.USER_ID_CLAIM not in validated_token:
+            return False
+        if any(claim not in validated_token for claim in (*SNAPSHOT_CLAIMS, 'auth_time')):
+            return False
+        if not changes_are_shared():
+            return False
+
+        changed_at = user_changed_at(validated_token[api_settings.USER_ID_CLAIM])
+        return changed_at is None or validated_token['auth_time'] >= changed_at
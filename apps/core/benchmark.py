@@ -0,0 +1,223 @@
+import json
+import time
+
+from django.contrib.auth.models import AnonymousUser, User
+from django.db import connection, transaction
+from django.db.models import Count
+from django.test import Client, RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLResolver, get_resolver, reverse
+from django.utils.http import urlencode
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+
+from apps.core.authentication import AuthRefreshToken
+from apps.core.otp import get_otp_store
+from apps.core.profiling import percentile
+from apps.package.cache import get_catalog_cache
+from apps.package.images import variant_setting
+from apps.payment.models.subscription import Subscription
+
+API_PREFIX = 'api/v1/'
+OTP_CODE = '123456'
+
+
+def _verify_otp_body(i, users):
+    phone_number = f'0998{i:07d}'
+    get_otp_store().issue(phone_number, OTP_CODE)
+    return {'phone_number': phone_number, 'code': OTP_CODE}
+
+
+# Request bodies of the auth views. `i` is the iteration, so every request uses a fresh
+# phone number and token (throttles, single-use OTPs, blacklisted refresh tokens).
+AUTH_SCENARIOS = {
+    'send_otp': lambda i, users: {'phone_number': f'0999{i:07d}'},
+    'verify_otp': _verify_otp_body,
+    'refresh_token': lambda i, users: {'refresh': str(AuthRefreshToken.for_user(users['user']))},
+    'logout': lambda i, users: {'refresh': str(AuthRefreshToken.for_user(users['user']))},
+}
+
+# Query strings of the routes that answer 400 without one; the words occur in the synthetic data
+QUERY_STRINGS = {
+    'search': {'q': 'آموزش ریاضی'},
+}
+
+
+def walk(patterns, prefix=''):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from walk(pattern.url_patterns, prefix + str(pattern.pattern))
+        else:
+            yield prefix + str(pattern.pattern), pattern
+
+
+def discover_routes():
+    """
+    (route name, view class, {http method: action}, URL arguments) of every API route, without the
+    format-suffix duplicates and the router root views. Actions of plain APIViews are named after the method.
+    """
+    routes = []
+    for route, pattern in walk(get_resolver().url_patterns):
+        arguments = set(pattern.pattern.regex.groupindex)
+        if not route.lstrip('^').startswith(API_PREFIX) or 'format' in arguments or pattern.name == 'api-root':
+            continue
+        callback = pattern.callback
+        if hasattr(callback, 'actions'):
+            routes.append((pattern.name, callback.cls, dict(callback.actions), arguments))
+        else:
+            view_class = callback.view_class
+            methods = [method for method in ('get', 'post', 'put', 'patch', 'delete') if hasattr(view_class, method)]
+            routes.append((pattern.name, view_class, {method: method for method in methods}, arguments))
+    return routes
+
+
+def role_for(view_class):
+    permissions = [permission for permission in view_class.permission_classes if isinstance(permission, type)]
+    if any(issubclass(permission, IsAdminUser) for permission in permissions):
+        return 'admin'
+    if any(issubclass(permission, IsAuthenticated) for permission in permissions):
+        return 'user'
+    return 'anonymous'
+
+
+def sample_pk(view_class, action, user):
+    """
+    Primary key of the first object `user` can see through the view's queryset.
+    """
+    view = view_class(action_map={'get': action}, kwargs={}, format_kwarg=None)
+    view.request = view.initialize_request(RequestFactory().get('/'))
+    view.request.user = user
+    return view.get_queryset().order_by('pk').values_list('pk', flat=True).first()
+
+
+def benchmark_users():
+    """
+    An admin, a student with the most subscriptions and an anonymous client.
+    """
+    admin, _ = User.objects.get_or_create(username='benchmark-admin', defaults={'is_staff': True, 'is_superuser': True})
+    busiest = Subscription.objects.values('user').annotate(total=Count('id')).order_by('-total').first()
+    user = User.objects.get(pk=busiest['user']) if busiest else User.objects.get_or_create(username='benchmark-user')[0]
+    return {'admin': admin, 'user': user, 'anonymous': None}
+
+
+def build_scenarios(users, writes=False):
+    """
+    Requests to measure: every GET action, the auth views, and with `writes` an empty PATCH and a
+    DELETE of each detail route. Returns (scenarios, {key: why it was skipped}).
+    """
+    scenarios, skipped = [], {}
+    for name, view_class, actions, arguments in discover_routes():
+        role = role_for(view_class)
+        for method, action in actions.items():
+            key = f'{method.upper()} {name}'
+            if name in AUTH_SCENARIOS:
+                body = AUTH_SCENARIOS[name]
+            elif method == 'get' or (writes and action == 'destroy'):
+                body = None
+            elif writes and action == 'partial_update':
+                body = lambda i, users: {}
+            else:
+                skipped[key] = 'needs a request body' if writes or method == 'post' else 'write, see --writes'
+                continue
+
+            kwargs = {}
+            lookup = getattr(view_class, 'lookup_url_kwarg', None) or getattr(view_class, 'lookup_field', None)
+            if lookup in arguments:
+                kwargs[lookup] = sample_pk(view_class, action, users[role] or AnonymousUser())
+                if kwargs[lookup] is None:
+                    skipped[key] = 'no object to request'
+                    continue
+            if {'width', 'fmt'} <= arguments:
+                kwargs.update(width=variant_setting('WIDTHS')[0], fmt=variant_setting('FORMATS')[0])
+            if arguments - set(kwargs):
+                skipped[key] = f'cannot fill in {", ".join(sorted(arguments - set(kwargs)))}'
+                continue
+            path = reverse(name, kwargs=kwargs)
+            if name in QUERY_STRINGS:
+                path += '?' + urlencode(QUERY_STRINGS[name])
+            scenarios.append({'key': key, 'method': method, 'path': path, 'role': role, 'body': body})
+    return scenarios, skipped
+
+
+def measure(scenario, users, iterations, warmup=2, cold=False):
+    """
+    Send the scenario's request `warmup + iterations` times, each in a transaction that is rolled back.
+    `cold_queries` is the query count of the very first request (before any caching).
+    """
+    # Errors are recorded as a 500 status instead of aborting the run
+    client = Client(raise_request_exception=False)
+    headers = {'HTTP_ACCEPT': 'application/json'}
+    user = users[scenario['role']]
+    if user is not None:
+        headers['HTTP_AUTHORIZATION'] = f'Bearer {AuthRefreshToken.for_user(user).access_token}'
+
+    latencies, queries, sizes, statuses = [], [], [], set()
+    cold_queries = None
+    for i in range(warmup + iterations):
+        if cold:
+            # Before the body is made, in case CATALOG_CACHE and OTP_STORE share a cache alias
+            get_catalog_cache().clear()
+        body = scenario['body'](i, users) if scenario['body'] else None
+        # Auth views throttle per IP
+        headers['REMOTE_ADDR'] = f'10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}'
+
+        with transaction.atomic():
+            with CaptureQueriesContext(connection) as context:
+                started = time.perf_counter()
+                if body is None:
+                    response = client.generic(scenario['method'].upper(), scenario['path'], **headers)
+                else:
+                    response = client.generic(
+                        scenario['method'].upper(), scenario['path'], json.dumps(body),
+                        content_type='application/json', **headers,
+                    )
+                content = b''.join(response.streaming_content) if response.streaming else response.content
+                elapsed = time.perf_counter() - started
+            transaction.set_rollback(True)
+
+        if cold_queries is None:
+            cold_queries = len(context)
+        if i >= warmup:
+            latencies.append(elapsed * 1000)
+            queries.append(len(context))
+            sizes.append(len(content))
+            statuses.add(response.status_code)
+
+    return {
+        'path': scenario['path'],
+        'role': scenario['role'],
+        'status': sorted(statuses),
+        'queries': max(queries),
+        'cold_queries': cold_queries,
+        'bytes': max(sizes),
+        'latency_ms': {
+            'p50': round(percentile(latencies, 50), 2),
+            'p95': round(percentile(latencies, 95), 2),
+            'p99': round(percentile(latencies, 99), 2),
+            'max': round(max(latencies), 2),
+        },
+    }
+
+
+def compare(baseline, current, latency_tolerance=0.25, latency_floor_ms=1.0):
+    """
+    Regressions of `current` against `baseline` (two results of `benchmark_api --output`):
+    more queries, a changed status or a p95 latency more than `latency_tolerance` slower
+    (and by at least `latency_floor_ms`). Returns {endpoint key: [problem, ...]}.
+    """
+    regressions = {}
+    for key, new in current['endpoints'].items():
+        old = baseline['endpoints'].get(key)
+        if old is None:
+            continue
+        problems = []
+        if new['status'] != old['status']:
+            problems.append(f'status {old["status"]} -> {new["status"]}')
+        for field in ('queries', 'cold_queries'):
+            if new[field] > old[field]:
+                problems.append(f'{field} {old[field]} -> {new[field]}')
+        old_p95, new_p95 = old['latency_ms']['p95'], new['latency_ms']['p95']
+        if new_p95 > old_p95 * (1 + latency_tolerance) and new_p95 - old_p95 >= latency_floor_ms:
+            problems.append(f'p95 {old_p95}ms -> {new_p95}ms')
+        if problems:
+            regressions[key] = problems
+    return regressions
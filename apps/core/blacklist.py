@@ -0,0 +1,173 @@
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+VERSION_KEY = 'jwt-blacklist:version'
+# Versions further behind than this are caught up with a rebuild instead of reading the log
+MAX_LOG_READ = 1000
+
+
+def _log_key(version):
+    return f'jwt-blacklist:jti:{version}'
+
+
+def blacklist_setting(key, default):
+    return getattr(settings, 'JWT_BLACKLIST', {}).get(key, default)
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings. `in` may return false positives but never false negatives.
+    """
+
+    def __init__(self, capacity, error_rate):
+        self.capacity = capacity
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))  # Bits
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, value):
+        # Double hashing: two 64-bit halves of one digest give all k positions
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little')
+        return [(first + i * second) % self.size for i in range(self.hash_count)]
+
+    def add(self, value):
+        for position in self._positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, value):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+
+class BlacklistChecker:
+    """
+    Answers "is this refresh token JTI blacklisted?" without querying the blacklist table in the common case.
+
+    A per-process Bloom filter of blacklisted JTIs rules out most tokens in memory. Filter hits are
+    confirmed against the database and remembered in a small exact LRU. Every logout bumps a
+    version counter in the shared cache and stores its JTI under the new version once committed,
+    so other processes add the JTIs they missed before their next check. Row ids are not used:
+    they are handed out before commit, so a lower id can become visible after a higher one.
+    A missing log entry falls back to a rebuild, and the filter is rebuilt from scratch
+    periodically to drop pruned rows.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._filter = None
+        self._version = None
+        self._built_at = 0
+        self._exact = OrderedDict()  # jti -> bool, only for Bloom filter hits
+
+    @property
+    def cache(self):
+        return caches[blacklist_setting('CACHE_ALIAS', 'default')]
+
+    def is_blacklisted(self, jti):
+        self._refresh()
+
+        if jti not in self._filter:
+            return False
+
+        with self._lock:
+            if jti in self._exact:
+                self._exact.move_to_end(jti)
+                return self._exact[jti]
+
+        blacklisted = BlacklistedToken.objects.filter(token__jti=jti).exists()
+        self._remember(jti, blacklisted)
+        return blacklisted
+
+    def add(self, jti):
+        """
+        Record a newly blacklisted JTI locally and, once the row is committed, publish it to the other processes.
+        """
+        self._refresh()
+        with self._lock:
+            self._filter.add(jti)
+        self._remember(jti, True)
+        transaction.on_commit(lambda: self._publish(jti))
+
+    def _publish(self, jti):
+        self.cache.add(VERSION_KEY, 0, None)
+        try:
+            version = self.cache.incr(VERSION_KEY)
+        except ValueError:
+            version = 1
+            self.cache.set(VERSION_KEY, version, None)
+        # Every process rebuilds within REBUILD_INTERVAL, so older entries are never needed
+        self.cache.set(_log_key(version), jti, blacklist_setting('REBUILD_INTERVAL', 3600))
+
+        # Skip our own bump on the next check, unless another process bumped in between
+        with self._lock:
+            if version == (self._version or 0) + 1:
+                self._version = version
+
+    def rebuild(self):
+        """
+        Build a new filter from every row in the blacklist table.
+        """
+        # Read the version first: a logout published meanwhile is read again on the next check
+        version = self.cache.get(VERSION_KEY)
+        jtis = list(BlacklistedToken.objects.values_list('token__jti', flat=True))
+
+        bloom = BloomFilter(
+            capacity=max(1024, len(jtis) * 2),
+            error_rate=blacklist_setting('FALSE_POSITIVE_RATE', 0.01),
+        )
+        for jti in jtis:
+            bloom.add(jti)
+
+        with self._lock:
+            self._filter = bloom
+            self._version = version
+            self._built_at = time.monotonic()
+            self._exact.clear()
+
+    def _refresh(self):
+        if self._filter is None or time.monotonic() - self._built_at >= blacklist_setting('REBUILD_INTERVAL', 3600):
+            return self.rebuild()
+
+        version = self.cache.get(VERSION_KEY)
+        if version == self._version:
+            return
+
+        # The counter was lost or reset, or we are too far behind to read the log
+        known = self._version or 0
+        if version is None or not 0 < version - known <= MAX_LOG_READ:
+            return self.rebuild()
+        log = self.cache.get_many([_log_key(missed) for missed in range(known + 1, version + 1)])
+        if len(log) < version - known:
+            # Evicted, or bumped by a process that has not stored its JTI yet
+            return self.rebuild()
+
+        with self._lock:
+            for jti in log.values():
+                self._filter.add(jti)
+            self._version = version
+        for jti in log.values():
+            self._remember(jti, True)
+
+        # Keep the false positive rate near the target as the table grows
+        if self._filter.count > self._filter.capacity:
+            self.rebuild()
+
+    def _remember(self, jti, blacklisted):
+        with self._lock:
+            self._exact[jti] = blacklisted
+            self._exact.move_to_end(jti)
+            while len(self._exact) > blacklist_setting('EXACT_CACHE_SIZE', 1024):
+                self._exact.popitem(last=False)
+
+
+blacklist_checker = BlacklistChecker()
@@ -0,0 +1,131 @@
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from rest_framework import serializers, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+BULK_DEFAULTS = {
+    'MAX_ITEMS': 500,
+}
+
+
+def bulk_setting(key):
+    """
+    Read a value from settings.BULK, falling back to BULK_DEFAULTS.
+    """
+    return getattr(settings, 'BULK', {}).get(key, BULK_DEFAULTS[key])
+
+
+class BulkListSerializer(serializers.ListSerializer):
+    """
+    `many=True` serializer that writes with one bulk_create()/bulk_update() instead of a save() per item.
+    Validation errors come back as a list aligned with the payload, `{}` for the valid items.
+    For updates, pass the instances and give every item its `id`. Many-to-many fields are not supported.
+    """
+
+    def run_child_validation(self, data):
+        if self.instance is None:
+            return super().run_child_validation(data)
+
+        if not hasattr(self, '_by_pk'):
+            self._by_pk = {instance.pk: instance for instance in self.instance}
+            self._matched = []
+        pk = data.get('id') if isinstance(data, dict) else None
+        instance = self._by_pk.pop(pk, None) if isinstance(pk, int) else None
+        if instance is None:
+            # Unknown, missing or repeated id
+            raise serializers.ValidationError({'id': ['Not found.']})
+        self._matched.append(instance)
+
+        self.child.instance = instance
+        self.child.initial_data = data
+        return super().run_child_validation(data)
+
+    def create(self, validated_data):
+        model = self.child.Meta.model
+        objects = [model(**attrs) for attrs in validated_data]
+        for obj in objects:
+            obj.fill_defaults()
+        return model.objects.bulk_create(objects)
+
+    def update(self, instance, validated_data):
+        model = self.child.Meta.model
+        fields = {'update_at'}
+        for obj, attrs in zip(self._matched, validated_data):
+            for attr, value in attrs.items():
+                setattr(obj, attr, value)
+            obj.fill_defaults()
+            fields.update(attrs)
+        model.objects.bulk_update(self._matched, list(fields))
+        return self._matched
+
+
+class BulkModelMixin:
+    """
+    `bulk/` on a ModelViewSet whose serializer uses BulkListSerializer, all in one transaction:
+    POST a list of new rows, PATCH a list of partial rows with their `id`, DELETE a list of ids.
+    Nothing is written unless every item is valid; the response then has one error entry per item.
+
+    bulk_create()/bulk_update() send no model signals, so views redo that work in `bulk_refresh`,
+    called with the written pks and what `bulk_affected` returned for them before the write.
+    Deletes go through the regular collector, which still sends the per-row signals.
+    """
+
+    def bulk_affected(self, pks):
+        return None
+
+    def bulk_refresh(self, pks, affected):
+        pass
+
+    def get_bulk_serializer(self, *args, **kwargs):
+        return self.get_serializer(*args, many=True, max_length=bulk_setting('MAX_ITEMS'), **kwargs)
+
+    def conflict_response(self):
+        return Response(
+            {'error': 'The rows conflict with each other or with existing rows'}, status=status.HTTP_409_CONFLICT
+        )
+
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk_create(self, request):
+        serializer = self.get_bulk_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            with transaction.atomic():
+                instances = serializer.save()
+                pks = [instance.pk for instance in instances]
+                self.bulk_refresh(pks, self.bulk_affected(pks))
+        except IntegrityError:
+            return self.conflict_response()
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @bulk_create.mapping.patch
+    def bulk_update(self, request):
+        if not isinstance(request.data, list):
+            return Response({'error': 'Expected a list of items'}, status=status.HTTP_400_BAD_REQUEST)
+        pks = [item['id'] for item in request.data if isinstance(item, dict) and isinstance(item.get('id'), int)]
+        try:
+            with transaction.atomic():
+                instances = list(self.get_queryset().filter(pk__in=pks).select_for_update())
+                affected = self.bulk_affected(pks)
+                serializer = self.get_bulk_serializer(instances, data=request.data, partial=True)
+                serializer.is_valid(raise_exception=True)
+                serializer.save()
+                self.bulk_refresh(pks, affected)
+        except IntegrityError:
+            return self.conflict_response()
+        return Response(serializer.data)
+
+    @bulk_create.mapping.delete
+    def bulk_destroy(self, request):
+        field = serializers.ListField(
+            child=serializers.IntegerField(), allow_empty=False, max_length=bulk_setting('MAX_ITEMS')
+        )
+        pks = field.run_validation(request.data)
+        with transaction.atomic():
+            queryset = self.get_queryset().filter(pk__in=pks)
+            found = set(queryset.values_list('pk', flat=True))
+            errors = [{} if pk in found else {'id': ['Not found.']} for pk in pks]
+            if any(errors):
+                raise serializers.ValidationError(errors)
+            queryset.delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,27 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.db.backends.ddl_references import Statement
+
+
+class PostgresOnlyIndexMixin:
+    """
+    For indexes only PostgreSQL can build (GIN, operator classes such as gin_trgm_ops).
+    Other databases, e.g. SQLite in tests, skip them instead of failing the migration.
+    """
+
+    def create_sql(self, model, schema_editor, using='', **kwargs):
+        if schema_editor.connection.vendor != 'postgresql':
+            return self.skipped_sql()
+        return super().create_sql(model, schema_editor, using=using, **kwargs)
+
+    def remove_sql(self, model, schema_editor, **kwargs):
+        if schema_editor.connection.vendor != 'postgresql':
+            return self.skipped_sql()
+        return super().remove_sql(model, schema_editor, **kwargs)
+
+    def skipped_sql(self):
+        # The schema editor runs (or, for sqlmigrate, prints) a comment as a no-op
+        return Statement('-- %(name)s is only created on PostgreSQL', name=self.name)
+
+
+class PostgresGinIndex(PostgresOnlyIndexMixin, GinIndex):
+    pass
@@ -0,0 +1,103 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from apps.core.benchmark import benchmark_users, build_scenarios, compare, measure
+from apps.core.synthetic import generate
+from apps.package.cache import get_catalog_cache
+from apps.package.models.insights import Comment
+from apps.package.models.package import Course, Lesson
+from apps.payment.models.payment import Transaction
+from apps.payment.models.subscription import InstallmentPayment, Subscription
+
+
+class Command(BaseCommand):
+    help = (
+        'Request every API route (all GET actions and the auth views) and record the status, query count, '
+        'p50/p95/p99 latency and response size of each. Every request runs in a transaction that is rolled back. '
+        'Write the results with --output and check a later run against them with --compare. '
+        'Never run this against production: it clears the catalog cache and writes OTPs and rate limits.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20, help='Measured requests per endpoint (default: 20).')
+        parser.add_argument('--warmup', type=int, default=2, help='Unmeasured requests first (default: 2).')
+        parser.add_argument('--generate', action='store_true', help='Insert a synthetic dataset first (rolled back).')
+        parser.add_argument('--scale', type=float, default=1.0, help='Size of the synthetic dataset (default: 1.0).')
+        parser.add_argument('--seed', type=int, default=0, help='Seed of the synthetic dataset (default: 0).')
+        parser.add_argument('--cold', action='store_true', help='Clear the catalog cache before every request.')
+        parser.add_argument('--writes', action='store_true', help='Also send an empty PATCH and a DELETE per object.')
+        parser.add_argument('--only', help='Only endpoints whose "METHOD route-name" key contains this text.')
+        parser.add_argument('--output', help='Write the results as JSON to this file.')
+        parser.add_argument('--compare', help='Results file of an earlier run; fail on regressions against it.')
+        parser.add_argument(
+            '--latency-tolerance', type=float, default=0.25,
+            help='Allowed p95 slowdown for --compare, as a fraction (default: 0.25).',
+        )
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options['compare']:
+            with open(options['compare']) as file:
+                baseline = json.load(file)
+            if baseline['meta']['cold'] != options['cold']:
+                raise CommandError('Compare warm runs with warm runs and --cold runs with --cold runs.')
+
+        with transaction.atomic():
+            if options['generate']:
+                generate(scale=options['scale'], seed=options['seed'], log=self.stdout.write)
+                # Cached responses of an earlier run may have the same ids as the new rows
+                get_catalog_cache().clear()
+
+            users = benchmark_users()
+            scenarios, skipped = build_scenarios(users, writes=options['writes'])
+            if options['only']:
+                scenarios = [scenario for scenario in scenarios if options['only'] in scenario['key']]
+
+            endpoints = {}
+            self.stdout.write(
+                f'{"endpoint":<52} {"status":<8} {"queries":>9} {"p50":>8} {"p95":>8} {"p99":>8} {"bytes":>9}'
+            )
+            for scenario in scenarios:
+                result = measure(scenario, users, options['iterations'], options['warmup'], options['cold'])
+                endpoints[scenario['key']] = result
+                latency = result['latency_ms']
+                self.stdout.write(
+                    f'{scenario["key"]:<52} {",".join(map(str, result["status"])):<8} '
+                    f'{result["queries"]:>4}/{result["cold_queries"]:<4} '
+                    f'{latency["p50"]:>8} {latency["p95"]:>8} {latency["p99"]:>8} {result["bytes"]:>9}'
+                )
+
+            results = {
+                'meta': {
+                    'database': connection.vendor,
+                    'iterations': options['iterations'],
+                    'warmup': options['warmup'],
+                    'cold': options['cold'],
+                    'rows': {
+                        model._meta.label: model.objects.count()
+                        for model in (Course, Lesson, Comment, Subscription, InstallmentPayment, Transaction)
+                    },
+                },
+                'endpoints': endpoints,
+                'skipped': skipped,
+            }
+            transaction.set_rollback(True)
+
+        for key, reason in sorted(skipped.items()):
+            self.stdout.write(f'skipped {key}: {reason}')
+        if options['output']:
+            with open(options['output'], 'w') as file:
+                # Sorted keys and one value per line, so two runs diff cleanly
+                json.dump(results, file, indent=2, sort_keys=True, ensure_ascii=False)
+                file.write('\n')
+            self.stdout.write(f'Results written to {options["output"]}.')
+
+        if baseline is not None:
+            regressions = compare(baseline, results, options['latency_tolerance'])
+            for key, problems in sorted(regressions.items()):
+                self.stdout.write(self.style.ERROR(f'{key}: {"; ".join(problems)}'))
+            if regressions:
+                raise CommandError(f'{len(regressions)} endpoint(s) regressed against {options["compare"]}.')
+            self.stdout.write(self.style.SUCCESS(f'No regressions against {options["compare"]}.'))
@@ -0,0 +1,123 @@
+import threading
+import time
+from collections import Counter
+from io import BytesIO
+
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+from apps.core.profiling import percentile
+
+
+class Command(BaseCommand):
+    help = (
+        'Send GET requests from --threads threads straight into the WSGI handler, as a threaded server '
+        'would, and report requests/second, latency and how many database connections were opened. '
+        'Connections are closed or returned to the pool after each request exactly as in production, '
+        'so run it once per database setting (CONN_MAX_AGE, pool) to compare them.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path', default='/api/v1/core/user/teacher/',
+            help='Path to request; pick one that queries the database (default: the teacher list).',
+        )
+        parser.add_argument('--requests', type=int, default=2000, help='Measured requests (default: 2000).')
+        parser.add_argument('--threads', type=int, default=8, help='Concurrent threads (default: 8).')
+        parser.add_argument('--warmup', type=int, default=100, help='Unmeasured requests first (default: 100).')
+        parser.add_argument('--host', default='localhost', help='Host header, must be in ALLOWED_HOSTS.')
+
+    def handle(self, *args, **options):
+        handler = WSGIHandler()
+        path, _, query = options['path'].partition('?')
+        environ = {
+            'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': query, 'SCRIPT_NAME': '',
+            'SERVER_NAME': options['host'], 'SERVER_PORT': '80', 'HTTP_HOST': options['host'],
+            'REMOTE_ADDR': '127.0.0.1', 'SERVER_PROTOCOL': 'HTTP/1.1', 'wsgi.url_scheme': 'http',
+            'wsgi.input': BytesIO(), 'wsgi.errors': self.stderr, 'wsgi.multithread': True,
+            'wsgi.multiprocess': False, 'wsgi.run_once': False, 'wsgi.version': (1, 0),
+        }
+
+        lock = threading.Lock()
+        opened = [0]
+
+        def count_connection(sender, connection, **kwargs):
+            with lock:
+                opened[0] += 1
+
+        def request():
+            statuses = []
+            response = handler(dict(environ), lambda status, headers, exc_info=None: statuses.append(status))
+            try:
+                for _ in response:
+                    pass
+            finally:
+                # Sends request_finished: closes the connection, or gives it back to the pool
+                response.close()
+            return int(statuses[0].split()[0])
+
+        def run(total, latencies, statuses):
+            remaining = [total]
+
+            def worker():
+                while True:
+                    with lock:
+                        if remaining[0] == 0:
+                            break
+                        remaining[0] -= 1
+                    started = time.perf_counter()
+                    status = request()
+                    elapsed = time.perf_counter() - started
+                    with lock:
+                        latencies.append(elapsed)
+                        statuses[status] += 1
+                connections.close_all()
+
+            threads = [threading.Thread(target=worker) for _ in range(options['threads'])]
+            started = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            return time.perf_counter() - started
+
+        status = request()
+        if status >= 400:
+            raise CommandError(f'{options["path"]} answered {status}.')
+
+        run(options['warmup'], [], Counter())
+        database = connections['default']
+        pool = database.settings_dict['OPTIONS'].get('pool')
+        # With a pool, connection_created is sent for every connection taken from it: count the
+        # connections the pool itself opened instead
+        pool_connections = database.pool.get_stats()['connections_num'] if pool else 0
+        connection_created.connect(count_connection)
+        latencies, statuses = [], Counter()
+        try:
+            elapsed = run(options['requests'], latencies, statuses)
+        finally:
+            connection_created.disconnect(count_connection)
+        if pool:
+            opened[0] = database.pool.get_stats()['connections_num'] - pool_connections
+
+        self.stdout.write(
+            f'{database.vendor} via {database.Database.__name__} {database.Database.__version__.split()[0]}, '
+            f'CONN_MAX_AGE={database.settings_dict["CONN_MAX_AGE"]}, '
+            f'CONN_HEALTH_CHECKS={database.settings_dict["CONN_HEALTH_CHECKS"]}, '
+            f'pool={"max_size " + str(pool.get("max_size")) if pool else "off"}'
+        )
+        self.stdout.write(
+            f'{len(latencies)} request(s) from {options["threads"]} thread(s) in {elapsed:.2f}s: '
+            f'{len(latencies) / elapsed:.0f} requests/s, p50 {percentile(latencies, 50) * 1000:.2f}ms, '
+            f'p95 {percentile(latencies, 95) * 1000:.2f}ms, p99 {percentile(latencies, 99) * 1000:.2f}ms, '
+            f'{opened[0]} connection(s) opened, statuses {dict(sorted(statuses.items()))}'
+        )
+        if pool:
+            stats = database.pool.get_stats()
+            self.stdout.write(
+                f'pool: {stats["pool_size"]} connection(s) open, {stats.get("requests_num", 0)} checkout(s), '
+                f'{stats.get("requests_queued", 0)} had to wait for a free connection'
+            )
+            database.close_pool()
@@ -0,0 +1,68 @@
+import multiprocessing
+import secrets
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, connection, connections
+
+from apps.package.models.insights import Category
+
+
+def insert_rows(title, rows, batch_size):
+    """
+    Worker process: bulk-insert `rows` categories titled `title`, so only the id part tells their slugs apart.
+    Returns (inserted rows, failed batches).
+    """
+    inserted = failed = 0
+    for start in range(0, rows, batch_size):
+        batch = [Category(title=title) for _ in range(min(batch_size, rows - start))]
+        try:
+            Category.objects.bulk_create(batch)
+            inserted += len(batch)
+        except IntegrityError:
+            failed += 1
+    connection.close()
+    return inserted, failed
+
+
+class Command(BaseCommand):
+    help = (
+        'Insert --rows categories with one identical title from --workers processes at the same time '
+        '(bulk_create) and check that every generated slug is unique. The rows are deleted afterwards. '
+        'Run against PostgreSQL; SQLite serializes the writers.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=50000, help='Rows in total (default: 50000).')
+        parser.add_argument('--workers', type=int, default=8, help='Parallel processes (default: 8).')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per bulk_create (default: 1000).')
+
+    def handle(self, *args, **options):
+        rows, workers = options['rows'], options['workers']
+        title = f'slug-check-{secrets.token_hex(4)}'
+        shares = [rows // workers + (i < rows % workers) for i in range(workers)]
+
+        # Every process has to open its own connection
+        connections.close_all()
+        started = time.monotonic()
+        with multiprocessing.get_context('fork').Pool(workers) as pool:
+            results = pool.starmap(insert_rows, [(title, share, options['batch_size']) for share in shares])
+        elapsed = time.monotonic() - started
+
+        queryset = Category.objects.filter(title=title)
+        try:
+            inserted = queryset.count()
+            distinct = queryset.values('slug').distinct().count()
+        finally:
+            # Raw delete: the collector would load every row to send signals
+            with connection.cursor() as cursor:
+                cursor.execute(f'DELETE FROM {Category._meta.db_table} WHERE title = %s', [title])
+
+        failed = sum(failed for _, failed in results)
+        self.stdout.write(
+            f'{inserted} row(s) from {workers} process(es) in {elapsed:.2f}s '
+            f'({inserted / elapsed:.0f} rows/s), {distinct} distinct slug(s), {failed} failed batch(es).'
+        )
+        if failed or inserted != rows or distinct != inserted:
+            raise CommandError('Slug collisions detected.')
+        self.stdout.write(self.style.SUCCESS('No slug collisions.'))
@@ -0,0 +1,32 @@
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.core.models import UploadSession
+from apps.core.uploads import abort_upload
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete chunked uploads that expired: unfinished ones with their partial file, and completed ones '
+        'that were never attached to a model. Run it periodically (e.g. from cron).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many uploads would be deleted.')
+
+    def handle(self, *args, **options):
+        queryset = UploadSession.objects.filter(expires_at__lt=timezone.now())
+
+        if options['dry_run']:
+            self.stdout.write(f'{queryset.count()} expired upload(s) would be deleted.')
+            return
+
+        deleted = 0
+        for session in queryset.iterator():
+            if session.status == 'complete':
+                # Never attached, so nothing references the file
+                default_storage.delete(session.file_name)
+            abort_upload(session)
+            deleted += 1
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} expired upload(s).'))
@@ -0,0 +1,29 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.core.models import OtpCode
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete OTPs that were never verified and have expired. '
+        'Only needed with DatabaseOtpStore; cached OTPs expire on their own. Run it periodically (e.g. from cron).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many rows would be deleted.')
+
+    def handle(self, *args, **options):
+        expired_before = timezone.now() - timedelta(seconds=settings.OTP_STORE.get('TTL', 120))
+        queryset = OtpCode.objects.filter(create_at__lt=expired_before)
+
+        if options['dry_run']:
+            self.stdout.write(f'{queryset.count()} abandoned OTP(s) would be deleted.')
+            return
+
+        # OtpCode has no relations or signals, so this is a single DELETE without loading the rows
+        deleted, _ = queryset.delete()
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} abandoned OTP(s).'))
@@ -0,0 +1,193 @@
+import random
+import string
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.core.models import Teacher, UploadSession
+from apps.package.models.insights import Category, Comment
+from apps.package.models.package import Course, Lesson, Season
+from apps.payment.models.payment import Transaction
+from apps.payment.models.subscription import ImmediatePayment, InstallmentPayment, Subscription
+from apps.textbook.models import TextBook
+
+
+def index_name(model, name=None, fields=None):
+    """
+    Name of one of the model's Meta indexes, looked up by name or by its field list (unnamed indexes).
+    """
+    for index in model._meta.indexes:
+        if index.name == name or (fields is not None and list(index.fields) == fields):
+            return index.name
+    raise CommandError(f'{model.__name__} has no index {name or fields}.')
+
+
+def random_word(length=8):
+    return ''.join(random.choices(string.ascii_lowercase, k=length))
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a throwaway fixture, run EXPLAIN on the query behind each planned index and check that the '
+        'planner actually uses it. Everything runs in one transaction that is rolled back (PostgreSQL only).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=20000, help='Scale of the fixture (default: 20000).')
+        parser.add_argument('--keep', action='store_true', help='Commit the fixture instead of rolling it back.')
+        parser.add_argument('--verbose-plans', action='store_true', help='Print the full plan of every query.')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('Index plans are only checked on PostgreSQL.')
+
+        with transaction.atomic():
+            fixture = self.seed(options['rows'])
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT indexname FROM pg_indexes')
+                existing = {row[0] for row in cursor.fetchall()}
+                for model in fixture['models']:
+                    cursor.execute(f'ANALYZE {model._meta.db_table}')
+
+            failed = 0
+            for name, queryset in self.plan(fixture):
+                if name not in existing:
+                    failed += 1
+                    self.stdout.write(self.style.ERROR(f'{name:<32} missing, run migrate'))
+                    continue
+                plan = queryset.explain()
+                used = name in plan
+                failed += not used
+                summary = plan.splitlines()[0] if not used else next(line for line in plan.splitlines() if name in line)
+                style = self.style.SUCCESS if used else self.style.ERROR
+                self.stdout.write(style(f'{name:<32} {"used" if used else "NOT USED":<9}') + f'{summary.strip()}')
+                if options['verbose_plans']:
+                    self.stdout.write(f'{queryset.query}\n{plan}\n')
+
+            if not options['keep']:
+                transaction.set_rollback(True)
+
+        if failed:
+            raise CommandError(f'{failed} index(es) missing or not used.')
+
+    def plan(self, fixture):
+        """
+        (index name, queryset) for each hot lookup/ordering: the query a view, the admin or a worker runs.
+        """
+        today = timezone.now().date()
+        course_id, season_id, user_id = fixture['course_id'], fixture['season_id'], fixture['user_id']
+        term = fixture['term']
+        return [
+            (index_name(Course, 'course_title_idx'), Course.objects.order_by('title')[:20]),
+            (index_name(Course, 'course_variants_pending_idx'),
+             Course.objects.filter(banner_variants_pending=True).exclude(banner='').only('pk', 'banner')[:8]),
+            (index_name(Course, 'course_popularity_idx'), Course.objects.order_by('-subscriber_count', '-id')[:20]),
+            (index_name(Course, 'course_lesson_count_idx'), Course.objects.order_by('lesson_count', 'id')[:20]),
+            (index_name(Course, 'course_total_minutes_idx'), Course.objects.order_by('-total_minutes', '-id')[:20]),
+            (index_name(Course, 'course_comment_count_idx'), Course.objects.order_by('-comment_count', '-id')[:20]),
+            (index_name(Season, 'season_course_name_idx'), Season.objects.filter(course_id=course_id)),
+            (index_name(Season, 'season_name_trgm'), Season.objects.filter(name__icontains=term)),
+            (index_name(Lesson, 'lesson_season_title_idx'), Lesson.objects.filter(season_id=season_id)),
+            (index_name(Category, 'category_title_idx'), Category.objects.order_by('title')[:20]),
+            (index_name(Category, 'category_title_trgm'), Category.objects.filter(title__icontains=term)),
+            (index_name(Comment, 'comment_course_created_idx'), Comment.objects.filter(course_id=course_id)[:20]),
+            (index_name(Comment, 'comment_text_trgm'), Comment.objects.filter(comment_text__icontains=term)),
+            (index_name(Teacher, 'teacher_full_name_trgm'), Teacher.objects.filter(full_name__icontains=term)),
+            (index_name(TextBook, fields=['processing_status', 'processing_locked_at']),
+             TextBook.objects.filter(processing_status='pending').order_by('id')[:4]),
+            (index_name(Subscription, 'subscription_created_idx'), Subscription.objects.all()[:20]),
+            (index_name(InstallmentPayment, 'installment_due_idx'), InstallmentPayment.objects.all()[:20]),
+            (index_name(InstallmentPayment, 'installment_unpaid_due_idx'),
+             InstallmentPayment.objects.filter(is_paid=False, payment_due_date__lte=today)),
+            (index_name(ImmediatePayment, 'immediate_created_idx'), ImmediatePayment.objects.all()[:20]),
+            (index_name(Transaction, 'transaction_user_id_idx'),
+             Transaction.objects.filter(user_id=user_id).order_by('-id')[:20]),
+            (index_name(UploadSession, fields=['expires_at']),
+             UploadSession.objects.filter(expires_at__lt=timezone.now())),
+        ]
+
+    def seed(self, rows):
+        """
+        Bulk-insert a fixture shaped like production: many lessons per season, mostly paid installments,
+        few courses waiting for banner variants. Titles are random words so substring searches are selective.
+        """
+        random.seed(rows)
+        now = timezone.now()
+        self.stdout.write(f'Seeding ~{rows} rows per large table...')
+
+        users = User.objects.bulk_create(User(username=f'explain-{i}-{random_word()}') for i in range(rows // 10))
+        teachers = Teacher.objects.bulk_create(
+            Teacher(full_name=f'{random_word()} {random_word()}', about='') for _ in range(rows // 40)
+        )
+        categories = Category.objects.bulk_create(Category(title=random_word(10)) for _ in range(rows // 20))
+        courses = Course.objects.bulk_create(
+            Course(
+                title=f'{random_word()} {random_word()}', description='', banner='courses/banners/explain.jpg',
+                banner_variants_pending=random.random() < 0.01,
+            )
+            for _ in range(rows // 10)
+        )
+        Course.teachers.through.objects.bulk_create(
+            Course.teachers.through(course_id=course.pk, teacher_id=random.choice(teachers).pk) for course in courses
+        )
+        Course.categories.through.objects.bulk_create(
+            Course.categories.through(course_id=course.pk, category_id=random.choice(categories).pk)
+            for course in courses
+        )
+        seasons = Season.objects.bulk_create(
+            Season(name=random_word(), course=random.choice(courses)) for _ in range(rows // 10)
+        )
+        Lesson.objects.bulk_create(
+            (Lesson(title=f'{random_word()} {random_word()}', video_url='https://example.com/v.mp4',
+                    duration_minutes=10, season=random.choice(seasons)) for _ in range(rows * 2)),
+            batch_size=5000,
+        )
+        Comment.objects.bulk_create(
+            (Comment(user=random.choice(users), course=random.choice(courses),
+                     comment_text=' '.join(random_word() for _ in range(12))) for _ in range(rows)),
+            batch_size=5000,
+        )
+        TextBook.objects.bulk_create(
+            TextBook(title=random_word(12), description='', pdf_file='textbooks/explain.pdf', processing_status='ready')
+            for _ in range(rows // 10)
+        )
+
+        # One subscription per (user, course) pair, as the unique constraint requires
+        subscriptions = Subscription.objects.bulk_create(
+            (Subscription(user=users[i % len(users)], course=courses[i // len(users)]) for i in range(rows)),
+            batch_size=5000,
+        )
+        InstallmentPayment.objects.bulk_create(
+            (InstallmentPayment(
+                subscription=subscription, amount=1000, payment_due_date=(now + timedelta(days=30 * n - 60)).date(),
+                is_paid=random.random() < 0.95,
+            ) for subscription in subscriptions for n in range(3)),
+            batch_size=5000,
+        )
+        ImmediatePayment.objects.bulk_create(
+            ImmediatePayment(subscription=subscription, amount=1000) for subscription in subscriptions[::4]
+        )
+        Transaction.objects.bulk_create(
+            (Transaction(user=random.choice(users), amount=1000, description='explain') for _ in range(rows)),
+            batch_size=5000,
+        )
+        UploadSession.objects.bulk_create(
+            UploadSession(
+                user=random.choice(users), target='textbook.pdf_file', filename='explain.pdf', size=1,
+                file_name='uploads/partial/explain', expires_at=now + timedelta(hours=random.randint(-2, 24 * 30)),
+            )
+            for _ in range(rows // 10)
+        )
+
+        return {
+            'models': [User, Teacher, Category, Course, Season, Lesson, Comment, TextBook, Subscription,
+                       InstallmentPayment, ImmediatePayment, Transaction, UploadSession],
+            'course_id': random.choice(courses).pk,
+            'season_id': random.choice(seasons).pk,
+            'user_id': random.choice(users).pk,
+            # A piece of one course title: rare in every searched column
+            'term': courses[0].title[:5],
+        }
@@ -0,0 +1,60 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from apps.core.synthetic import SYNTHETIC_COUNTS, counts_for, generate
+
+
+class Command(BaseCommand):
+    help = (
+        'Insert a seeded, referentially consistent synthetic dataset for load tests and profiling: students '
+        'with their information, teachers, categories, courses with seasons, lessons and FAQs, comments, '
+        'subscriptions with installment schedules, transactions and textbooks. Uses COPY on PostgreSQL and '
+        'batched bulk_create elsewhere. Runs in one transaction; use another --seed to add more rows later.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scale', type=float, default=1.0,
+            help=f'Multiplier of the default row counts (default: 1.0, {SYNTHETIC_COUNTS["users"]} users).',
+        )
+        parser.add_argument('--seed', type=int, default=0, help='Random seed; runs with different seeds can coexist.')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per COPY/INSERT (default: 5000).')
+        parser.add_argument(
+            '--count', action='append', default=[], metavar='NAME=ROWS',
+            help=f'Override one row count after scaling; repeatable. Names: {", ".join(SYNTHETIC_COUNTS)}.',
+        )
+        parser.add_argument('--no-copy', action='store_true', help='Use bulk_create on PostgreSQL as well.')
+        parser.add_argument('--dry-run', action='store_true', help='Print the row counts and stop.')
+
+    def handle(self, *args, **options):
+        counts = {}
+        for item in options['count']:
+            name, _, rows = item.partition('=')
+            if name not in SYNTHETIC_COUNTS or not rows.isdigit():
+                raise CommandError(f'Invalid --count "{item}", expected NAME=ROWS with NAME in {", ".join(SYNTHETIC_COUNTS)}.')
+            counts[name] = int(rows)
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1.')
+
+        planned = {**counts_for(options['scale']), **counts}
+        if options['dry_run']:
+            for name, rows in planned.items():
+                self.stdout.write(f'{name:<20} {rows:>10}')
+            return
+
+        copy = connection.vendor == 'postgresql' and not options['no_copy']
+        self.stdout.write(f'Generating seed {options["seed"]} with {"COPY" if copy else "bulk_create"}...')
+        started = time.monotonic()
+        with transaction.atomic():
+            inserted = generate(
+                scale=options['scale'], seed=options['seed'], batch_size=options['batch_size'],
+                counts=counts, copy=copy, log=self.stdout.write,
+            )
+        elapsed = time.monotonic() - started
+
+        total = sum(inserted.values())
+        self.stdout.write(self.style.SUCCESS(
+            f'Inserted {total} row(s) in {elapsed:.1f}s ({total / elapsed:.0f} rows/s).'
+        ))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from apps.core.sms.queue import finished_messages, purge_finished, queue_setting
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete sent and failed SMS messages older than SMS_QUEUE['RETENTION'] in batches. "
+        'Run it periodically (e.g. from cron).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--retention', type=int,
+            help=f"Seconds finished messages are kept (default: {queue_setting('RETENTION')}).",
+        )
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows deleted per statement.')
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many messages would be deleted.')
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            self.stdout.write(f'{finished_messages(options["retention"]).count()} message(s) would be deleted.')
+            return
+
+        deleted = purge_finished(options['retention'], options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} message(s).'))
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.core.search import clear_documents, document_model, index_objects, search_setting
+
+
+class Command(BaseCommand):
+    help = (
+        'Recreate the full-text search documents from the indexed models. Needed after changing '
+        'settings.SEARCH and after bulk imports or queryset updates, which do not send signals.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--type', action='append', dest='doc_types', choices=list(search_setting('DOCUMENTS')),
+            help='Only rebuild these document types (default: all).',
+        )
+
+    def handle(self, *args, **options):
+        for doc_type in options['doc_types'] or search_setting('DOCUMENTS'):
+            count = 0
+            # Searches keep seeing the old documents until the new ones are committed
+            with transaction.atomic():
+                clear_documents(doc_type)
+                batch = []
+                for instance in document_model(doc_type).objects.order_by('pk').iterator(chunk_size=500):
+                    batch.append(instance)
+                    if len(batch) == 500:
+                        index_objects(doc_type, batch)
+                        count += len(batch)
+                        batch = []
+                index_objects(doc_type, batch)
+                count += len(batch)
+            self.stdout.write(self.style.SUCCESS(f'Indexed {count} {doc_type} document(s).'))
@@ -0,0 +1,90 @@
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.core.management.base import BaseCommand
+
+
+class FakeSmsProviderHandler(BaseHTTPRequestHandler):
+    """
+    Accepts POST /send (one form-encoded message) and POST /bulk (JSON list of messages).
+    """
+    protocol_version = 'HTTP/1.1'  # Keep-alive, so pooled clients can reuse connections
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        server = self.server
+
+        if server.latency:
+            time.sleep(server.latency)
+
+        if self.path.rstrip('/') == '/bulk':
+            count = len(json.loads(body or b'{}').get('messages', []))
+        elif self.path.rstrip('/') == '/send':
+            count = 1
+        else:
+            return self.respond(404, {'error': 'Not found'})
+
+        if random.random() < server.error_rate:
+            server.count(errors=1)
+            return self.respond(503, {'error': 'Provider unavailable'})
+
+        server.count(requests=1, messages=count)
+        self.respond(200, {'accepted': count})
+
+    def respond(self, status, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class FakeSmsProviderServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, latency, error_rate, verbose):
+        super().__init__(address, FakeSmsProviderHandler)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.verbose = verbose
+        self.counters = {'requests': 0, 'messages': 0, 'errors': 0}
+        self._lock = threading.Lock()
+
+    def count(self, **increments):
+        with self._lock:
+            for key, value in increments.items():
+                self.counters[key] += value
+
+
+class Command(BaseCommand):
+    help = 'Run a local fake SMS provider for development and load testing (see the "fake" SMS provider).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8025)
+        parser.add_argument('--latency', type=int, default=0, help='Milliseconds to wait before answering.')
+        parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of calls answered with 503.')
+
+    def handle(self, *args, **options):
+        server = FakeSmsProviderServer(
+            (options['host'], options['port']),
+            latency=options['latency'] / 1000,
+            error_rate=options['error_rate'],
+            verbose=options['verbosity'] > 1,
+        )
+        self.stdout.write(f'Fake SMS provider listening on http://{options["host"]}:{options["port"]}/')
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            self.stdout.write(f'Served: {server.counters}')
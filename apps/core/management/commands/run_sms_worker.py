@@ -0,0 +1,106 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.core.sms.providers import CircuitOpenError, get_provider
+from apps.core.sms.queue import claim_batch, mark_failed, mark_sent, queue_setting, release
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Drain the outbound SMS queue and deliver messages through the configured providers.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--provider', action='append', dest='providers',
+            help=(
+                'Drain this provider. Can be given several times (default: SMS_DEFAULT_PROVIDER only; '
+                'the test providers such as `fake` and `console` are only drained when named).'
+            ),
+        )
+        parser.add_argument('--batch-size', type=int, help='Messages claimed per provider per round.')
+        parser.add_argument('--once', action='store_true', help='Deliver every message that is due, then exit.')
+
+    def handle(self, *args, **options):
+        names = options['providers'] or [settings.SMS_DEFAULT_PROVIDER]
+        batch_size = options['batch_size'] or queue_setting('BATCH_SIZE')
+        poll_interval = queue_setting('POLL_INTERVAL')
+        stats_interval = queue_setting('STATS_INTERVAL')
+
+        providers = [get_provider(name) for name in names]
+        # One pool per provider so a slow provider cannot use up another one's slots
+        executors = {provider.name: ThreadPoolExecutor(max_workers=provider.concurrency) for provider in providers}
+
+        self.stdout.write(f'SMS worker started for: {", ".join(names)}')
+        last_stats = time.monotonic()
+        try:
+            while True:
+                processed = sum(self.drain(provider, executors[provider.name], batch_size) for provider in providers)
+
+                if time.monotonic() - last_stats >= stats_interval:
+                    self.log_stats(providers)
+                    last_stats = time.monotonic()
+
+                if processed:
+                    continue
+                if options['once']:
+                    break
+                time.sleep(poll_interval)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            for executor in executors.values():
+                executor.shutdown(wait=True)
+            for provider in providers:
+                provider.close()
+            self.log_stats(providers)
+
+    def drain(self, provider, executor, batch_size):
+        """
+        Claim one batch for `provider`, send it through the provider's pool and record the results.
+        Returns the number of messages processed.
+        """
+        # Leave the queue alone while the provider is known to be down
+        if provider.breaker.is_open:
+            return 0
+
+        messages = claim_batch(provider.name, batch_size)
+        if not messages:
+            return 0
+
+        chunks = [messages[i:i + provider.bulk_size] for i in range(0, len(messages), provider.bulk_size)]
+        futures = [
+            (chunk, executor.submit(provider.deliver, [(message.phone_number, message.body) for message in chunk]))
+            for chunk in chunks
+        ]
+
+        sent = []
+        for chunk, future in futures:
+            try:
+                future.result()
+                sent.extend(message.id for message in chunk)
+            except CircuitOpenError as e:
+                release([message.id for message in chunk], timezone.now() + timedelta(seconds=e.retry_after))
+            except Exception as e:
+                for message in chunk:
+                    logger.warning(
+                        'SMS %s to %s failed (attempt %s): %s',
+                        message.id, message.phone_number, message.attempts + 1, e,
+                    )
+                    mark_failed(message, e)
+
+        mark_sent(sent)
+        return len(messages)
+
+    def log_stats(self, providers):
+        for provider in providers:
+            logger.info(
+                'SMS provider %s (%s): %s',
+                provider.name, provider.breaker.state, provider.stats.snapshot(),
+            )
@@ -0,0 +1,294 @@
+import glob
+import json
+import math
+import os
+import secrets
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+METRICS_DEFAULTS = {
+    'ENABLED': True,
+    'MULTIPROCESS_DIR': '',
+    'FLUSH_INTERVAL': 5,
+    'TOKEN': '',
+}
+
+
+def metrics_setting(key):
+    """
+    Read a value from settings.METRICS, falling back to METRICS_DEFAULTS.
+    """
+    return getattr(settings, 'METRICS', {}).get(key, METRICS_DEFAULTS[key])
+
+
+def _merge(totals, key, value):
+    if isinstance(value, list):
+        current = totals.get(key)
+        totals[key] = list(value) if current is None else [a + b for a, b in zip(current, value)]
+    else:
+        totals[key] = totals.get(key, 0) + value
+
+
+class Registry:
+    """
+    Metric values kept in one dict per thread, so recording takes no lock; they are only added up
+    when scraped. The dicts of finished threads are folded into one retained total, so servers that
+    start a thread per request do not keep a dict per request. With MULTIPROCESS_DIR each process
+    also writes its totals to a file there, at most every FLUSH_INTERVAL seconds, and a scrape adds
+    up the files of every process (dead ones included, so counters never go back).
+    """
+
+    def __init__(self):
+        self.metrics = {}
+        self._reset()
+        # A forked worker starts from zero, or the values the parent had would be counted twice
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._local = threading.local()
+        self._shards = []  # (thread, its dict) of the threads that recorded values
+        self._retired = {}  # Totals of the threads that have finished
+        self._next_flush = 0.0
+        self._file = None
+
+    def register(self, metric):
+        self.metrics[metric.name] = metric
+
+    def shard(self):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._retire_finished()
+                self._shards.append((threading.current_thread(), shard))
+        return shard
+
+    def _retire_finished(self):
+        # Called with the lock held. A finished thread no longer writes to its dict
+        alive = []
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                alive.append((thread, shard))
+            else:
+                for key, value in shard.items():
+                    _merge(self._retired, key, value)
+        self._shards = alive
+
+    def collect(self):
+        """
+        {(metric name, label values): value} of this process.
+        """
+        totals = {}
+        with self._lock:
+            self._retire_finished()
+            shards = [shard for _, shard in self._shards]
+            for key, value in self._retired.items():
+                _merge(totals, key, value)
+        for shard in shards:
+            # list() copies the items in one step while other threads keep writing
+            for key, value in list(shard.items()):
+                _merge(totals, key, value)
+        return totals
+
+    def maybe_flush(self):
+        now = time.monotonic()
+        if now < self._next_flush:
+            return
+        if metrics_setting('MULTIPROCESS_DIR'):
+            self.flush()
+        else:
+            self._next_flush = now + metrics_setting('FLUSH_INTERVAL')
+
+    def flush(self):
+        # Another thread of this process is already writing the file
+        if not self._flush_lock.acquire(blocking=False):
+            return
+        try:
+            self._next_flush = time.monotonic() + metrics_setting('FLUSH_INTERVAL')
+            if self._file is None:
+                self._file = os.path.join(
+                    metrics_setting('MULTIPROCESS_DIR'), f'metrics-{os.getpid()}-{secrets.token_hex(4)}.json'
+                )
+            data = [[name, list(labels), value] for (name, labels), value in self.collect().items()]
+            with open(f'{self._file}.tmp', 'w') as file:
+                json.dump(data, file)
+            os.replace(f'{self._file}.tmp', self._file)
+        finally:
+            self._flush_lock.release()
+
+    def gather(self):
+        """
+        Totals of every process sharing MULTIPROCESS_DIR, or of this process without one.
+        """
+        directory = metrics_setting('MULTIPROCESS_DIR')
+        if not directory:
+            return self.collect()
+        self.flush()
+        totals = {}
+        for path in glob.glob(os.path.join(directory, 'metrics-*.json')):
+            try:
+                with open(path) as file:
+                    data = json.load(file)
+            except (OSError, ValueError):
+                continue
+            for name, labels, value in data:
+                _merge(totals, (name, tuple(labels)), value)
+        return totals
+
+    def exposition(self):
+        """
+        Everything gathered, in the Prometheus text format (version 0.0.4).
+        """
+        samples = defaultdict(list)
+        for (name, labels), value in self.gather().items():
+            samples[name].append((labels, value))
+        lines = []
+        for name, metric in sorted(self.metrics.items()):
+            lines.append(f'# HELP {name} {metric.documentation}')
+            lines.append(f'# TYPE {name} {metric.kind}')
+            for labels, value in sorted(samples.get(name, [])):
+                lines.extend(metric.sample_lines(labels, value))
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+
+def _format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _format_labels(names, values):
+    if not names:
+        return ''
+    escaped = (str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n') for value in values)
+    return '{' + ','.join(f'{name}="{value}"' for name, value in zip(names, escaped)) + '}'
+
+
+class Counter:
+    kind = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name, self.documentation, self.labelnames = name, documentation, tuple(labelnames)
+        registry.register(self)
+
+    def inc(self, *labels, amount=1):
+        shard = registry.shard()
+        key = (self.name, labels)
+        shard[key] = shard.get(key, 0) + amount
+        registry.maybe_flush()
+
+    def sample_lines(self, labels, value):
+        return [f'{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}']
+
+
+class Histogram:
+    """
+    Observations counted per bucket (upper bounds, +Inf added) together with their sum.
+    """
+    kind = 'histogram'
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name, self.documentation, self.labelnames = name, documentation, tuple(labelnames)
+        self.buckets = tuple(buckets)
+        registry.register(self)
+
+    def observe(self, value, *labels):
+        shard = registry.shard()
+        key = (self.name, labels)
+        values = shard.get(key)
+        if values is None:
+            # Count of each bucket (not cumulative) and of +Inf, then the sum
+            values = shard[key] = [0] * (len(self.buckets) + 2)
+        values[bisect_left(self.buckets, value)] += 1
+        values[-1] += value
+        registry.maybe_flush()
+
+    def sample_lines(self, labels, value):
+        lines, cumulative = [], 0
+        for bound, count in zip((*self.buckets, math.inf), value[:-1]):
+            cumulative += count
+            bucket_labels = _format_labels((*self.labelnames, 'le'), (*labels, _format_value(float(bound))))
+            lines.append(f'{self.name}_bucket{bucket_labels} {cumulative}')
+        labels = _format_labels(self.labelnames, labels)
+        lines.append(f'{self.name}_sum{labels} {_format_value(value[-1])}')
+        lines.append(f'{self.name}_count{labels} {cumulative}')
+        return lines
+
+
+REQUEST_DURATION = Histogram(
+    'http_request_duration_seconds', 'Time to answer a request, by URL name and viewset action.',
+    ['view', 'action', 'method', 'status'],
+)
+REQUEST_QUERIES = Histogram(
+    'http_request_db_queries', 'Database queries run by a request.', ['view', 'action'],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+OTP_REQUESTS = Counter('otp_requests_total', 'OTP sends and verifications by outcome.', ['view', 'outcome'])
+SMS_PROVIDER_DURATION = Histogram(
+    'sms_provider_request_duration_seconds', 'Duration of SMS provider calls.', ['provider', 'outcome'],
+)
+SMS_MESSAGES = Counter(
+    'sms_messages_total', 'Messages handed to SMS providers: sent, failed or rejected by the circuit breaker.',
+    ['provider', 'outcome'],
+)
+JWT_AUTH_CACHE = Counter('jwt_auth_cache_total', 'Token lookups of CachedJWTAuthentication (hit, miss).', ['result'])
+PAYMENTS_CREATED = Counter('payments_created_total', 'Committed new payment records by kind.', ['kind'])
+PAYMENT_AMOUNT = Counter('payment_amount_created_total', 'Amounts of the committed new payment records.', ['kind'])
+
+
+class QueryCounter:
+    """
+    Database execute wrapper counting the queries of a request.
+    """
+
+    def __init__(self):
+        self.queries = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries += 1
+        return execute(sql, params, many, context)
+
+
+class MetricsMiddleware:
+    """
+    Record the duration and query count of each request, labelled with the URL name and the viewset
+    action (or the HTTP method of plain views). Removed from the chain when METRICS['ENABLED'] is off.
+    """
+
+    def __init__(self, get_response):
+        if not metrics_setting('ENABLED'):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        counter = QueryCounter()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(counter))
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - started
+
+        view, action = getattr(request, '_metrics_view', ('<unresolved>', request.method.lower()))
+        REQUEST_DURATION.observe(elapsed, view, action, request.method, str(response.status_code))
+        REQUEST_QUERIES.observe(counter.queries, view, action)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        match = request.resolver_match
+        method = request.method.lower()
+        actions = getattr(view_func, 'actions', None) or {}
+        request._metrics_view = (match.url_name or match.view_name, actions.get(method, method))
@@ -1,32 +1,47 @@
+import uuid
+
+from django.conf import settings
+from django.contrib.postgres.indexes import OpClass
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models.functions import Upper
 from django.contrib.auth.models import User
-from datetime import datetime, timedelta
-from django.utils.text import slugify
+from datetime import timedelta
 from django.utils import timezone
 
+from apps.core.indexes import PostgresGinIndex
+from apps.core.slugs import UniqueSlugField
+
 
 class BaseModel(models.Model):
 
-    slug = models.SlugField(unique=True, null=True)
+    slug_source = None  # Field the slug starts with, e.g. 'title' (see apps.core.slugs)
+
+    slug = UniqueSlugField(unique=True, null=True, max_length=80, allow_unicode=True)
     create_at = models.DateTimeField(default=timezone.now, null=True)
     update_at = models.DateTimeField(default=timezone.now, null=True)
 
     class Meta:
         abstract = True
 
+    def fill_defaults(self):
+        """
+        Timestamps set on every save. bulk_update() does not call save(), so bulk writers
+        (see apps.core.bulk) call this on each object themselves. The slug is filled by
+        UniqueSlugField on insert, which bulk_create() runs as well.
+        """
+        self.update_at = timezone.now()
+
+        if self.create_at is None:
+            self.create_at = timezone.now()
+
     def save(
         self,
         *args,
         **kwargs,
     ):
 
-        self.update_at = timezone.now()
-
-        if self.create_at is None:
-            self.create_at = timezone.now()
-
-        if self.slug is None:
-            self.slug = slugify(f'{self.create_at}+{self.update_at}')
+        self.fill_defaults()
 
         super().save(*args, **kwargs)
 
@@ -69,31 +84,124 @@ class StudentInformation(BaseModel):
 
 class OtpCode(BaseModel):
     """
-    Stores OTP (One Time Password) for user verification.
-    Each user can have only one OTP at a time.
+    Stores OTP (One Time Password) for phone number verification.
+    Each phone number can have only one OTP at a time. No User row exists
+    for a new phone number until its OTP has been verified.
     """
-    user = models.OneToOneField(User, on_delete=models.CASCADE)
+    phone_number = models.CharField(max_length=20, unique=True)  # Phone number the code was sent to
     code = models.CharField(max_length=6)  # 6-digit code (supports leading zeros like 000123)
+    attempts = models.PositiveIntegerField(default=0)  # Wrong codes submitted for this OTP
     # created = models.DateTimeField(auto_now_add=True)  # Auto-set on creation
 
     def __str__(self):
-        return f'User: {self.user.username}, Code: {self.code}, Created: {self.create_at}'
+        return f'Phone: {self.phone_number}, Code: {self.code}, Created: {self.create_at}'
 
     def is_valid(self):
         """
-        Returns True if OTP is still valid (within 2 minutes of creation).
+        Returns True if OTP is still valid (within OTP_STORE['TTL'] seconds of creation, 2 minutes by default).
         Otherwise returns False.
         """
-        expire_time = self.create_at + timedelta(minutes=2)
-        return datetime.now() <= expire_time
+        expire_time = self.create_at + timedelta(seconds=settings.OTP_STORE.get('TTL', 120))
+        return timezone.now() <= expire_time
 
 
 class Teacher(BaseModel):
     """
     Stores information about teachers.
     """
+    slug_source = 'full_name'
+
     full_name = models.CharField(max_length=255)  # Teacher's full name
     about = models.TextField()  # Biography / description
 
+    class Meta:
+        indexes = [
+            PostgresGinIndex(OpClass(Upper("full_name"), name="gin_trgm_ops"), name="teacher_full_name_trgm"),
+        ]
+
     def __str__(self):
         return self.full_name
+
+
+class OutboundMessage(BaseModel):
+    """
+    Durable queue of outgoing SMS messages.
+    Rows are written by the request path and drained by the `run_sms_worker` command.
+    """
+    STATUS_CHOICES = [
+        ("pending", "Pending"),   # Waiting to be picked up by a worker
+        ("sending", "Sending"),   # Claimed by a worker
+        ("sent", "Sent"),         # Accepted by the provider
+        ("failed", "Failed"),     # Gave up after the maximum number of attempts
+    ]
+
+    provider = models.CharField(max_length=50)  # Key in settings.SMS_PROVIDERS
+    phone_number = models.CharField(max_length=20)  # Recipient
+    body = models.TextField()  # Message text
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="pending")
+    attempts = models.PositiveIntegerField(default=0)  # Number of delivery attempts so far
+    next_attempt_at = models.DateTimeField(default=timezone.now)  # Not retried before this time
+    locked_at = models.DateTimeField(null=True, blank=True)  # When a worker claimed the message
+    sent_at = models.DateTimeField(null=True, blank=True)  # When the provider accepted the message
+    last_error = models.TextField(blank=True, default="")  # Error from the last failed attempt
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "provider", "next_attempt_at"]),
+        ]
+
+    def __str__(self):
+        return f'To: {self.phone_number}, Status: {self.status}, Attempts: {self.attempts}'
+
+
+class UploadSession(BaseModel):
+    """
+    A resumable chunked upload (see apps.core.uploads).
+    Chunks are written in place into a preallocated file; once complete it is moved under the
+    target field's `upload_to` and can be attached to a model by its token.
+    """
+    STATUS_CHOICES = [
+        ("uploading", "Uploading"),   # Waiting for more chunks
+        ("complete", "Complete"),     # All bytes received, not attached to a model yet
+    ]
+
+    token = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)  # Public id used in URLs
+    user = models.ForeignKey(User, on_delete=models.CASCADE)  # Uploader
+    target = models.CharField(max_length=50)  # Key in settings.CHUNKED_UPLOAD['TARGETS'], e.g. "textbook.pdf_file"
+    filename = models.CharField(max_length=255)  # Original file name
+    size = models.PositiveBigIntegerField()  # Total size announced by the client
+    offset = models.PositiveBigIntegerField(default=0)  # Bytes received and verified so far
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="uploading")
+    file_name = models.CharField(max_length=500)  # Storage name of the partial, later the final file
+    expires_at = models.DateTimeField()  # Incomplete uploads are deleted after this time
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["expires_at"]),
+        ]
+
+    def __str__(self):
+        return f'Upload: {self.filename} ({self.offset}/{self.size}), Status: {self.status}'
+
+
+
+class SearchDocument(BaseModel):
+    """
+    Denormalized full-text search document of one Course, Lesson, FAQ or TextBook (see apps.core.search).
+    Kept up to date by signals; `rebuild_search_index` recreates them from scratch.
+    """
+    doc_type = models.CharField(max_length=20)  # Key in settings.SEARCH['DOCUMENTS'], e.g. "course"
+    object_id = models.PositiveBigIntegerField()  # Primary key of the indexed object
+    title = models.CharField(max_length=255)  # Shown in the search results
+    vector = SearchVectorField(null=True)  # Weighted title + body; PostgreSQL only, SQLite uses an FTS5 table
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["doc_type", "object_id"], name="unique_search_document"),
+        ]
+        indexes = [
+            PostgresGinIndex(fields=["vector"], name="searchdocument_vector_idx"),
+        ]
+
+    def __str__(self):
+        return f'{self.doc_type} {self.object_id}: {self.title}'
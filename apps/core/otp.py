@@ -0,0 +1,131 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare
+from django.utils.module_loading import import_string
+
+from apps.core.models import OtpCode
+
+# Outcomes of OtpStore.verify
+VERIFIED = 'verified'
+INVALID = 'invalid'    # Wrong code, attempt counted
+EXPIRED = 'expired'    # Code existed but is too old
+MISSING = 'missing'    # No code issued (or already used / expired out of the cache)
+LOCKED = 'locked'      # Too many wrong attempts, a new code must be requested
+
+
+class BaseOtpStore:
+    """
+    Stores one pending OTP per phone number.
+    """
+
+    def __init__(self, options):
+        self.ttl = options.get('TTL', 120)  # Seconds a code stays valid
+        self.max_attempts = options.get('MAX_ATTEMPTS', 5)  # Wrong codes allowed before locking
+
+    def issue(self, phone_number, code):
+        """
+        Store `code` for `phone_number`, replacing any previous code and resetting the attempt counter.
+        """
+        raise NotImplementedError
+
+    def verify(self, phone_number, code):
+        """
+        Check `code` and consume it on success. Returns one of the outcome constants in this module.
+        """
+        raise NotImplementedError
+
+
+class CacheOtpStore(BaseOtpStore):
+    """
+    Keeps codes in a Django cache with a native TTL, so issuing and verifying never touch the database.
+    The cache must be shared between processes (e.g. Redis) when running more than one worker.
+    """
+
+    def __init__(self, options):
+        super().__init__(options)
+        self.cache = caches[options.get('CACHE_ALIAS', 'default')]
+
+    def issue(self, phone_number, code):
+        self.cache.set_many({self._code_key(phone_number): code, self._attempts_key(phone_number): 0}, timeout=self.ttl)
+
+    def verify(self, phone_number, code):
+        code_key = self._code_key(phone_number)
+        attempts_key = self._attempts_key(phone_number)
+
+        # incr is atomic on shared caches, so parallel guesses are all counted
+        try:
+            attempts = self.cache.incr(attempts_key)
+        except ValueError:
+            return MISSING
+
+        if attempts > self.max_attempts:
+            self.cache.delete_many([code_key, attempts_key])
+            return LOCKED
+
+        stored = self.cache.get(code_key)
+        if stored is None:
+            return MISSING
+        if not constant_time_compare(stored, code):
+            return INVALID
+
+        # Only one of several concurrent requests with the right code gets to delete it
+        if not self.cache.delete(code_key):
+            return MISSING
+        self.cache.delete(attempts_key)
+        return VERIFIED
+
+    def _code_key(self, phone_number):
+        return f'otp:code:{phone_number}'
+
+    def _attempts_key(self, phone_number):
+        return f'otp:attempts:{phone_number}'
+
+
+class DatabaseOtpStore(BaseOtpStore):
+    """
+    Keeps codes in the OtpCode table. Kept as a fallback for deployments without a shared cache.
+    """
+
+    def issue(self, phone_number, code):
+        OtpCode.objects.update_or_create(
+            phone_number=phone_number,
+            defaults={'code': code, 'attempts': 0, 'create_at': timezone.now()},
+        )
+
+    def verify(self, phone_number, code):
+        with transaction.atomic():
+            otp = OtpCode.objects.select_for_update().filter(phone_number=phone_number).first()
+            if otp is None:
+                return MISSING
+
+            if not otp.is_valid():
+                otp.delete()
+                return EXPIRED
+
+            if otp.attempts >= self.max_attempts:
+                otp.delete()
+                return LOCKED
+
+            if not constant_time_compare(otp.code, code):
+                OtpCode.objects.filter(pk=otp.pk).update(attempts=F('attempts') + 1)
+                return INVALID
+
+            otp.delete()
+            return VERIFIED
+
+
+_store = None
+
+
+def get_otp_store():
+    """
+    Return the OTP store configured in settings.OTP_STORE. The instance is created once per process.
+    """
+    global _store
+    if _store is None:
+        options = settings.OTP_STORE
+        _store = import_string(options['BACKEND'])(options)
+    return _store
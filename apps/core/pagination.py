@@ -0,0 +1,114 @@
+import json
+
+from django.conf import settings
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor (keyset) pagination used by every list endpoint.
+    Each page is fetched with `WHERE key > <last seen> ORDER BY key LIMIT n`, so the cost does not
+    grow with the page number and rows inserted between requests are neither repeated nor skipped.
+
+    The key comes from the view's `cursor_ordering` (default: newest first by primary key).
+    Views may list `cursor_ordering_options` that clients pick with `?ordering=`; `cursor_ordering`
+    then breaks the ties in the direction of the requested field, so one `(field, id)` index serves
+    both `?ordering=field` and `?ordering=-field`. The cursor holds the value of every ordering field
+    of the last row, not just the first one as in DRF's CursorPagination, so any number of rows
+    sharing a value (e.g. every course with `subscriber_count=0`) is walked without an offset.
+    The key must be non-null, backed by an index and end with a unique field. A row whose
+    `?ordering=` value changes while a client is paging moves, like with any sort on that value.
+    """
+    ordering = '-id'
+    page_size_query_param = 'page_size'
+    max_page_size = getattr(settings, 'PAGINATION_MAX_PAGE_SIZE', 100)
+
+    def get_ordering(self, request, queryset, view):
+        ordering = getattr(view, 'cursor_ordering', self.ordering)
+        ordering = (ordering,) if isinstance(ordering, str) else tuple(ordering)
+        requested = request.query_params.get('ordering')
+        if requested in getattr(view, 'cursor_ordering_options', ()):
+            direction = '-' if requested.startswith('-') else ''
+            return (requested, *(direction + key.lstrip('-') for key in ordering))
+        return ordering
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+
+        if reverse:
+            queryset = queryset.order_by(*(key[1:] if key.startswith('-') else f'-{key}' for key in self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+        if self.cursor is not None:
+            queryset = queryset.filter(self.after(self.cursor.position, reverse))
+
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        has_following = len(results) > self.page_size
+        if reverse:
+            self.page.reverse()
+
+        # Coming from a cursor means there are rows on that side
+        self.has_next = has_following if not reverse else True
+        self.has_previous = has_following if reverse else self.cursor is not None
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def after(self, position, reverse):
+        """
+        Rows after `position` in the (possibly reversed) ordering: `(a > x) OR (a = x AND b > y) OR ...`,
+        with `<` for descending fields.
+        """
+        condition, equal = Q(), {}
+        for key, value in zip(self.ordering, position):
+            field = key.lstrip('-')
+            lookup = 'lt' if key.startswith('-') != reverse else 'gt'
+            condition |= Q(**equal, **{f'{field}__{lookup}': value})
+            equal[field] = value
+        return condition
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        position = self.position(self.page[-1]) if self.page else self.cursor.position
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        position = self.position(self.page[0]) if self.page else self.cursor.position
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=position))
+
+    def position(self, instance):
+        fields = [key.lstrip('-') for key in self.ordering]
+        if isinstance(instance, dict):
+            return [instance[field] for field in fields]
+        return [getattr(instance, field) for field in fields]
+
+    def encode_cursor(self, cursor):
+        position = json.dumps(cursor.position, default=str, separators=(',', ':'))
+        return super().encode_cursor(Cursor(offset=0, reverse=cursor.reverse, position=position))
+
+    def decode_cursor(self, request):
+        cursor = super().decode_cursor(request)
+        if cursor is None:
+            return None
+        try:
+            position = json.loads(cursor.position)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        # Rejects cursors of the old format, and most cursors made for another ?ordering=
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return Cursor(offset=0, reverse=cursor.reverse, position=position)
@@ -0,0 +1,243 @@
+import contextvars
+import functools
+import logging
+import math
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter, deque
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.utils import timezone
+from rest_framework.serializers import BaseSerializer, ListSerializer
+
+logger = logging.getLogger(__name__)
+
+PROFILING_DEFAULTS = {
+    'ENABLED': False,
+    'SAMPLE_RATE': 1.0,
+    'SERVER_TIMING': True,
+    'N_PLUS_ONE_THRESHOLD': 5,
+    'WINDOW': 1000,
+}
+
+# Placeholder lists of any length and inlined literals, so `WHERE id IN (%s, %s)` and
+# `WHERE id IN (%s, %s, %s)` or `LIMIT 20` and `LIMIT 21` share one fingerprint
+IN_LIST_PATTERN = re.compile(r'\((?:%s, )+%s\)')
+LITERAL_PATTERN = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+
+_current = contextvars.ContextVar('request_profile', default=None)
+_serializer_timer_installed = False
+
+
+def profiling_setting(key):
+    """
+    Read a value from settings.PROFILING, falling back to PROFILING_DEFAULTS.
+    """
+    return getattr(settings, 'PROFILING', {}).get(key, PROFILING_DEFAULTS[key])
+
+
+def fingerprint(sql):
+    return LITERAL_PATTERN.sub('?', IN_LIST_PATTERN.sub('(...)', sql))
+
+
+def percentile(values, p):
+    """
+    Nearest-rank percentile of `values` (not empty).
+    """
+    ordered = sorted(values)
+    return ordered[max(math.ceil(p / 100 * len(ordered)) - 1, 0)]
+
+
+class RequestProfile:
+    """
+    What one request spent on queries and serializers. Installed as a database execute wrapper,
+    so it sees every query of the request.
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.in_serializer = False
+        self.fingerprints = Counter()
+        self.statements = Counter()
+        self.examples = {}  # fingerprint -> first SQL seen
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.queries += 1
+            key = fingerprint(sql)
+            self.fingerprints[key] += 1
+            self.examples.setdefault(key, sql)
+            self.statements[(sql, repr(params))] += 1
+
+    def n_plus_one(self):
+        """
+        {fingerprint: times run} of the queries repeated at least N_PLUS_ONE_THRESHOLD times.
+        """
+        threshold = profiling_setting('N_PLUS_ONE_THRESHOLD')
+        return {key: count for key, count in self.fingerprints.items() if count >= threshold}
+
+
+def _timed_serializer(func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        profile = _current.get()
+        # Only the outermost call: nested serializers run inside it
+        if profile is None or profile.in_serializer:
+            return func(*args, **kwargs)
+        profile.in_serializer = True
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profile.serializer_time += time.perf_counter() - started
+            profile.in_serializer = False
+
+    return wrapper
+
+
+def install_serializer_timer():
+    """
+    Time validation (is_valid) and representation (.data) of every serializer, including the
+    queries they trigger. Patched once per process, and only when profiling is enabled.
+    """
+    global _serializer_timer_installed
+    if _serializer_timer_installed:
+        return
+    BaseSerializer.data = property(_timed_serializer(BaseSerializer.data.fget))
+    BaseSerializer.is_valid = _timed_serializer(BaseSerializer.is_valid)
+    ListSerializer.is_valid = _timed_serializer(ListSerializer.is_valid)
+    _serializer_timer_installed = True
+
+
+class ProfileAggregate:
+    """
+    Rolling per-view statistics of the last WINDOW profiled requests, held in process memory.
+    """
+
+    def __init__(self, window):
+        self._lock = threading.Lock()
+        self._window = window
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._views = {}
+            self.since = timezone.now()
+
+    def add(self, view, sample, n_plus_one, examples):
+        with self._lock:
+            stats = self._views.get(view)
+            if stats is None:
+                stats = self._views[view] = {
+                    'requests': 0, 'n_plus_one_requests': 0, 'samples': deque(maxlen=self._window), 'suspects': {},
+                }
+            stats['requests'] += 1
+            stats['samples'].append(sample)
+            if n_plus_one:
+                stats['n_plus_one_requests'] += 1
+            for key, count in n_plus_one.items():
+                suspect = stats['suspects'].setdefault(key, {'sql': examples[key][:1000], 'requests': 0, 'max_count': 0})
+                suspect['requests'] += 1
+                suspect['max_count'] = max(suspect['max_count'], count)
+
+    def snapshot(self):
+        with self._lock:
+            views = {view: (stats, list(stats['samples'])) for view, stats in self._views.items()}
+        result = {}
+        for view, (stats, samples) in sorted(views.items()):
+            columns = dict(zip(('total_ms', 'db_ms', 'serializer_ms', 'queries'), zip(*samples)))
+            result[view] = {
+                'requests': stats['requests'],
+                'n_plus_one_requests': stats['n_plus_one_requests'],
+                **{
+                    name: {'p50': percentile(values, 50), 'p95': percentile(values, 95), 'max': max(values)}
+                    for name, values in columns.items()
+                },
+                'suspects': sorted(stats['suspects'].values(), key=lambda suspect: -suspect['requests'])[:5],
+            }
+        return result
+
+
+_aggregate = None
+
+
+def get_aggregate():
+    global _aggregate
+    if _aggregate is None:
+        _aggregate = ProfileAggregate(profiling_setting('WINDOW'))
+    return _aggregate
+
+
+class ProfilingMiddleware:
+    """
+    Opt-in request profiling (settings.PROFILING): query count, database time, serializer time and
+    total time of each request, plus the query fingerprints repeated often enough to be an N+1.
+    Sent as a Server-Timing header, logged to `apps.core.profiling` and added to the per-view aggregate.
+    Put it first in MIDDLEWARE. When disabled it removes itself from the chain at startup.
+    """
+
+    def __init__(self, get_response):
+        if not profiling_setting('ENABLED'):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        install_serializer_timer()
+
+    def __call__(self, request):
+        if random.random() >= profiling_setting('SAMPLE_RATE'):
+            return self.get_response(request)
+
+        profile = RequestProfile()
+        token = _current.set(profile)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(profile))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        total_time = time.perf_counter() - started
+
+        self.report(request, response, profile, total_time)
+        return response
+
+    def report(self, request, response, profile, total_time):
+        match = request.resolver_match
+        view = f'{request.method} {(match.url_name or match.view_name) if match else "<unresolved>"}'
+        total_ms, db_ms = round(total_time * 1000, 2), round(profile.db_time * 1000, 2)
+        serializer_ms = round(profile.serializer_time * 1000, 2)
+        n_plus_one = profile.n_plus_one()
+        duplicates = sum(count - 1 for count in profile.statements.values())
+
+        if profiling_setting('SERVER_TIMING'):
+            response['Server-Timing'] = (
+                f'db;desc="{profile.queries} queries";dur={db_ms}, serializer;dur={serializer_ms}, total;dur={total_ms}'
+            )
+
+        record = {
+            'view': view, 'path': request.path, 'status': response.status_code, 'total_ms': total_ms,
+            'db_ms': db_ms, 'queries': profile.queries, 'similar_queries': profile.queries - len(profile.fingerprints),
+            'duplicate_queries': duplicates, 'serializer_ms': serializer_ms, 'n_plus_one': n_plus_one,
+            'pid': os.getpid(),
+        }
+        logger.info(
+            'view="%s" status=%s total_ms=%s db_ms=%s queries=%s similar=%s duplicates=%s serializer_ms=%s',
+            view, response.status_code, total_ms, db_ms, profile.queries, record['similar_queries'], duplicates,
+            serializer_ms, extra={'profile': record},
+        )
+        for key, count in n_plus_one.items():
+            logger.warning('Possible N+1 in "%s": %s queries like: %s', view, count, key, extra={'profile': record})
+
+        get_aggregate().add(view, (total_ms, db_ms, serializer_ms, profile.queries), n_plus_one, profile.examples)
@@ -0,0 +1,189 @@
+import re
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+from rest_framework.throttling import BaseThrottle
+
+RATE_PATTERN = re.compile(r'^(\d+)/(\d*)([smhd])$')
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+    """
+    Parse '<requests>/<period>' where period is s, m, h or d with an optional multiplier,
+    e.g. '5/m' or '3/10m'. Returns (requests, window_seconds).
+    """
+    match = RATE_PATTERN.match(rate)
+    if match is None:
+        raise ValueError(f'Invalid rate "{rate}"')
+    count, multiplier, unit = match.groups()
+    return int(count), int(multiplier or 1) * PERIODS[unit]
+
+
+class LocalRateLimitBackend:
+    """
+    Counters held in process memory. Only correct when the site runs in a single process.
+    """
+
+    def __init__(self, options):
+        self._counters = {}  # key -> [count, expires_at]
+        self._dropped = {}
+        self._lock = threading.Lock()
+        self._max_keys = options.get('MAX_KEYS', 100_000)
+
+    def incr(self, key, timeout):
+        now = time.monotonic()
+        with self._lock:
+            if len(self._counters) >= self._max_keys:
+                self._counters = {k: v for k, v in self._counters.items() if v[1] > now}
+            entry = self._counters.get(key)
+            if entry is None or entry[1] <= now:
+                entry = self._counters[key] = [0, now + timeout]
+            entry[0] += 1
+            return entry[0]
+
+    def get(self, key):
+        entry = self._counters.get(key)
+        return entry[0] if entry and entry[1] > time.monotonic() else 0
+
+    def record_drop(self, scope):
+        with self._lock:
+            self._dropped[scope] = self._dropped.get(scope, 0) + 1
+
+    def dropped(self, scope):
+        return self._dropped.get(scope, 0)
+
+
+class CacheRateLimitBackend:
+    """
+    Counters held in a Django cache, shared by every process and node using the same cache.
+    """
+
+    def __init__(self, options):
+        self.cache = caches[options.get('CACHE_ALIAS', 'default')]
+
+    def incr(self, key, timeout):
+        self.cache.add(key, 0, timeout)
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            # Expired between add and incr
+            self.cache.set(key, 1, timeout)
+            return 1
+
+    def get(self, key):
+        return self.cache.get(key, 0)
+
+    def record_drop(self, scope):
+        key = f'ratelimit:dropped:{scope}'
+        self.cache.add(key, 0, None)
+        self.cache.incr(key)
+
+    def dropped(self, scope):
+        return self.cache.get(f'ratelimit:dropped:{scope}', 0)
+
+
+class RateLimiter:
+    """
+    Sliding-window counter: the count of the previous fixed window is weighted by how much of it
+    still overlaps the sliding window and added to the count of the current one.
+    Needs two counters per key regardless of the rate, unlike a log of timestamps.
+    """
+
+    def __init__(self, scope, rate, backend):
+        self.scope = scope
+        self.rate = rate
+        self.limit, self.window = parse_rate(rate)
+        self.backend = backend
+
+    def hit(self, ident):
+        """
+        Count a request for `ident`. Returns (allowed, retry_after_seconds).
+        """
+        now = time.time()
+        index, offset = divmod(now, self.window)
+        key = f'ratelimit:{self.scope}:{ident}:'
+
+        current = self.backend.incr(f'{key}{int(index)}', self.window * 2)
+        previous = self.backend.get(f'{key}{int(index) - 1}')
+        estimated = previous * (1 - offset / self.window) + current
+
+        if estimated <= self.limit:
+            return True, None
+
+        self.backend.record_drop(self.scope)
+        return False, self.window - offset
+
+    @property
+    def dropped(self):
+        return self.backend.dropped(self.scope)
+
+
+_backend = None
+_limiters = {}
+
+
+def get_rate_limiter(scope):
+    """
+    Return the limiter for `scope` using the rate in settings.RATE_LIMIT['RATES'],
+    or None if the scope has no rate configured.
+    """
+    global _backend
+    if scope not in _limiters:
+        options = settings.RATE_LIMIT
+        rate = options['RATES'].get(scope)
+        if rate is None:
+            return None
+        if _backend is None:
+            _backend = import_string(options['BACKEND'])(options)
+        _limiters[scope] = RateLimiter(scope, rate, _backend)
+    return _limiters[scope]
+
+
+class RateLimitThrottle(BaseThrottle):
+    """
+    DRF throttle backed by RateLimiter. The scope is '<view.throttle_scope>.<kind>',
+    so one throttle class can be shared by several views with different rates.
+    Throttles run in APIView.initial, before the handler does any database or SMS work.
+    """
+    kind = None
+
+    def get_ident_value(self, request):
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        self.retry_after = None
+        limiter = get_rate_limiter(f'{view.throttle_scope}.{self.kind}')
+        ident = self.get_ident_value(request)
+        if limiter is None or not ident:
+            return True
+        allowed, self.retry_after = limiter.hit(ident)
+        return allowed
+
+    def wait(self):
+        return self.retry_after
+
+
+class IPRateThrottle(RateLimitThrottle):
+    """
+    Limits requests per client IP (honours REST_FRAMEWORK['NUM_PROXIES']).
+    """
+    kind = 'ip'
+
+    def get_ident_value(self, request):
+        return self.get_ident(request)
+
+
+class PhoneNumberRateThrottle(RateLimitThrottle):
+    """
+    Limits requests per `phone_number` in the request body.
+    """
+    kind = 'phone'
+
+    def get_ident_value(self, request):
+        data = request.data
+        phone_number = data.get('phone_number') if hasattr(data, 'get') else None
+        return str(phone_number)[:20] if phone_number else None
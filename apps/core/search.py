@@ -0,0 +1,287 @@
+import re
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.db.models import F, TextField, Value
+from django.db.models.signals import post_delete, post_save
+from rest_framework import filters
+
+from apps.core.models import SearchDocument
+
+SEARCH_DEFAULTS = {
+    'CONFIG': 'simple',
+    'LIMIT': 20,
+    'MAX_LIMIT': 100,
+    'MAX_TERMS': 8,
+    'DOCUMENTS': {},
+}
+
+FTS_TABLE = 'core_searchdocument_fts'
+ZWNJ = '\u200c'
+
+CHARACTER_MAP = str.maketrans({
+    'ي': 'ی',  # Arabic yeh -> Persian yeh
+    'ى': 'ی',  # Alef maksura -> Persian yeh
+    'ك': 'ک',  # Arabic kaf -> Persian keheh
+    'ة': 'ه',  # Teh marbuta -> heh
+    'ۀ': 'ه',  # Heh with yeh above -> heh
+    'أ': 'ا',  # Alef with hamza above -> alef
+    'إ': 'ا',  # Alef with hamza below -> alef
+    **{chr(0x06f0 + digit): str(digit) for digit in range(10)},  # Persian digits
+    **{chr(0x0660 + digit): str(digit) for digit in range(10)},  # Arabic-Indic digits
+})
+# Harakat, superscript alef, tatweel and the invisible direction/joiner marks (ZWNJ is handled separately)
+IGNORED_CHARACTERS = re.compile('[\u064b-\u065f\u0670\u0640\u200d\u200e\u200f]')
+TERM = re.compile(r'[^\W_]+')
+
+
+def search_setting(key):
+    """
+    Read a value from settings.SEARCH, falling back to SEARCH_DEFAULTS.
+    """
+    return getattr(settings, 'SEARCH', {}).get(key, SEARCH_DEFAULTS[key])
+
+
+def normalize_text(text):
+    """
+    Fold the spellings of the same Persian word together: Arabic yeh/kaf, teh marbuta, hamza forms,
+    Persian/Arabic digits, diacritics and case. ZWNJ is kept; see `document_terms` and `query_terms`.
+    """
+    return IGNORED_CHARACTERS.sub('', text.translate(CHARACTER_MAP)).lower()
+
+
+def document_terms(text):
+    """
+    Terms indexed for `text`. A word written with a ZWNJ (e.g. "کتاب‌ها") is indexed both joined and split,
+    so it is found whether the query uses a ZWNJ, a space or nothing between the parts.
+    """
+    terms = []
+    for word in normalize_text(text).split():
+        parts = TERM.findall(word.replace(ZWNJ, ' '))
+        if ZWNJ in word:
+            terms.extend(TERM.findall(word.replace(ZWNJ, '')))
+        terms.extend(parts)
+    return terms
+
+
+def query_terms(text):
+    """
+    Terms of a search query; each one matches as a prefix, so results show up while the user types.
+    """
+    return TERM.findall(normalize_text(text).replace(ZWNJ, ''))[:search_setting('MAX_TERMS')]
+
+
+def document_config(doc_type):
+    try:
+        return search_setting('DOCUMENTS')[doc_type]
+    except KeyError:
+        raise ImproperlyConfigured(f'"{doc_type}" is not in settings.SEARCH["DOCUMENTS"].')
+
+
+def document_model(doc_type):
+    return apps.get_model(document_config(doc_type)['MODEL'])
+
+
+def _document_text(config, instance):
+    """
+    (title, indexed title terms, indexed body terms) of `instance`.
+    """
+    title = str(getattr(instance, config['TITLE']))
+    title_text = ' '.join(document_terms(title))
+    body_text = ' '.join(
+        term for field in config.get('BODY', []) for term in document_terms(str(getattr(instance, field) or ''))
+    )
+    return title, title_text, body_text
+
+
+def _vector(title_text, body_text):
+    search_config = search_setting('CONFIG')
+    # The text is tokenized already, so the parser only has to split on spaces
+    return (
+        SearchVector(Value(title_text, output_field=TextField()), weight='A', config=search_config)
+        + SearchVector(Value(body_text, output_field=TextField()), weight='B', config=search_config)
+    )
+
+
+def index_object(doc_type, instance):
+    """
+    Create or refresh the search document of `instance`.
+    """
+    title, title_text, body_text = _document_text(document_config(doc_type), instance)
+
+    if connection.vendor == 'postgresql':
+        SearchDocument.objects.update_or_create(
+            doc_type=doc_type, object_id=instance.pk,
+            defaults={'title': title[:255], 'vector': _vector(title_text, body_text)},
+        )
+        return
+
+    document, _ = SearchDocument.objects.update_or_create(
+        doc_type=doc_type, object_id=instance.pk, defaults={'title': title[:255]}
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [document.pk])
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, body) VALUES (%s, %s, %s)', [document.pk, title_text, body_text]
+        )
+
+
+def index_objects(doc_type, instances):
+    """
+    Create or refresh the search documents of many objects with a few queries in total
+    (bulk writes, rebuilds). Run it inside a transaction: the old documents are deleted first.
+    """
+    config = document_config(doc_type)
+    texts = {instance.pk: _document_text(config, instance) for instance in instances}
+    if not texts:
+        return
+    remove_object(doc_type, list(texts))
+
+    documents = []
+    for object_id, (title, title_text, body_text) in texts.items():
+        document = SearchDocument(doc_type=doc_type, object_id=object_id, title=title[:255])
+        if connection.vendor == 'postgresql':
+            document.vector = _vector(title_text, body_text)
+        document.fill_defaults()
+        documents.append(document)
+    documents = SearchDocument.objects.bulk_create(documents)
+
+    if connection.vendor != 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, body) VALUES (%s, %s, %s)',
+                [(document.pk, *texts[document.object_id][1:]) for document in documents],
+            )
+
+
+def remove_object(doc_type, object_id):
+    """
+    Delete the search document of a deleted object (or of a list of object ids).
+    """
+    object_ids = object_id if isinstance(object_id, list) else [object_id]
+    if connection.vendor != 'postgresql':
+        placeholders = ', '.join(['%s'] * len(object_ids))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {FTS_TABLE} WHERE rowid IN '
+                f'(SELECT id FROM {SearchDocument._meta.db_table} WHERE doc_type = %s AND object_id IN ({placeholders}))',
+                [doc_type, *object_ids],
+            )
+    SearchDocument.objects.filter(doc_type=doc_type, object_id__in=object_ids).delete()
+
+
+def clear_documents(doc_type):
+    """
+    Delete every search document of `doc_type`.
+    """
+    if connection.vendor != 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {FTS_TABLE} WHERE rowid IN '
+                f'(SELECT id FROM {SearchDocument._meta.db_table} WHERE doc_type = %s)',
+                [doc_type],
+            )
+    SearchDocument.objects.filter(doc_type=doc_type).delete()
+
+
+def create_fts_table():
+    """
+    SQLite fallback (tests and local development): an FTS5 table whose rowid is the SearchDocument id.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(f'CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(title, body)')
+
+
+def _fts_match(terms):
+    # Terms only contain word characters, so quoting them is enough to escape the FTS5 syntax
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def _tsquery(terms):
+    return SearchQuery(' & '.join(f'{term}:*' for term in terms), search_type='raw', config=search_setting('CONFIG'))
+
+
+def search(text, doc_types=None, limit=None):
+    """
+    Ranked search over the documents, best match first. Every term has to match (as a prefix);
+    matches in the title weigh more than matches in the body.
+    Returns SearchDocument instances with a `rank` attribute.
+    """
+    terms = query_terms(text)
+    if not terms:
+        return []
+    doc_types = list(doc_types or search_setting('DOCUMENTS'))
+    limit = limit or search_setting('LIMIT')
+
+    if connection.vendor == 'postgresql':
+        query = _tsquery(terms)
+        return list(
+            SearchDocument.objects.filter(doc_type__in=doc_types, vector=query)
+            .annotate(rank=SearchRank(F('vector'), query))
+            .order_by('-rank', 'id')[:limit]
+        )
+
+    placeholders = ', '.join(['%s'] * len(doc_types))
+    return list(SearchDocument.objects.raw(
+        f'SELECT document.*, -bm25({FTS_TABLE}, 2.5, 1.0) AS rank '
+        f'FROM {FTS_TABLE} JOIN {SearchDocument._meta.db_table} document ON document.id = {FTS_TABLE}.rowid '
+        f'WHERE {FTS_TABLE} MATCH %s AND document.doc_type IN ({placeholders}) '
+        f'ORDER BY rank DESC, document.id LIMIT %s',
+        [_fts_match(terms), *doc_types, limit],
+    ))
+
+
+def matching_ids(doc_type, text):
+    """
+    Primary keys of the `doc_type` objects matching `text`: a subquery on PostgreSQL, a list on SQLite.
+    """
+    terms = query_terms(text)
+    if connection.vendor == 'postgresql':
+        return SearchDocument.objects.filter(doc_type=doc_type, vector=_tsquery(terms)).values('object_id')
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT document.object_id FROM {FTS_TABLE} '
+            f'JOIN {SearchDocument._meta.db_table} document ON document.id = {FTS_TABLE}.rowid '
+            f'WHERE {FTS_TABLE} MATCH %s AND document.doc_type = %s',
+            [_fts_match(terms), doc_type],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def connect_signals():
+    """
+    Keep the documents in sync with every model in settings.SEARCH['DOCUMENTS'].
+    Queryset update()/bulk_create() bypass signals; run `rebuild_search_index` after those.
+    """
+    for doc_type in search_setting('DOCUMENTS'):
+        def indexed(sender, instance, doc_type=doc_type, **kwargs):
+            index_object(doc_type, instance)
+
+        def removed(sender, instance, doc_type=doc_type, **kwargs):
+            remove_object(doc_type, instance.pk)
+
+        # Connected by label: the model may not be registered yet when apps.core is ready
+        model = document_config(doc_type)['MODEL']
+        post_save.connect(indexed, sender=model, weak=False, dispatch_uid=f'search-index-{doc_type}')
+        post_delete.connect(removed, sender=model, weak=False, dispatch_uid=f'search-remove-{doc_type}')
+
+
+class FullTextSearchFilter(filters.SearchFilter):
+    """
+    `?search=` through the search documents for views that set `search_document` (a key of
+    settings.SEARCH['DOCUMENTS']); other views keep the plain SearchFilter over `search_fields`.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        doc_type = getattr(view, 'search_document', None)
+        if doc_type is None:
+            return super().filter_queryset(request, queryset, view)
+
+        text = request.query_params.get(self.search_param, '')
+        if not query_terms(text):
+            return queryset
+        return queryset.filter(pk__in=matching_ids(doc_type, text))
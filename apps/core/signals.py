@@ -0,0 +1,43 @@
+from django.contrib.auth.models import User
+from django.db import connections
+from django.db.models.signals import post_delete, post_migrate, post_save, pre_migrate
+from django.dispatch import receiver
+
+from apps.core.authentication import mark_user_changed
+from apps.core.search import connect_signals, create_fts_table
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_auth(sender, instance, created=False, **kwargs):
+    """
+    Stop trusting token claims for a user once the user is edited or deleted (e.g. from the admin).
+    New users have no tokens yet, so creating one needs no invalidation.
+    """
+    if not created:
+        mark_user_changed(instance.pk)
+
+
+@receiver(pre_migrate)
+def create_trigram_extension(sender, app_config, using, **kwargs):
+    """
+    The trigram indexes behind SearchFilter (gin_trgm_ops) need pg_trgm, so make sure it exists before
+    the app migrations run. pg_trgm is a trusted extension: the database owner can create it.
+    """
+    connection = connections[using]
+    if app_config.label != 'core' or connection.vendor != 'postgresql':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+
+@receiver(post_migrate)
+def create_search_table(sender, app_config, using, **kwargs):
+    """
+    SQLite has no tsvector; its search documents live in an FTS5 table that migrations do not know about.
+    """
+    if app_config.label == 'core' and connections[using].vendor == 'sqlite':
+        create_fts_table()
+
+
+connect_signals()
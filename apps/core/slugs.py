@@ -0,0 +1,74 @@
+import os
+import secrets
+import threading
+import time
+
+from django.db import models
+from django.utils.text import slugify
+
+# Crockford's base32 without I, L, O and U, lowercased: sorts like the number it encodes
+ALPHABET = '0123456789abcdefghjkmnpqrstvwxyz'
+TIME_BITS = 48
+RANDOM_BITS = 52
+ID_LENGTH = (TIME_BITS + RANDOM_BITS) // 5
+
+_lock = threading.Lock()
+_last = [0, 0]  # (millisecond, random part) of the last id made by this process
+
+
+def _reset_after_fork():
+    # A forked worker must not continue the parent's sequence, or both would hand out the same ids
+    _last[:] = [0, 0]
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def time_ordered_id():
+    """
+    20-character id made of a 48-bit millisecond timestamp and 52 random bits (like a ULID).
+    Ids from one process are strictly increasing: within the same millisecond the random part is
+    incremented instead of drawn again. Processes only share the clock, and 52 random bits make a
+    collision between them negligible even at many thousands of ids per millisecond.
+    """
+    with _lock:
+        now = time.time_ns() // 1_000_000
+        last_time, last_random = _last
+        if now > last_time:
+            random_part = secrets.randbits(RANDOM_BITS)
+        else:
+            # Same millisecond, or the clock went back: continue from the last id
+            now, random_part = last_time, last_random + 1
+            if random_part >> RANDOM_BITS:
+                now, random_part = now + 1, secrets.randbits(RANDOM_BITS)
+        _last[:] = [now, random_part]
+
+    value = (now << RANDOM_BITS) | random_part
+    return ''.join(ALPHABET[(value >> shift) & 31] for shift in range(5 * (ID_LENGTH - 1), -1, -5))
+
+
+def make_slug(instance, max_length):
+    """
+    "<slugified slug_source>-<time-ordered id>", or only the id for models without `slug_source`.
+    Persian text is kept (allow_unicode); the title part is shortened to fit `max_length`.
+    """
+    uid = time_ordered_id()
+    source = getattr(instance, 'slug_source', None)
+    text = slugify(str(getattr(instance, source) or ''), allow_unicode=True) if source else ''
+    text = text[:max_length - ID_LENGTH - 1].strip('-_')
+    return f'{text}-{uid}' if text else uid
+
+
+class UniqueSlugField(models.SlugField):
+    """
+    Slug filled on insert by `make_slug`, in Python and without a query. Django calls pre_save() for
+    every object of a bulk_create() too, so bulk inserts get slugs as well. A slug that is set
+    explicitly is kept.
+    """
+
+    def pre_save(self, model_instance, add):
+        value = getattr(model_instance, self.attname)
+        if not value:
+            value = make_slug(model_instance, self.max_length)
+            setattr(model_instance, self.attname, value)
+        return value
@@ -0,0 +1,62 @@
+import threading
+import time
+
+
+class CircuitBreaker:
+    """
+    Fails fast once a provider has failed `failure_threshold` times in a row.
+    After `reset_timeout` seconds a single trial call is let through (half-open);
+    its outcome either closes the circuit again or keeps it open for another period.
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self):
+        """
+        True while calls are being rejected and no trial call is due yet.
+        """
+        return self.state == self.OPEN and self.retry_after() > 0
+
+    def retry_after(self):
+        """
+        Seconds until the next trial call is allowed (0 when the circuit is not open).
+        """
+        if self.state != self.OPEN:
+            return 0
+        return max(0.0, self.opened_at + self.reset_timeout - time.monotonic())
+
+    def allow(self):
+        """
+        Return True if a call may be made now.
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                return True
+            # Open, or half-open with the trial call still in flight
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
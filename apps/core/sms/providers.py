@@ -0,0 +1,202 @@
+import logging
+import threading
+import time
+
+import requests
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from apps.core.metrics import SMS_MESSAGES, SMS_PROVIDER_DURATION
+from apps.core.sms.breaker import CircuitBreaker
+
+logger = logging.getLogger(__name__)
+
+
+class SmsSendError(Exception):
+    """
+    Raised by a provider when a message could not be delivered.
+    """
+
+
+class CircuitOpenError(SmsSendError):
+    """
+    Raised without contacting the provider while its circuit breaker is open.
+    """
+
+    def __init__(self, provider, retry_after):
+        super().__init__(f'Circuit for provider "{provider}" is open, retry in {retry_after:.1f}s')
+        self.retry_after = retry_after
+
+
+class ProviderStats:
+    """
+    Thread-safe latency and error counters for one provider.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0          # Calls made to the provider
+        self.errors = 0            # Calls that failed
+        self.sent = 0              # Messages accepted by the provider
+        self.failed = 0            # Messages in failed calls
+        self.rejected = 0          # Messages refused locally because the circuit was open
+        self.latency_total = 0.0   # Seconds spent in provider calls
+        self.latency_max = 0.0
+
+    def record(self, latency, messages, ok):
+        with self._lock:
+            self.requests += 1
+            self.latency_total += latency
+            self.latency_max = max(self.latency_max, latency)
+            if ok:
+                self.sent += messages
+            else:
+                self.errors += 1
+                self.failed += messages
+
+    def record_rejected(self, messages):
+        with self._lock:
+            self.rejected += messages
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'errors': self.errors,
+                'sent': self.sent,
+                'failed': self.failed,
+                'rejected': self.rejected,
+                'latency_avg_ms': round(self.latency_total / self.requests * 1000, 2) if self.requests else 0,
+                'latency_max_ms': round(self.latency_max * 1000, 2),
+            }
+
+
+class BaseSmsProvider:
+    """
+    Base class for SMS providers configured in settings.SMS_PROVIDERS.
+    Callers should go through `deliver`, which applies the circuit breaker and records stats.
+    """
+
+    def __init__(self, name, options):
+        self.name = name
+        self.options = options
+        self.concurrency = options.get('CONCURRENCY', 4)  # Max in-flight requests per worker
+        self.bulk_size = 1  # Messages per provider call; providers with a bulk endpoint raise this
+        self.breaker = CircuitBreaker(
+            failure_threshold=options.get('BREAKER_FAILURE_THRESHOLD', 5),
+            reset_timeout=options.get('BREAKER_RESET_TIMEOUT', 30),
+        )
+        self.stats = ProviderStats()
+
+    def deliver(self, messages):
+        """
+        Deliver a list of (phone_number, body) pairs in one provider call.
+        Raises CircuitOpenError without contacting the provider while the circuit is open.
+        """
+        if not self.breaker.allow():
+            self.stats.record_rejected(len(messages))
+            SMS_MESSAGES.inc(self.name, 'rejected', amount=len(messages))
+            raise CircuitOpenError(self.name, self.breaker.retry_after())
+
+        started = time.monotonic()
+        try:
+            if len(messages) == 1:
+                self.send(*messages[0])
+            else:
+                self.send_batch(messages)
+        except Exception:
+            latency = time.monotonic() - started
+            self.breaker.record_failure()
+            self.stats.record(latency, len(messages), ok=False)
+            SMS_PROVIDER_DURATION.observe(latency, self.name, 'error')
+            SMS_MESSAGES.inc(self.name, 'failed', amount=len(messages))
+            raise
+
+        latency = time.monotonic() - started
+        self.breaker.record_success()
+        self.stats.record(latency, len(messages), ok=True)
+        SMS_PROVIDER_DURATION.observe(latency, self.name, 'ok')
+        SMS_MESSAGES.inc(self.name, 'sent', amount=len(messages))
+
+    def send(self, phone_number, body):
+        """
+        Deliver a single message. Raises SmsSendError on failure.
+        """
+        raise NotImplementedError
+
+    def send_batch(self, messages):
+        """
+        Deliver several messages in one call. Only used when `bulk_size` is greater than 1.
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """
+        Release any resources held by the provider.
+        """
+
+
+class ConsoleSmsProvider(BaseSmsProvider):
+    """
+    Writes messages to the log instead of sending them. Intended for development.
+    """
+
+    def send(self, phone_number, body):
+        logger.info('SMS to %s: %s', phone_number, body)
+
+
+class HttpSmsProvider(BaseSmsProvider):
+    """
+    Sends messages to the provider's HTTP API over a pooled keep-alive session.
+    Single messages are form-POSTed to URL. When BULK_URL is set, up to BULK_SIZE messages
+    are sent per call as JSON: {"messages": [{"phone": ..., "message": ...}, ...]}.
+    """
+
+    def __init__(self, name, options):
+        super().__init__(name, options)
+        self.url = options['URL']
+        self.bulk_url = options.get('BULK_URL')
+        if self.bulk_url:
+            self.bulk_size = options.get('BULK_SIZE', 100)
+        self.timeout = (options.get('CONNECT_TIMEOUT', 3), options.get('READ_TIMEOUT', 10))
+
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=self.concurrency)
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def send(self, phone_number, body):
+        self._post(self.url, data={'phone': phone_number, 'message': body})
+
+    def send_batch(self, messages):
+        self._post(self.bulk_url, json={
+            'messages': [{'phone': phone_number, 'message': body} for phone_number, body in messages],
+        })
+
+    def _post(self, url, **kwargs):
+        try:
+            response = self.session.post(url, timeout=self.timeout, **kwargs)
+        except requests.RequestException as e:
+            raise SmsSendError(str(e)) from e
+
+        if response.status_code != 200:
+            raise SmsSendError(f'Provider responded with status {response.status_code}')
+
+    def close(self):
+        self.session.close()
+
+
+_providers = {}
+
+
+def get_provider(name=None):
+    """
+    Return the provider instance configured under `name` (default: settings.SMS_DEFAULT_PROVIDER).
+    Instances are created once per process and reused, so their connection pools,
+    circuit breakers and stats are shared by every caller in the process.
+    """
+    name = name or settings.SMS_DEFAULT_PROVIDER
+    if name not in _providers:
+        options = settings.SMS_PROVIDERS[name]
+        _providers[name] = import_string(options['BACKEND'])(name, options)
+    return _providers[name]
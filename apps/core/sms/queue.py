@@ -0,0 +1,135 @@
+import random
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from apps.core.models import OutboundMessage
+
+QUEUE_DEFAULTS = {
+    'BATCH_SIZE': 100,
+    'MAX_ATTEMPTS': 5,
+    'RETRY_BACKOFF': 5,
+    'RETRY_BACKOFF_MAX': 600,
+    'LEASE_TIMEOUT': 120,
+    'POLL_INTERVAL': 1,
+    'STATS_INTERVAL': 60,
+    'RETENTION': 604800,
+}
+
+
+def queue_setting(key):
+    """
+    Read a value from settings.SMS_QUEUE, falling back to QUEUE_DEFAULTS.
+    """
+    return getattr(settings, 'SMS_QUEUE', {}).get(key, QUEUE_DEFAULTS[key])
+
+
+def enqueue_sms(phone_number, body, provider=None):
+    """
+    Queue a message for delivery. This is a single INSERT and never talks to the provider.
+    """
+    return OutboundMessage.objects.create(
+        provider=provider or settings.SMS_DEFAULT_PROVIDER,
+        phone_number=phone_number,
+        body=body,
+    )
+
+
+def claim_batch(provider, batch_size):
+    """
+    Atomically claim up to `batch_size` due messages for `provider`.
+    Messages left in "sending" by a worker that died are reclaimed after the lease timeout.
+    """
+    now = timezone.now()
+    lease_expired = now - timedelta(seconds=queue_setting('LEASE_TIMEOUT'))
+
+    with transaction.atomic():
+        queryset = OutboundMessage.objects.filter(provider=provider).filter(
+            Q(status='pending', next_attempt_at__lte=now) | Q(status='sending', locked_at__lt=lease_expired)
+        ).order_by('next_attempt_at')
+
+        # Let several workers drain the same provider without blocking each other
+        if connection.features.has_select_for_update_skip_locked:
+            queryset = queryset.select_for_update(skip_locked=True)
+
+        ids = list(queryset.values_list('id', flat=True)[:batch_size])
+        OutboundMessage.objects.filter(id__in=ids).update(status='sending', locked_at=now, update_at=now)
+
+    return list(OutboundMessage.objects.filter(id__in=ids))
+
+
+def mark_sent(ids):
+    """
+    Mark a batch of messages as delivered with a single UPDATE.
+    The body is cleared, so OTP codes are not kept once they are delivered.
+    """
+    now = timezone.now()
+    OutboundMessage.objects.filter(id__in=ids).update(
+        status='sent',
+        body='',
+        sent_at=now,
+        locked_at=None,
+        attempts=F('attempts') + 1,
+        update_at=now,
+    )
+
+
+def mark_failed(message, error):
+    """
+    Record a failed attempt and schedule a retry with exponential backoff and jitter.
+    The message is given up on (and its body cleared) after SMS_QUEUE['MAX_ATTEMPTS'] attempts.
+    """
+    now = timezone.now()
+    message.attempts += 1
+    message.last_error = str(error)
+    message.locked_at = None
+
+    if message.attempts >= queue_setting('MAX_ATTEMPTS'):
+        message.status = 'failed'
+        message.body = ''
+    else:
+        delay = min(queue_setting('RETRY_BACKOFF') * 2 ** (message.attempts - 1), queue_setting('RETRY_BACKOFF_MAX'))
+        message.status = 'pending'
+        message.next_attempt_at = now + timedelta(seconds=delay * random.uniform(0.5, 1.0))
+
+    message.save()
+
+
+def release(ids, retry_at):
+    """
+    Put claimed messages back in the queue without counting an attempt,
+    e.g. when the provider's circuit breaker rejected them.
+    """
+    OutboundMessage.objects.filter(id__in=ids).update(
+        status='pending',
+        locked_at=None,
+        next_attempt_at=retry_at,
+        update_at=timezone.now(),
+    )
+
+
+def finished_messages(retention=None):
+    """
+    Sent and failed messages last updated more than `retention` seconds ago (SMS_QUEUE['RETENTION']).
+    """
+    retention = queue_setting('RETENTION') if retention is None else retention
+    cutoff = timezone.now() - timedelta(seconds=retention)
+    return OutboundMessage.objects.filter(status__in=('sent', 'failed'), update_at__lt=cutoff)
+
+
+def purge_finished(retention=None, batch_size=5000):
+    """
+    Delete finished messages past the retention period, `batch_size` rows per DELETE.
+    Returns the number of messages deleted.
+    """
+    queryset = finished_messages(retention)
+    deleted = 0
+    while True:
+        ids = list(queryset.values_list('id', flat=True)[:batch_size])
+        if not ids:
+            return deleted
+        OutboundMessage.objects.filter(id__in=ids).delete()
+        deleted += len(ids)
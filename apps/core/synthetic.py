@@ -0,0 +1,304 @@
+import io
+import json
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.db import DEFAULT_DB_ALIAS, connection, connections, models
+from django.utils import timezone
+from PIL import Image
+
+from apps.core.models import StudentInformation, Teacher
+from apps.core.search import document_model, index_objects, search_setting
+from apps.package.cache import invalidate
+from apps.package.models.insights import Category, Comment, FAQ
+from apps.package.models.package import Course, Lesson, Season
+from apps.package.stats import recompute
+from apps.payment.models.payment import Transaction
+from apps.payment.models.subscription import ImmediatePayment, InstallmentPayment, PaymentType, Subscription
+from apps.textbook.models import TextBook
+
+BANNER_NAME = 'courses/banners/synthetic.jpg'
+PDF_NAME = 'textbooks/synthetic.pdf'
+
+# Rows per table at scale 1.0, shaped like production: few courses, many lessons and comments,
+# and most of the volume in subscriptions, installment schedules and transactions
+SYNTHETIC_COUNTS = {
+    'users': 20000,
+    'teachers': 200,
+    'categories': 100,
+    'courses': 2000,
+    'seasons_per_course': 4,
+    'lessons_per_season': 5,
+    'faqs_per_course': 3,
+    'comments': 40000,
+    'subscriptions': 200000,
+    'transactions': 200000,
+    'textbooks': 1000,
+}
+
+WORDS = [
+    'آموزش', 'ریاضی', 'فیزیک', 'شیمی', 'زیست', 'ادبیات', 'عربی', 'زبان', 'انگلیسی', 'هندسه',
+    'حسابان', 'آمار', 'کنکور', 'جمع‌بندی', 'تست', 'مفهومی', 'پایه', 'دهم', 'یازدهم', 'دوازدهم',
+    'python', 'django', 'algebra', 'calculus', 'review', 'intro', 'advanced', 'workshop', 'lab', 'final',
+]
+
+# Backslash escapes of COPY's text format
+COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+
+def sentence(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+
+def counts_for(scale):
+    """
+    SYNTHETIC_COUNTS scaled by `scale`; the per-parent counts stay as they are.
+    """
+    return {
+        key: value if key.endswith('_per_course') or key.endswith('_per_season') else max(int(value * scale), 1)
+        for key, value in SYNTHETIC_COUNTS.items()
+    }
+
+
+def minimal_pdf(pages=1):
+    """
+    Bytes of a valid PDF with `pages` empty A4 pages.
+    """
+    kids = ' '.join(f'{3 + n} 0 R' for n in range(pages))
+    objects = [b'<< /Type /Catalog /Pages 2 0 R >>', f'<< /Type /Pages /Kids [{kids}] /Count {pages} >>'.encode()]
+    objects += [b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] >>'] * pages
+    output, offsets = io.BytesIO(b'%PDF-1.4\n'), []
+    output.seek(0, io.SEEK_END)
+    for number, body in enumerate(objects, start=1):
+        offsets.append(output.tell())
+        output.write(b'%d 0 obj\n%s\nendobj\n' % (number, body))
+    xref = output.tell()
+    output.write(b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1))
+    output.write(b''.join(b'%010d 00000 n \n' % offset for offset in offsets))
+    output.write(b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref))
+    return output.getvalue()
+
+
+def placeholder_files():
+    """
+    Store the banner and PDF every synthetic course and textbook points at, unless they exist already,
+    so variant generation and downloads work on the synthetic rows.
+    """
+    storage = Course._meta.get_field('banner').storage
+    if not storage.exists(BANNER_NAME):
+        buffer = io.BytesIO()
+        Image.linear_gradient('L').resize((1600, 900)).convert('RGB').save(buffer, format='JPEG', quality=85)
+        storage.save(BANNER_NAME, ContentFile(buffer.getvalue()))
+    storage = TextBook._meta.get_field('pdf_file').storage
+    if not storage.exists(PDF_NAME):
+        storage.save(PDF_NAME, ContentFile(minimal_pdf(pages=20)))
+
+
+def copy_value(field, value, db):
+    """
+    `value` of `field` in COPY's text format, prepared for the `db` connection.
+    """
+    if isinstance(field, models.JSONField):
+        # get_db_prep_save() wraps JSON in a driver adapter that has no text form
+        value = None if value is None else json.dumps(value, cls=field.encoder)
+    else:
+        value = field.get_db_prep_save(value, db)
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    return str(value).translate(COPY_ESCAPES)
+
+
+def copy_create(model, objects):
+    """
+    Insert `objects` with a single COPY (PostgreSQL), several times faster than a multi-row INSERT.
+    The pks are drawn from the table's sequence first, and every value goes through pre_save() and
+    get_db_prep_save() as in bulk_create(), so defaults, timestamps and slugs are filled the same way.
+    """
+    opts = model._meta
+    fields = opts.local_concrete_fields
+    db = connections[DEFAULT_DB_ALIAS]  # Not the `connection` proxy: it is looked up for every value
+    quote = db.ops.quote_name
+    with db.cursor() as cursor:
+        cursor.execute(
+            'SELECT nextval(pg_get_serial_sequence(%s, %s)) FROM generate_series(1, %s)',
+            [opts.db_table, opts.pk.column, len(objects)],
+        )
+        for obj, (pk,) in zip(objects, cursor.fetchall()):
+            obj.pk = pk
+
+        data = io.StringIO()
+        for obj in objects:
+            data.write('\t'.join(copy_value(field, field.pre_save(obj, True), db) for field in fields) + '\n')
+        data.seek(0)
+        sql = f'COPY {quote(opts.db_table)} ({", ".join(quote(field.column) for field in fields)}) FROM STDIN'
+        if hasattr(cursor.cursor, 'copy_expert'):  # psycopg2
+            cursor.cursor.copy_expert(sql, data)
+        else:  # psycopg 3
+            with cursor.cursor.copy(sql) as copy:
+                copy.write(data.getvalue())
+
+    for obj in objects:
+        obj._state.adding, obj._state.db = False, db.alias
+    return objects
+
+
+def bulk_insert(model, objects, batch_size, copy=False):
+    """
+    Insert `objects` (any iterable, consumed lazily) one batch at a time, with COPY if `copy`
+    and bulk_create() otherwise. Returns the new pks.
+    """
+    create = (lambda batch: copy_create(model, batch)) if copy else model.objects.bulk_create
+    pks, batch = [], []
+    for obj in objects:
+        batch.append(obj)
+        if len(batch) == batch_size:
+            pks.extend(created.pk for created in create(batch))
+            batch = []
+    if batch:
+        pks.extend(created.pk for created in create(batch))
+    return pks
+
+
+def generate(scale=1.0, seed=0, batch_size=5000, counts=None, copy=None, log=print):
+    """
+    Insert a referentially consistent synthetic dataset (see SYNTHETIC_COUNTS, overridden by `counts`)
+    in batches, with COPY on PostgreSQL unless `copy` is False. Rows of different seeds do not collide,
+    so a larger dataset can be built up from several runs. No signals are sent, so the course statistics,
+    search documents and cached responses are refreshed at the end. Returns {model label: inserted rows}.
+    """
+    rng = random.Random(seed)
+    counts = {**counts_for(scale), **(counts or {})}
+    if copy is None:
+        copy = connection.vendor == 'postgresql'
+    now = timezone.now()
+    inserted, first_pks = {}, {}
+
+    def insert(model, objects):
+        started = time.monotonic()
+        pks = bulk_insert(model, objects, batch_size, copy=copy)
+        label = model._meta.label
+        inserted[label] = inserted.get(label, 0) + len(pks)
+        if pks:
+            first_pks.setdefault(model, min(pks))
+        log(f'{label}: {len(pks)} row(s) in {time.monotonic() - started:.1f}s')
+        return pks
+
+    placeholder_files()
+    password = make_password(None)  # Unusable, like the users created by VerifyOtpView
+    user_ids = insert(User, (
+        User(username=f'09{seed % 100:02d}{i:07d}', password=password,
+             date_joined=now - timedelta(days=rng.randint(0, 720)))
+        for i in range(counts['users'])
+    ))
+    insert(StudentInformation, (
+        StudentInformation(
+            user_id=user_id, id_code=f'{seed % 100:02d}{i:08d}',
+            birthday=(now - timedelta(days=rng.randint(5000, 7000))).date(),
+            year=rng.choice(StudentInformation.YEAR_CHOICES)[0],
+            gender=rng.choice(StudentInformation.GENDER_CHOICES)[0],
+        )
+        # Most students fill in their information after the first login
+        for i, user_id in enumerate(user_ids) if i % 5
+    ))
+    teacher_ids = insert(Teacher, (
+        Teacher(full_name=sentence(rng, 2), about=sentence(rng, 30)) for _ in range(counts['teachers'])
+    ))
+    category_ids = insert(Category, (Category(title=sentence(rng, 2)) for _ in range(counts['categories'])))
+
+    course_ids = insert(Course, (
+        Course(
+            title=sentence(rng, 4), description=sentence(rng, 60), banner=BANNER_NAME,
+            has_installment_payment=rng.random() < 0.7, installment_payment_count=rng.choice([2, 3, 4, 6]),
+            current_price=rng.randrange(1_000_000, 50_000_000, 100_000), total_hours=rng.randint(5, 120),
+        )
+        for _ in range(counts['courses'])
+    ))
+    insert(Course.teachers.through, (
+        Course.teachers.through(course_id=course_id, teacher_id=teacher_id)
+        for course_id in course_ids for teacher_id in rng.sample(teacher_ids, min(2, len(teacher_ids)))
+    ))
+    insert(Course.categories.through, (
+        Course.categories.through(course_id=course_id, category_id=category_id)
+        for course_id in course_ids for category_id in rng.sample(category_ids, min(2, len(category_ids)))
+    ))
+    season_ids = insert(Season, (
+        Season(name=f'{sentence(rng, 2)} {n + 1}', course_id=course_id)
+        for course_id in course_ids for n in range(counts['seasons_per_course'])
+    ))
+    insert(Lesson, (
+        Lesson(
+            title=sentence(rng, 5), video_url=f'https://video.example.com/{season_id}/{n}.mp4',
+            duration_minutes=rng.randint(5, 90), is_free=n == 0, season_id=season_id,
+        )
+        for season_id in season_ids for n in range(counts['lessons_per_season'])
+    ))
+    insert(FAQ, (
+        FAQ(question=f'{sentence(rng, 6)}؟', answer=sentence(rng, 25), course_id=course_id)
+        for course_id in course_ids for _ in range(counts['faqs_per_course'])
+    ))
+    insert(Comment, (
+        Comment(user_id=rng.choice(user_ids), course_id=rng.choice(course_ids), comment_text=sentence(rng, 20))
+        for _ in range(counts['comments'])
+    ))
+
+    # One subscription per (user, course) pair: each user walks the courses from its own offset
+    subscriptions = min(counts['subscriptions'], len(user_ids) * len(course_ids))
+    pairs = [
+        (user_ids[i % len(user_ids)], course_ids[(i % len(user_ids) * 7919 + i // len(user_ids)) % len(course_ids)])
+        for i in range(subscriptions)
+    ]
+    payment_types = [PaymentType.INSTALLMENT if rng.random() < 0.7 else PaymentType.IMMEDIATE for _ in pairs]
+    subscription_ids = insert(Subscription, (
+        Subscription(user_id=user_id, course_id=course_id, payment_type=payment_type)
+        for (user_id, course_id), payment_type in zip(pairs, payment_types)
+    ))
+    insert(InstallmentPayment, (
+        InstallmentPayment(
+            subscription_id=subscription_id, amount=rng.randrange(500_000, 5_000_000, 10_000),
+            payment_due_date=(now + timedelta(days=30 * n - rng.randint(0, 120))).date(),
+            is_paid=rng.random() < 0.8,
+        )
+        for subscription_id, payment_type in zip(subscription_ids, payment_types)
+        if payment_type == PaymentType.INSTALLMENT for n in range(3)
+    ))
+    insert(ImmediatePayment, (
+        ImmediatePayment(subscription_id=subscription_id, amount=rng.randrange(1_000_000, 50_000_000, 100_000))
+        for subscription_id, payment_type in zip(subscription_ids, payment_types)
+        if payment_type == PaymentType.IMMEDIATE
+    ))
+    insert(Transaction, (
+        Transaction(user_id=rng.choice(user_ids), amount=rng.randrange(100_000, 50_000_000, 10_000),
+                    description=sentence(rng, 4))
+        for _ in range(counts['transactions'])
+    ))
+    insert(TextBook, (
+        TextBook(
+            title=sentence(rng, 3), description=sentence(rng, 40), pdf_file=PDF_NAME,
+            processing_status='ready', processed_at=now, page_count=rng.randint(20, 400),
+        )
+        for _ in range(counts['textbooks'])
+    ))
+
+    log('Refreshing course statistics, search documents and caches...')
+    recompute(course_ids)
+    for doc_type in search_setting('DOCUMENTS'):
+        model = document_model(doc_type)
+        if model not in first_pks:
+            continue
+        batch = []
+        new_rows = model.objects.filter(pk__gte=first_pks[model]).order_by('pk')
+        for instance in new_rows.iterator(chunk_size=batch_size):
+            batch.append(instance)
+            if len(batch) == batch_size:
+                index_objects(doc_type, batch)
+                batch = []
+        index_objects(doc_type, batch)
+    for resource in ('course', 'course-catalog', 'season', 'lesson', 'category', 'faq'):
+        invalidate(resource, everything=True)
+    return inserted
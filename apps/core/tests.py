@@ -1,3 +1,508 @@
-from django.test import TestCase
+import base64
+import hashlib
+import multiprocessing
+import tempfile
+import time
+import unittest
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.files.storage import default_storage
+from django.db import connection, connections
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from apps.core.authentication import AuthRefreshToken, CachedJWTAuthentication, token_user_cache
+from apps.core.blacklist import BlacklistChecker, blacklist_checker
+from apps.core.models import OtpCode, OutboundMessage, Teacher, UploadSession
+from apps.core.otp import EXPIRED, INVALID, LOCKED, MISSING, VERIFIED, CacheOtpStore, DatabaseOtpStore
+from apps.core.ratelimit import CacheRateLimitBackend, LocalRateLimitBackend, RateLimiter, parse_rate
+from apps.core.search import FTS_TABLE, matching_ids, search
+from apps.core.slugs import ID_LENGTH, time_ordered_id
+from apps.core.sms.queue import claim_batch, enqueue_sms, mark_failed, mark_sent, purge_finished
+from apps.package.models.insights import Category
+from apps.textbook.models import TextBook
+
+
+class SearchTests(TestCase):
+    """
+    Full-text search on the configured database: tsvector documents on PostgreSQL,
+    the FTS5 fallback table on SQLite.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        # Arabic yeh and kaf in the title, a ZWNJ in the description
+        cls.math = TextBook.objects.create(
+            title='آموزش رياضي', description='تمرين‌های ترم اول', pdf_file='textbooks/math.pdf'
+        )
+        cls.physics = TextBook.objects.create(
+            title='Physics basics', description='Mechanics and waves', pdf_file='textbooks/physics.pdf'
+        )
+
+    def search_ids(self, text):
+        return [document.object_id for document in search(text, ['textbook'])]
+
+    def test_fts_table_on_sqlite(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('The FTS5 fallback is only used on SQLite')
+        self.assertIn(FTS_TABLE, connection.introspection.table_names())
+
+    def test_normalized_prefix_match(self):
+        self.assertEqual(self.search_ids('ریاض'), [self.math.pk])
+        self.assertEqual(self.search_ids('PHYS'), [self.physics.pk])
+
+    def test_zwnj_spellings(self):
+        for text in ('تمرینهای', 'تمرین های', 'تمرین‌های'):
+            self.assertEqual(self.search_ids(text), [self.math.pk], text)
+
+    def test_every_term_has_to_match(self):
+        self.assertEqual(self.search_ids('physics waves'), [self.physics.pk])
+        self.assertEqual(self.search_ids('physics chemistry'), [])
+
+    def test_title_ranks_above_body(self):
+        waves = TextBook.objects.create(title='Waves', description='Sound', pdf_file='textbooks/waves.pdf')
+        self.assertEqual(self.search_ids('waves'), [waves.pk, self.physics.pk])
+
+    def test_documents_follow_saves_and_deletes(self):
+        self.physics.title = 'Chemistry'
+        self.physics.description = ''
+        self.physics.save()
+        self.assertEqual(self.search_ids('physics'), [])
+        self.assertEqual(self.search_ids('chem'), [self.physics.pk])
+
+        self.physics.delete()
+        self.assertEqual(self.search_ids('chem'), [])
+
+    def test_matching_ids_filters_a_queryset(self):
+        matches = TextBook.objects.filter(pk__in=matching_ids('textbook', 'mechanics'))
+        self.assertEqual(list(matches), [self.physics])
+
+    def test_search_endpoint(self):
+        response = self.client.get(reverse('search'), {'q': 'ریاضی'})
+        self.assertEqual(response.status_code, 200)
+        # Textbooks are only searched for signed-in users
+        self.assertEqual(response.json()['results'], [])
+
+        response = self.client.get(reverse('search'), {'q': ''})
+        self.assertEqual(response.status_code, 400)
+
+
+class OtpStoreTestsMixin:
+    options = {'CACHE_ALIAS': 'otp', 'TTL': 120, 'MAX_ATTEMPTS': 3}
+
+    def setUp(self):
+        caches['otp'].clear()
+        self.store = self.store_class(self.options)
+
+    def test_verify_consumes_the_code(self):
+        self.store.issue('0912', '123456')
+        self.assertEqual(self.store.verify('0912', '123456'), VERIFIED)
+        self.assertEqual(self.store.verify('0912', '123456'), MISSING)
+        self.assertEqual(self.store.verify('0913', '123456'), MISSING)
+
+    def test_wrong_codes_lock_the_code(self):
+        self.store.issue('0912', '123456')
+        for _ in range(3):
+            self.assertEqual(self.store.verify('0912', '000000'), INVALID)
+        self.assertEqual(self.store.verify('0912', '123456'), LOCKED)
+        self.assertEqual(self.store.verify('0912', '123456'), MISSING)
+
+    def test_issue_resets_the_attempts(self):
+        self.store.issue('0912', '111111')
+        for _ in range(3):
+            self.store.verify('0912', '000000')
+        self.store.issue('0912', '222222')
+        self.assertEqual(self.store.verify('0912', '111111'), INVALID)
+        self.assertEqual(self.store.verify('0912', '222222'), VERIFIED)
+
+
+class CacheOtpStoreTests(OtpStoreTestsMixin, TestCase):
+    store_class = CacheOtpStore
+
+    def test_code_expires(self):
+        self.store.issue('0912', '123456')
+        with mock.patch('time.time', return_value=time.time() + 121):
+            # The cache drops the code at its TTL, so an old code looks like no code
+            self.assertEqual(self.store.verify('0912', '123456'), MISSING)
+
+
+class DatabaseOtpStoreTests(OtpStoreTestsMixin, TestCase):
+    store_class = DatabaseOtpStore
+
+    def test_code_expires(self):
+        self.store.issue('0912', '123456')
+        OtpCode.objects.update(create_at=timezone.now() - timedelta(seconds=121))
+        self.assertEqual(self.store.verify('0912', '123456'), EXPIRED)
+        self.assertFalse(OtpCode.objects.exists())
+
+
+class RateLimiterTests(TestCase):
+
+    def setUp(self):
+        caches['otp'].clear()
+
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate('5/m'), (5, 60))
+        self.assertEqual(parse_rate('3/10m'), (3, 600))
+        self.assertEqual(parse_rate('100/d'), (100, 86400))
+        for rate in ('5', '5/w', 'm/5', '-1/m'):
+            with self.assertRaises(ValueError):
+                parse_rate(rate)
+
+    def check_sliding_window(self, backend):
+        limiter = RateLimiter('test', '3/m', backend)
+        with mock.patch('apps.core.ratelimit.time.time', return_value=60000.0):
+            self.assertEqual([limiter.hit('0912')[0] for _ in range(3)], [True] * 3)
+            self.assertEqual(limiter.hit('0912'), (False, 60))
+            self.assertTrue(limiter.hit('0913')[0])
+
+        # A quarter of the previous window (4 requests) still overlaps: 4 * 0.25 + 2 <= 3
+        with mock.patch('apps.core.ratelimit.time.time', return_value=60105.0):
+            self.assertEqual([limiter.hit('0912')[0] for _ in range(3)], [True, True, False])
+        self.assertEqual(limiter.dropped, 2)
+
+    def test_local_backend(self):
+        self.check_sliding_window(LocalRateLimitBackend({}))
+
+    def test_cache_backend(self):
+        self.check_sliding_window(CacheRateLimitBackend({'CACHE_ALIAS': 'otp'}))
+
+    def test_send_otp_is_throttled_per_phone_number(self):
+        url = reverse('send_otp')
+        for _ in range(3):
+            self.assertEqual(self.client.post(url, {'phone_number': '09120000000'}).status_code, 200)
+        response = self.client.post(url, {'phone_number': '09120000000'})
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+        self.assertEqual(OutboundMessage.objects.count(), 3)
+
+        self.assertEqual(self.client.post(url, {'phone_number': '09120000001'}).status_code, 200)
+
+
+@override_settings(SMS_QUEUE={'MAX_ATTEMPTS': 3, 'RETRY_BACKOFF': 10, 'RETRY_BACKOFF_MAX': 30, 'LEASE_TIMEOUT': 60})
+class SmsQueueTests(TestCase):
+
+    def test_claim_takes_due_messages_once(self):
+        due = [enqueue_sms('0912', f'Code {index}', provider='default') for index in range(3)]
+        enqueue_sms('0912', 'Other provider', provider='console')
+        later = enqueue_sms('0912', 'Later', provider='default')
+        later.next_attempt_at = timezone.now() + timedelta(minutes=1)
+        later.save()
+
+        claimed = claim_batch('default', 10)
+        self.assertEqual(sorted(message.pk for message in claimed), [message.pk for message in due])
+        self.assertTrue(all(message.status == 'sending' for message in claimed))
+        self.assertEqual(claim_batch('default', 10), [])
+
+    def test_expired_lease_is_reclaimed(self):
+        message = enqueue_sms('0912', 'Code', provider='default')
+        claim_batch('default', 10)
+        OutboundMessage.objects.filter(pk=message.pk).update(locked_at=timezone.now() - timedelta(seconds=61))
+        self.assertEqual([claimed.pk for claimed in claim_batch('default', 10)], [message.pk])
+
+    def test_backoff_then_give_up(self):
+        message = enqueue_sms('0912', 'Code', provider='default')
+        delays = []
+        for _ in range(2):
+            message, = claim_batch('default', 10)
+            before = timezone.now()
+            mark_failed(message, 'timeout')
+            self.assertEqual(message.status, 'pending')
+            delays.append((message.next_attempt_at - before).total_seconds())
+            OutboundMessage.objects.filter(pk=message.pk).update(next_attempt_at=timezone.now())
+        # 10s then 20s, with up to half of it taken off as jitter
+        self.assertTrue(5 <= delays[0] <= 10 and 10 <= delays[1] <= 20, delays)
+
+        message, = claim_batch('default', 10)
+        mark_failed(message, 'timeout')
+        message.refresh_from_db()
+        self.assertEqual((message.status, message.attempts, message.body), ('failed', 3, ''))
+        self.assertEqual(message.last_error, 'timeout')
+
+    def test_sent_messages_are_cleared_and_purged(self):
+        old, recent = (enqueue_sms('0912', 'Code', provider='default') for _ in range(2))
+        pending = enqueue_sms('0912', 'Code', provider='default')
+        mark_sent([old.pk, recent.pk])
+        self.assertEqual(set(OutboundMessage.objects.filter(status='sent').values_list('body', flat=True)), {''})
+
+        OutboundMessage.objects.filter(pk__in=[old.pk, pending.pk]).update(update_at=timezone.now() - timedelta(days=8))
+        self.assertEqual(purge_finished(batch_size=1), 1)
+        self.assertEqual(set(OutboundMessage.objects.values_list('pk', flat=True)), {recent.pk, pending.pk})
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    """
+    Claims are only trusted with a cache shared by the processes; a file cache stands in for Redis.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.cache_dir = tempfile.TemporaryDirectory()
+        cls.enterClassContext(override_settings(CACHES={
+            'default': {
+                'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                'LOCATION': cls.cache_dir.name,
+            },
+            'otp': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'otp'},
+        }))
+        cls.addClassCleanup(cls.cache_dir.cleanup)
+        super().setUpClass()
+
+    def setUp(self):
+        caches['default'].clear()
+        token_user_cache.clear()
+        self.user = User.objects.create(username='09120000000', is_staff=True)
+        self.token = str(AuthRefreshToken.for_user(self.user).access_token)
+
+    def authenticate(self, token=None):
+        request = RequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {token or self.token}')
+        return CachedJWTAuthentication().authenticate(request)[0]
+
+    def test_claims_are_trusted_without_queries(self):
+        with self.assertNumQueries(0):
+            user = self.authenticate()
+            self.authenticate()
+        self.assertEqual(
+            (user.pk, user.username, user.is_active, user.is_staff), (self.user.pk, '09120000000', True, True)
+        )
+
+    def test_every_request_gets_its_own_user(self):
+        first = self.authenticate()
+        first.is_staff = False
+        first.username = 'changed'
+        second = self.authenticate()
+        self.assertIsNot(first, second)
+        self.assertEqual((second.username, second.is_staff), ('09120000000', True))
+
+    def test_user_change_revokes_the_claims(self):
+        self.assertTrue(self.authenticate().is_staff)
+        self.user.is_staff = False
+        self.user.save()
+        # The cached entry is evicted and the claims predate the change, so the row is read
+        with self.assertNumQueries(1):
+            self.assertFalse(self.authenticate().is_staff)
+
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_inactive_claim_is_rejected(self):
+        refresh = AuthRefreshToken.for_user(self.user)
+        refresh['is_active'] = False
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(str(refresh.access_token))
+
+    def test_local_memory_cache_is_not_trusted(self):
+        with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}):
+            with self.assertNumQueries(1):
+                self.authenticate()
+
+
+class BlacklistTests(TestCase):
+
+    def setUp(self):
+        caches['default'].clear()
+        token_user_cache.clear()
+        blacklist_checker.rebuild()
+        self.user = User.objects.create(username='09120000000')
+
+    def test_refresh_after_logout(self):
+        refresh = AuthRefreshToken.for_user(self.user)
+        response = self.client.post(reverse('refresh_token'), {'refresh': str(refresh)})
+        self.assertEqual(response.status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse('logout'), {'refresh': str(refresh)},
+                HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}',
+            )
+        self.assertEqual(response.status_code, 205)
+
+        response = self.client.post(reverse('refresh_token'), {'refresh': str(refresh)})
+        self.assertEqual(response.status_code, 401)
+
+    def test_other_process_sees_rows_committed_out_of_id_order(self):
+        other = BlacklistChecker()
+        other.rebuild()
+        first, second = (AuthRefreshToken.for_user(self.user) for _ in range(2))
+
+        # The later logout gets the lower id, but commits after the other one was read
+        higher = OutstandingToken.objects.get(jti=first['jti'])
+        with self.captureOnCommitCallbacks(execute=True):
+            BlacklistedToken.objects.create(id=100, token=higher)
+            blacklist_checker.add(first['jti'])
+        self.assertTrue(other.is_blacklisted(first['jti']))
+
+        lower = OutstandingToken.objects.get(jti=second['jti'])
+        with self.captureOnCommitCallbacks(execute=True):
+            BlacklistedToken.objects.create(id=50, token=lower)
+            blacklist_checker.add(second['jti'])
+        self.assertTrue(other.is_blacklisted(second['jti']))
+
+    def test_lost_log_entry_rebuilds(self):
+        other = BlacklistChecker()
+        other.rebuild()
+        token = AuthRefreshToken.for_user(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            token.blacklist()
+        caches['default'].delete('jwt-blacklist:jti:1')
+        self.assertTrue(other.is_blacklisted(token['jti']))
+        self.assertFalse(other.is_blacklisted(AuthRefreshToken.for_user(self.user)['jti']))
+
+
+class ChunkedUploadTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.media_root = tempfile.TemporaryDirectory()
+        cls.enterClassContext(override_settings(MEDIA_ROOT=cls.media_root.name))
+        cls.addClassCleanup(cls.media_root.cleanup)
+        super().setUpClass()
+
+    def setUp(self):
+        self.user = User.objects.create(username='09120000000', is_staff=True)
+        self.client.defaults['HTTP_AUTHORIZATION'] = f'Bearer {AuthRefreshToken.for_user(self.user).access_token}'
+        self.content = bytes(range(256)) * 40
+        response = self.client.post(
+            reverse('upload_create'), {'target': 'textbook.pdf_file', 'filename': 'algebra.pdf', 'size': 10240}
+        )
+        self.assertEqual(response.status_code, 201)
+        self.url = response['Location']
+
+    def send(self, offset, data, checksum=None):
+        checksum = checksum or base64.b64encode(hashlib.sha256(data).digest()).decode()
+        return self.client.patch(
+            self.url, data, content_type='application/offset+octet-stream',
+            headers={'Upload-Offset': str(offset), 'Upload-Checksum': f'sha256 {checksum}'},
+        )
+
+    def test_resume_from_the_stored_offset(self):
+        self.assertEqual(self.send(0, self.content[:4096])['Upload-Offset'], '4096')
+        # A retried chunk or one sent ahead is refused with the offset to resume from
+        for offset in (0, 8192):
+            response = self.send(offset, self.content[offset:offset + 1024])
+            self.assertEqual(response.status_code, 409)
+            self.assertEqual(response.json()['error'], 'Expected Upload-Offset 4096.')
+
+        self.assertEqual(self.client.head(self.url)['Upload-Offset'], '4096')
+        response = self.send(4096, self.content[4096:])
+        self.assertEqual(response.json()['status'], 'complete')
+
+        session = UploadSession.objects.get(token=response.json()['token'])
+        with default_storage.open(session.file_name) as file:
+            self.assertEqual(file.read(), self.content)
+        self.assertEqual(self.send(10240, b'x').status_code, 409)
+
+    def test_rejected_chunks_keep_the_offset(self):
+        bad_checksum = base64.b64encode(hashlib.sha256(b'other').digest()).decode()
+        self.assertEqual(self.send(0, self.content[:1024], bad_checksum).status_code, 460)
+        # Past the announced size
+        self.assertEqual(self.send(0, self.content + b'x').status_code, 413)
+        self.assertEqual(self.client.get(self.url).json()['offset'], 0)
+
+
+class ConditionalGetTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.teachers = [Teacher.objects.create(full_name=f'Teacher {index}', about='') for index in range(3)]
+
+    def get(self, url, etag=None, **params):
+        headers = {'HTTP_IF_NONE_MATCH': etag} if etag else {}
+        return self.client.get(url, params, **headers)
+
+    def test_not_modified_without_serializing(self):
+        url = reverse('user-teacher-list')
+        etag = self.get(url)['ETag']
+        # Only the aggregate query runs
+        with self.assertNumQueries(1):
+            response = self.get(url, etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response.content, b'')
+
+    def test_etag_follows_edits_and_deletes(self):
+        url = reverse('user-teacher-list')
+        etag = self.get(url)['ETag']
+
+        self.teachers[0].about = 'Edited'
+        self.teachers[0].save()
+        response = self.get(url, etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+        etag = response['ETag']
+        self.teachers[1].delete()
+        self.assertEqual(self.get(url, etag).status_code, 200)
+
+    def test_etag_depends_on_the_page(self):
+        url = reverse('user-teacher-list')
+        first = self.get(url, page_size=1)
+        self.assertNotEqual(first['ETag'], self.get(url, page_size=2)['ETag'])
+
+        following = self.client.get(first.json()['next'])
+        self.assertEqual(following.status_code, 200)
+        self.assertNotEqual(following['ETag'], first['ETag'])
+
+    def test_retrieve(self):
+        url = reverse('user-teacher-detail', args=[self.teachers[2].pk])
+        etag = self.get(url)['ETag']
+        self.assertEqual(self.get(url, etag).status_code, 304)
+        # Editing another teacher leaves this one's ETag alone
+        self.teachers[0].save()
+        self.assertEqual(self.get(url, etag).status_code, 304)
+
+        self.assertEqual(self.get(reverse('user-teacher-detail', args=[0])).status_code, 404)
+
+
+def insert_categories(title, rows, batch_size):
+    """
+    Forked worker of SlugConcurrencyTests: bulk-insert `rows` categories titled `title`.
+    """
+    try:
+        for start in range(0, rows, batch_size):
+            Category.objects.bulk_create([Category(title=title) for _ in range(min(batch_size, rows - start))])
+    finally:
+        connection.close()
+
+
+class SlugTests(TestCase):
+
+    def test_ids_are_time_ordered(self):
+        ids = [time_ordered_id() for _ in range(10000)]
+        self.assertEqual(ids, sorted(set(ids)))
+        self.assertTrue(all(len(uid) == ID_LENGTH for uid in ids))
+
+    def test_bulk_create_fills_slugs(self):
+        categories = Category.objects.bulk_create([Category(title='ریاضی پایه') for _ in range(500)])
+        slugs = [category.slug for category in categories]
+        self.assertEqual(len(set(slugs)), 500)
+        self.assertTrue(all(slug.startswith('ریاضی-پایه-') for slug in slugs))
+
+    def test_explicit_slug_is_kept(self):
+        self.assertEqual(Category.objects.create(title='x', slug='custom').slug, 'custom')
+
+
+@unittest.skipUnless(connection.vendor == 'postgresql', 'SQLite serializes the writers')
+class SlugConcurrencyTests(TransactionTestCase):
+    processes = 8
+    rows = 40000
+
+    def test_parallel_bulk_inserts_get_unique_slugs(self):
+        # Identical titles, so only the time-ordered id tells the slugs apart
+        title = 'slug concurrency'
+        # Forked workers have to open their own connections
+        connections.close_all()
+        with multiprocessing.get_context('fork').Pool(self.processes) as pool:
+            pool.starmap(insert_categories, [(title, self.rows // self.processes, 1000)] * self.processes)
+
+        categories = Category.objects.filter(title=title)
+        self.assertEqual(categories.count(), self.rows)
+        self.assertEqual(categories.values('slug').distinct().count(), self.rows)
@@ -0,0 +1,224 @@
+import base64
+import hashlib
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import models, transaction
+from django.utils import timezone
+from rest_framework import serializers
+
+from apps.core.models import UploadSession
+
+UPLOAD_DEFAULTS = {
+    'CHUNK_SIZE': 8 * 1024 * 1024,
+    'MAX_CHUNK_SIZE': 32 * 1024 * 1024,
+    'EXPIRES': 60 * 60 * 24,
+    'TARGETS': {},
+}
+
+CHECKSUM_ALGORITHMS = ('sha256', 'sha1', 'md5')
+READ_SIZE = 64 * 1024
+
+
+def upload_setting(key):
+    """
+    Read a value from settings.CHUNKED_UPLOAD, falling back to UPLOAD_DEFAULTS.
+    """
+    return getattr(settings, 'CHUNKED_UPLOAD', {}).get(key, UPLOAD_DEFAULTS[key])
+
+
+class UploadError(Exception):
+    """
+    A rejected upload request; `status` is the HTTP status to answer with.
+    """
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def target_field(target):
+    """
+    The model FileField an upload target ends up in, e.g. "textbook.pdf_file" -> TextBook.pdf_file.
+    """
+    try:
+        config = upload_setting('TARGETS')[target]
+    except KeyError:
+        raise UploadError(f'Unknown upload target "{target}".')
+    app_label, model_name, field_name = config['FIELD'].split('.')
+    return apps.get_model(app_label, model_name)._meta.get_field(field_name), config
+
+
+def start_upload(user, target, filename, size):
+    """
+    Open an upload session and preallocate its file, so every chunk can be written at its final offset.
+    """
+    field, config = target_field(target)
+    extension = os.path.splitext(filename)[1].lstrip('.').lower()
+    if config.get('EXTENSIONS') and extension not in config['EXTENSIONS']:
+        raise UploadError(f'File type ".{extension}" is not allowed for {target}.')
+    if size <= 0 or size > config.get('MAX_SIZE', size):
+        raise UploadError(f'File size must be between 1 and {config.get("MAX_SIZE")} bytes.', status=413)
+
+    session = UploadSession(
+        user=user,
+        target=target,
+        filename=os.path.basename(filename),
+        size=size,
+        expires_at=timezone.now() + timedelta(seconds=upload_setting('EXPIRES')),
+    )
+    session.file_name = f'uploads/partial/{session.token.hex}'
+    path = default_storage.path(session.file_name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as file:
+        # Sparse on most filesystems: no bytes are written until the chunks arrive
+        file.truncate(size)
+    session.save()
+    return session
+
+
+def parse_checksum(header):
+    """
+    Parse an `Upload-Checksum: <algorithm> <base64 digest>` header (tus checksum extension).
+    """
+    try:
+        algorithm, digest = header.split()
+        digest = base64.b64decode(digest, validate=True)
+    except ValueError:
+        raise UploadError('Upload-Checksum must be "<algorithm> <base64 digest>".')
+    if algorithm not in CHECKSUM_ALGORITHMS:
+        raise UploadError(f'Checksum algorithm must be one of {", ".join(CHECKSUM_ALGORITHMS)}.')
+    return algorithm, digest
+
+
+def check_offset(session, offset, length):
+    if session.status != 'uploading':
+        raise UploadError('This upload is already complete.', status=409)
+    if offset != session.offset:
+        # The client has to HEAD the session and resume from the stored offset
+        raise UploadError(f'Expected Upload-Offset {session.offset}.', status=409)
+    if offset + length > session.size:
+        raise UploadError('Chunk goes past the announced file size.', status=413)
+
+
+def write_chunk(session, offset, length, stream, checksum):
+    """
+    Write `length` bytes from `stream` at `offset` and advance the session once the chunk's checksum matches.
+    The chunk is received into a spooled temporary file first, so a slow client holds no database
+    connection or lock; the session row is only locked while the received bytes are copied into place,
+    so concurrent retries of the same chunk cannot interleave.
+    Returns the updated session.
+    """
+    algorithm, expected = parse_checksum(checksum)
+    if length > upload_setting('MAX_CHUNK_SIZE'):
+        raise UploadError(f'Chunks must not exceed {upload_setting("MAX_CHUNK_SIZE")} bytes.', status=413)
+    # Rejected before the body is read; checked again under the lock
+    check_offset(session, offset, length)
+
+    with tempfile.SpooledTemporaryFile(max_size=settings.FILE_UPLOAD_MAX_MEMORY_SIZE) as chunk:
+        digest = hashlib.new(algorithm)
+        received = 0
+        while received < length:
+            data = stream.read(min(READ_SIZE, length - received))
+            if not data:
+                break
+            digest.update(data)
+            chunk.write(data)
+            received += len(data)
+
+        if received != length:
+            raise UploadError('Connection closed before the whole chunk was received.')
+        if digest.digest() != expected:
+            raise UploadError('Checksum mismatch.', status=460)
+
+        chunk.seek(0)
+        with transaction.atomic():
+            session = UploadSession.objects.select_for_update().get(pk=session.pk)
+            check_offset(session, offset, length)
+            with open(default_storage.path(session.file_name), 'r+b') as file:
+                file.seek(offset)
+                shutil.copyfileobj(chunk, file, READ_SIZE)
+
+            session.offset += length
+            if session.offset == session.size:
+                finish_upload(session)
+            session.save(update_fields=['offset', 'status', 'file_name', 'update_at'])
+    return session
+
+
+def finish_upload(session):
+    """
+    Move the complete file to its final name under the target field's `upload_to`.
+    This is a rename, so the file is never copied a second time.
+    """
+    field, _ = target_field(session.target)
+    partial = default_storage.path(session.file_name)
+
+    if isinstance(field, models.ImageField):
+        from PIL import Image
+        try:
+            with Image.open(partial) as image:
+                image.verify()
+        except Exception:
+            raise UploadError('The uploaded file is not a valid image.')
+
+    final_name = field.storage.get_available_name(field.generate_filename(None, session.filename))
+    final_path = field.storage.path(final_name)
+    os.makedirs(os.path.dirname(final_path), exist_ok=True)
+    os.replace(partial, final_path)
+
+    session.file_name = final_name
+    session.status = 'complete'
+
+
+def abort_upload(session):
+    """
+    Delete an unfinished upload and its partial file.
+    """
+    if session.status == 'uploading':
+        default_storage.delete(session.file_name)
+    session.delete()
+
+
+class ChunkedUploadSerializerMixin:
+    """
+    ModelSerializer mixin that accepts `<field>_upload`, the token of a completed upload session, in place
+    of a multipart file for each field in `chunked_upload_fields` ({field name: upload target}).
+    The uploaded file is attached by name, so it is not copied again.
+    """
+    chunked_upload_fields = {}
+
+    def get_fields(self):
+        fields = super().get_fields()
+        for name in self.chunked_upload_fields:
+            fields[name].required = False
+            fields[f'{name}_upload'] = serializers.UUIDField(write_only=True, required=False)
+        return fields
+
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        self._claimed_uploads = []
+        for name, target in self.chunked_upload_fields.items():
+            token = attrs.pop(f'{name}_upload', None)
+            if token is not None:
+                session = UploadSession.objects.filter(
+                    token=token, target=target, status='complete', user=self.context['request'].user
+                ).first()
+                if session is None:
+                    raise serializers.ValidationError({f'{name}_upload': 'No completed upload with this token.'})
+                attrs[name] = session.file_name
+                self._claimed_uploads.append(session.pk)
+            elif self.instance is None and name not in attrs:
+                raise serializers.ValidationError({name: 'Upload a file or pass the token of a chunked upload.'})
+        return attrs
+
+    def save(self, **kwargs):
+        instance = super().save(**kwargs)
+        # The file now belongs to the instance
+        UploadSession.objects.filter(pk__in=getattr(self, '_claimed_uploads', [])).delete()
+        return instance
@@ -1,3 +1,16 @@
-from django.shortcuts import render
+from django.http import Http404, HttpResponse
+from django.utils.crypto import constant_time_compare
 
-# Create your views here.
+from apps.core.metrics import metrics_setting, registry
+
+
+def metrics_view(request):
+    """
+    Prometheus scrape endpoint. With METRICS['TOKEN'] set, the scraper has to send it as a bearer token.
+    """
+    if not metrics_setting('ENABLED'):
+        raise Http404
+    token = metrics_setting('TOKEN')
+    if token and not constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return HttpResponse('Unauthorized', status=401, content_type='text/plain')
+    return HttpResponse(registry.exposition(), content_type='text/plain; version=0.0.4; charset=utf-8')
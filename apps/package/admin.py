@@ -27,7 +27,8 @@ class CourseAdmin(admin.ModelAdmin):
     """
     Admin configuration for the Course model.
     """
-    list_display = ('title', 'current_price', 'discounted_price', 'has_installment_payment', 'total_hours')
+    list_display = ('title', 'current_price', 'discounted_price', 'has_installment_payment', 'total_hours',
+                    'lesson_count', 'subscriber_count')
     list_filter = ('has_installment_payment', 'categories')
     search_fields = ('title', 'description')
     filter_horizontal = ('categories', 'teachers')
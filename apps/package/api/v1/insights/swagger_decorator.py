@@ -109,12 +109,12 @@ admin_list_category_swagger = swagger_auto_schema(
     operation_description=(
         'This endpoint allows administrators to retrieve a list of all category records. '
         'The response includes details for each category, such as ID, name, and other category information. '
-        'Optional search functionality is available using the "search" query parameter to filter by name. '
+        'Optional search functionality is available using the "search" query parameter to filter by title. '
         'This operation is restricted to admin users only and requires JWT authentication.'
     ),
     tags=['admin.category'],
     manual_parameters=[
-        openapi.Parameter('search', openapi.IN_QUERY, description="Filter categories by name (partial match).", type=openapi.TYPE_STRING)
+        openapi.Parameter('search', openapi.IN_QUERY, description="Filter categories by title (partial match).", type=openapi.TYPE_STRING)
     ],
     responses={
         200: CategorySerializer(many=True),
@@ -146,12 +146,12 @@ public_list_category_swagger = swagger_auto_schema(
     operation_description=(
         'This endpoint allows public access to retrieve a list of all category records. '
         'The response includes details for each category, such as ID, name, and other category information. '
-        'Optional search functionality is available using the "search" query parameter to filter by name. '
+        'Optional search functionality is available using the "search" query parameter to filter by title. '
         'No authentication is required for this operation.'
     ),
     tags=['public.category'],
     manual_parameters=[
-        openapi.Parameter('search', openapi.IN_QUERY, description="Filter categories by name (partial match).", type=openapi.TYPE_STRING)
+        openapi.Parameter('search', openapi.IN_QUERY, description="Filter categories by title (partial match).", type=openapi.TYPE_STRING)
     ],
     responses={
         200: CategorySerializer(many=True)
@@ -265,12 +265,12 @@ admin_list_faq_swagger = swagger_auto_schema(
     operation_description=(
         'This endpoint allows administrators to retrieve a list of all FAQ records. '
         'The response includes details for each FAQ, such as ID, question, answer, and other FAQ information. '
-        'Optional search functionality is available using the "search" query parameter to filter by question. '
+        'Optional search functionality is available using the "search" query parameter to run a full-text search of questions and answers. '
         'This operation is restricted to admin users only and requires JWT authentication.'
     ),
     tags=['admin.faq'],
     manual_parameters=[
-        openapi.Parameter('search', openapi.IN_QUERY, description="Filter FAQs by question (partial match).", type=openapi.TYPE_STRING)
+        openapi.Parameter('search', openapi.IN_QUERY, description="Full-text search in FAQ questions and answers (prefix match).", type=openapi.TYPE_STRING)
     ],
     responses={
         200: FAQSerializer(many=True),
@@ -302,12 +302,12 @@ public_list_faq_swagger = swagger_auto_schema(
     operation_description=(
         'This endpoint allows public access to retrieve a list of all FAQ records. '
         'The response includes details for each FAQ, such as ID, question, answer, and other FAQ information. '
-        'Optional search functionality is available using the "search" query parameter to filter by question. '
+        'Optional search functionality is available using the "search" query parameter to run a full-text search of questions and answers. '
         'No authentication is required for this operation.'
     ),
     tags=['public.faq'],
     manual_parameters=[
-        openapi.Parameter('search', openapi.IN_QUERY, description="Filter FAQs by question (partial match).", type=openapi.TYPE_STRING)
+        openapi.Parameter('search', openapi.IN_QUERY, description="Full-text search in FAQ questions and answers (prefix match).", type=openapi.TYPE_STRING)
     ],
     responses={
         200: FAQSerializer(many=True)
@@ -421,12 +421,12 @@ admin_list_comment_swagger = swagger_auto_schema(
     operation_description=(
         'This endpoint allows administrators to retrieve a list of all comment records. '
         'The response includes details for each comment, such as ID, content, and other comment information. '
-        'Optional search functionality is available using the "search" query parameter to filter by content. '
+        'Optional search functionality is available using the "search" query parameter to filter by comment text. '
         'This operation is restricted to admin users only and requires JWT authentication.'
     ),
     tags=['admin.comment'],
     manual_parameters=[
-        openapi.Parameter('search', openapi.IN_QUERY, description="Filter comments by content (partial match).", type=openapi.TYPE_STRING)
+        openapi.Parameter('search', openapi.IN_QUERY, description="Filter comments by text (partial match).", type=openapi.TYPE_STRING)
     ],
     responses={
         200: CommentSerializer(many=True),
@@ -458,12 +458,12 @@ public_list_comment_swagger = swagger_auto_schema(
     operation_description=(
         'This endpoint allows public access to retrieve a list of all comment records. '
         'The response includes details for each comment, such as ID, content, and other comment information. '
-        'Optional search functionality is available using the "search" query parameter to filter by content. '
+        'Optional search functionality is available using the "search" query parameter to filter by comment text. '
         'No authentication is required for this operation.'
     ),
     tags=['public.comment'],
     manual_parameters=[
-        openapi.Parameter('search', openapi.IN_QUERY, description="Filter comments by content (partial match).", type=openapi.TYPE_STRING)
+        openapi.Parameter('search', openapi.IN_QUERY, description="Filter comments by text (partial match).", type=openapi.TYPE_STRING)
     ],
     responses={
         200: CommentSerializer(many=True)
@@ -2,7 +2,10 @@ from django.utils.decorators import method_decorator
 from rest_framework import filters
 from rest_framework.viewsets import ModelViewSet, ReadOnlyModelViewSet
 from rest_framework.permissions import IsAdminUser, AllowAny
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from apps.core.authentication import CachedJWTAuthentication
+from apps.core.conditional import ConditionalGetMixin
+from apps.core.search import FullTextSearchFilter
+from apps.package.cache import CatalogCacheMixin
 from apps.package.models.insights import Category, FAQ, Comment
 from apps.package.serializers.insights import CategorySerializer, FAQSerializer, CommentSerializer
 from .swagger_decorator import (
@@ -43,26 +46,29 @@ class CategoryAdminAPIView(ModelViewSet):
     """
     Admin-only API ViewSet for managing Category records.
     """
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [CachedJWTAuthentication]
     permission_classes = [IsAdminUser]
     serializer_class = CategorySerializer
+    cursor_ordering = 'id'
     queryset = Category.objects.all()
     filter_backends = [filters.SearchFilter]
-    search_fields = ['name']
+    search_fields = ['title']
 
 
 @method_decorator(name='retrieve', decorator=public_retrieve_category_swagger)
 @method_decorator(name='list', decorator=public_list_category_swagger)
-class CategoryPublicAPIView(ReadOnlyModelViewSet):
+class CategoryPublicAPIView(ConditionalGetMixin, CatalogCacheMixin, ReadOnlyModelViewSet):
     """
     Public API ViewSet for viewing Category records.
     """
     authentication_classes = []
     permission_classes = [AllowAny]
+    catalog_resource = 'category'
     serializer_class = CategorySerializer
+    cursor_ordering = 'id'
     queryset = Category.objects.all()
     filter_backends = [filters.SearchFilter]
-    search_fields = ['name']
+    search_fields = ['title']
 
 
 @method_decorator(name='create', decorator=admin_create_faq_swagger)
@@ -75,26 +81,29 @@ class FAQAdminAPIView(ModelViewSet):
     """
     Admin-only API ViewSet for managing FAQ records.
     """
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [CachedJWTAuthentication]
     permission_classes = [IsAdminUser]
     serializer_class = FAQSerializer
+    cursor_ordering = 'id'
     queryset = FAQ.objects.all()
-    filter_backends = [filters.SearchFilter]
-    search_fields = ['question']
+    filter_backends = [FullTextSearchFilter]
+    search_document = 'faq'
 
 
 @method_decorator(name='retrieve', decorator=public_retrieve_faq_swagger)
 @method_decorator(name='list', decorator=public_list_faq_swagger)
-class FAQPublicAPIView(ReadOnlyModelViewSet):
+class FAQPublicAPIView(ConditionalGetMixin, CatalogCacheMixin, ReadOnlyModelViewSet):
     """
     Public API ViewSet for viewing FAQ records.
     """
     authentication_classes = []
     permission_classes = [AllowAny]
+    catalog_resource = 'faq'
     serializer_class = FAQSerializer
+    cursor_ordering = 'id'
     queryset = FAQ.objects.all()
-    filter_backends = [filters.SearchFilter]
-    search_fields = ['question']
+    filter_backends = [FullTextSearchFilter]
+    search_document = 'faq'
 
 
 @method_decorator(name='create', decorator=admin_create_comment_swagger)
@@ -107,23 +116,25 @@ class CommentAdminAPIView(ModelViewSet):
     """
     Admin-only API ViewSet for managing Comment records.
     """
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [CachedJWTAuthentication]
     permission_classes = [IsAdminUser]
     serializer_class = CommentSerializer
+    cursor_ordering = '-id'
     queryset = Comment.objects.all()
     filter_backends = [filters.SearchFilter]
-    search_fields = ['content']
+    search_fields = ['comment_text']
 
 
 @method_decorator(name='retrieve', decorator=public_retrieve_comment_swagger)
 @method_decorator(name='list', decorator=public_list_comment_swagger)
-class CommentPublicAPIView(ReadOnlyModelViewSet):
+class CommentPublicAPIView(ConditionalGetMixin, ReadOnlyModelViewSet):
     """
     Public API ViewSet for viewing Comment records.
     """
     authentication_classes = []
     permission_classes = [AllowAny]
     serializer_class = CommentSerializer
+    cursor_ordering = '-id'
     queryset = Comment.objects.all()
     filter_backends = [filters.SearchFilter]
-    search_fields = ['content']
\ No newline at end of file
+    search_fields = ['comment_text']
\ No newline at end of file
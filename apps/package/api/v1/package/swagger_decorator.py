@@ -1,6 +1,6 @@
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
-from apps.package.serializers.package import CourseSerializer, SeasonSerializer, LessonSerializer
+from apps.package.serializers.package import CourseSerializer, SeasonSerializer, LessonSerializer, CourseCatalogSerializer
 
 # CourseAdminAPIView Decorators
 admin_create_course_swagger = swagger_auto_schema(
@@ -109,12 +109,12 @@ admin_list_course_swagger = swagger_auto_schema(
     operation_description=(
         'This endpoint allows administrators to retrieve a list of all course records. '
         'The response includes details for each course, such as ID, title, and other course information. '
-        'Optional search functionality is available using the "search" query parameter to filter by title. '
+        'Optional search functionality is available using the "search" query parameter to run a full-text search of titles and descriptions. '
         'This operation is restricted to admin users only and requires JWT authentication.'
     ),
     tags=['admin.course'],
     manual_parameters=[
-        openapi.Parameter('search', openapi.IN_QUERY, description="Filter courses by title (partial match).", type=openapi.TYPE_STRING)
+        openapi.Parameter('search', openapi.IN_QUERY, description="Full-text search in course titles and descriptions (prefix match).", type=openapi.TYPE_STRING)
     ],
     responses={
         200: CourseSerializer(many=True),
@@ -146,18 +146,65 @@ public_list_course_swagger = swagger_auto_schema(
     operation_description=(
         'This endpoint allows public access to retrieve a list of all course records. '
         'The response includes details for each course, such as ID, title, and other course information. '
-        'Optional search functionality is available using the "search" query parameter to filter by title. '
+        'Optional search functionality is available using the "search" query parameter to run a full-text search of titles and descriptions. '
+        'Courses can be sorted by popularity or length with "ordering" and filtered by their lesson count, '
+        'total minutes and subscriber count. '
         'No authentication is required for this operation.'
     ),
     tags=['public.course'],
     manual_parameters=[
-        openapi.Parameter('search', openapi.IN_QUERY, description="Filter courses by title (partial match).", type=openapi.TYPE_STRING)
+        openapi.Parameter('search', openapi.IN_QUERY, description="Full-text search in course titles and descriptions (prefix match).", type=openapi.TYPE_STRING),
+        openapi.Parameter(
+            'ordering', openapi.IN_QUERY, description="Sort key; prefix with '-' for descending. Default: id.",
+            type=openapi.TYPE_STRING,
+            enum=['subscriber_count', '-subscriber_count', 'lesson_count', '-lesson_count',
+                  'total_minutes', '-total_minutes', 'comment_count', '-comment_count'],
+        ),
     ],
     responses={
         200: CourseSerializer(many=True)
     }
 )
 
+public_course_banner_variant_swagger = swagger_auto_schema(
+    operation_summary='Course Banner Variant (Public)',
+    operation_description=(
+        'This endpoint redirects to a resized variant of the course banner. '
+        'The URLs are listed in the "banner_srcset" field of courses; a variant that has not been generated '
+        'yet is built on the first request and stored. '
+        'No authentication is required for this operation.'
+    ),
+    tags=['public.course'],
+    manual_parameters=[
+        openapi.Parameter('id', openapi.IN_PATH, description="The ID of the course.", type=openapi.TYPE_INTEGER),
+        openapi.Parameter('width', openapi.IN_PATH, description="One of the configured variant widths.", type=openapi.TYPE_INTEGER),
+        openapi.Parameter('fmt', openapi.IN_PATH, description="Image format: webp or jpeg.", type=openapi.TYPE_STRING)
+    ],
+    responses={
+        302: 'Redirect to the variant image.',
+        404: 'Not Found: Unknown course, width or format.'
+    }
+)
+
+# CourseCatalogPublicAPIView Decorators
+public_retrieve_course_catalog_swagger = swagger_auto_schema(
+    operation_summary='Retrieve Course Catalog Page (Public)',
+    operation_description=(
+        'This endpoint allows public access to everything needed to render a course page in one request. '
+        'The response includes the course with its seasons and their lessons, teachers, categories and FAQs, '
+        'plus the total number of lessons and total lesson minutes. '
+        'No authentication is required for this operation.'
+    ),
+    tags=['public.course'],
+    manual_parameters=[
+        openapi.Parameter('id', openapi.IN_PATH, description="The ID of the course to retrieve.", type=openapi.TYPE_INTEGER)
+    ],
+    responses={
+        200: CourseCatalogSerializer,
+        404: 'Not Found: Course with the specified ID does not exist.'
+    }
+)
+
 # SeasonAdminAPIView Decorators
 admin_create_season_swagger = swagger_auto_schema(
     operation_summary='Create a New Season (Admin)',
@@ -265,12 +312,12 @@ admin_list_season_swagger = swagger_auto_schema(
     operation_description=(
         'This endpoint allows administrators to retrieve a list of all season records. '
         'The response includes details for each season, such as ID, course, title, and other season information. '
-        'Optional search functionality is available using the "search" query parameter to filter by title. '
+        'Optional search functionality is available using the "search" query parameter to filter by name. '
         'This operation is restricted to admin users only and requires JWT authentication.'
     ),
     tags=['admin.season'],
     manual_parameters=[
-        openapi.Parameter('search', openapi.IN_QUERY, description="Filter seasons by title (partial match).", type=openapi.TYPE_STRING)
+        openapi.Parameter('search', openapi.IN_QUERY, description="Filter seasons by name (partial match).", type=openapi.TYPE_STRING)
     ],
     responses={
         200: SeasonSerializer(many=True),
@@ -279,6 +326,62 @@ admin_list_season_swagger = swagger_auto_schema(
     }
 )
 
+admin_bulk_create_season_swagger = swagger_auto_schema(
+    operation_summary='Bulk Create Seasons (Admin)',
+    operation_description=(
+        'This endpoint allows administrators to create many seasons in one request. '
+        'The request body is a list of season objects (at most settings.BULK["MAX_ITEMS"]), written in a single transaction. '
+        'If any item is invalid nothing is created, and the 400 response lists one error object per item ({} for valid items). '
+        'This operation is restricted to admin users only and requires JWT authentication.'
+    ),
+    tags=['admin.season'],
+    request_body=SeasonSerializer(many=True),
+    responses={
+        201: SeasonSerializer(many=True),
+        400: 'Invalid input data: one error object per item.',
+        401: 'Unauthorized: Valid JWT token required for admin users.',
+        403: 'Forbidden: User is not an admin.',
+        409: 'Conflict: The rows conflict with each other or with existing rows.'
+    }
+)
+
+admin_bulk_update_season_swagger = swagger_auto_schema(
+    operation_summary='Bulk Partially Update Seasons (Admin)',
+    operation_description=(
+        'This endpoint allows administrators to partially update many seasons in one request. '
+        'The request body is a list of season objects, each with its "id" and only the fields to change, written in a single transaction. '
+        'If any item is invalid or its id does not exist nothing is updated, and the 400 response lists one error object per item. '
+        'This operation is restricted to admin users only and requires JWT authentication.'
+    ),
+    tags=['admin.season'],
+    request_body=SeasonSerializer(many=True, partial=True),
+    responses={
+        200: SeasonSerializer(many=True),
+        400: 'Invalid input data: one error object per item.',
+        401: 'Unauthorized: Valid JWT token required for admin users.',
+        403: 'Forbidden: User is not an admin.',
+        409: 'Conflict: The rows conflict with each other or with existing rows.'
+    }
+)
+
+admin_bulk_destroy_season_swagger = swagger_auto_schema(
+    operation_summary='Bulk Delete Seasons (Admin)',
+    operation_description=(
+        'This endpoint allows administrators to delete many seasons in one request. '
+        'The request body is a list of season IDs. If any of them does not exist nothing is deleted, '
+        'and the 400 response lists one error object per ID. '
+        'This operation is restricted to admin users only and requires JWT authentication.'
+    ),
+    tags=['admin.season'],
+    request_body=openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_INTEGER)),
+    responses={
+        204: 'Seasons successfully deleted.',
+        400: 'Invalid input data: one error object per ID.',
+        401: 'Unauthorized: Valid JWT token required for admin users.',
+        403: 'Forbidden: User is not an admin.'
+    }
+)
+
 # SeasonPublicAPIView Decorators
 public_retrieve_season_swagger = swagger_auto_schema(
     operation_summary='Retrieve Season Details (Public)',
@@ -302,12 +405,12 @@ public_list_season_swagger = swagger_auto_schema(
     operation_description=(
         'This endpoint allows public access to retrieve a list of all season records. '
         'The response includes details for each season, such as ID, course, title, and other season information. '
-        'Optional search functionality is available using the "search" query parameter to filter by title. '
+        'Optional search functionality is available using the "search" query parameter to filter by name. '
         'No authentication is required for this operation.'
     ),
     tags=['public.season'],
     manual_parameters=[
-        openapi.Parameter('search', openapi.IN_QUERY, description="Filter seasons by title (partial match).", type=openapi.TYPE_STRING)
+        openapi.Parameter('search', openapi.IN_QUERY, description="Filter seasons by name (partial match).", type=openapi.TYPE_STRING)
     ],
     responses={
         200: SeasonSerializer(many=True)
@@ -421,12 +524,12 @@ admin_list_lesson_swagger = swagger_auto_schema(
     operation_description=(
         'This endpoint allows administrators to retrieve a list of all lesson records. '
         'The response includes details for each lesson, such as ID, season, title, and other lesson information. '
-        'Optional search functionality is available using the "search" query parameter to filter by title. '
+        'Optional search functionality is available using the "search" query parameter to run a full-text search of titles. '
         'This operation is restricted to admin users only and requires JWT authentication.'
     ),
     tags=['admin.lesson'],
     manual_parameters=[
-        openapi.Parameter('search', openapi.IN_QUERY, description="Filter lessons by title (partial match).", type=openapi.TYPE_STRING)
+        openapi.Parameter('search', openapi.IN_QUERY, description="Full-text search in lesson titles (prefix match).", type=openapi.TYPE_STRING)
     ],
     responses={
         200: LessonSerializer(many=True),
@@ -435,6 +538,62 @@ admin_list_lesson_swagger = swagger_auto_schema(
     }
 )
 
+admin_bulk_create_lesson_swagger = swagger_auto_schema(
+    operation_summary='Bulk Create Lessons (Admin)',
+    operation_description=(
+        'This endpoint allows administrators to create many lessons in one request. '
+        'The request body is a list of lesson objects (at most settings.BULK["MAX_ITEMS"]), written in a single transaction. '
+        'If any item is invalid nothing is created, and the 400 response lists one error object per item ({} for valid items). '
+        'This operation is restricted to admin users only and requires JWT authentication.'
+    ),
+    tags=['admin.lesson'],
+    request_body=LessonSerializer(many=True),
+    responses={
+        201: LessonSerializer(many=True),
+        400: 'Invalid input data: one error object per item.',
+        401: 'Unauthorized: Valid JWT token required for admin users.',
+        403: 'Forbidden: User is not an admin.',
+        409: 'Conflict: The rows conflict with each other or with existing rows.'
+    }
+)
+
+admin_bulk_update_lesson_swagger = swagger_auto_schema(
+    operation_summary='Bulk Partially Update Lessons (Admin)',
+    operation_description=(
+        'This endpoint allows administrators to partially update many lessons in one request. '
+        'The request body is a list of lesson objects, each with its "id" and only the fields to change, written in a single transaction. '
+        'If any item is invalid or its id does not exist nothing is updated, and the 400 response lists one error object per item. '
+        'This operation is restricted to admin users only and requires JWT authentication.'
+    ),
+    tags=['admin.lesson'],
+    request_body=LessonSerializer(many=True, partial=True),
+    responses={
+        200: LessonSerializer(many=True),
+        400: 'Invalid input data: one error object per item.',
+        401: 'Unauthorized: Valid JWT token required for admin users.',
+        403: 'Forbidden: User is not an admin.',
+        409: 'Conflict: The rows conflict with each other or with existing rows.'
+    }
+)
+
+admin_bulk_destroy_lesson_swagger = swagger_auto_schema(
+    operation_summary='Bulk Delete Lessons (Admin)',
+    operation_description=(
+        'This endpoint allows administrators to delete many lessons in one request. '
+        'The request body is a list of lesson IDs. If any of them does not exist nothing is deleted, '
+        'and the 400 response lists one error object per ID. '
+        'This operation is restricted to admin users only and requires JWT authentication.'
+    ),
+    tags=['admin.lesson'],
+    request_body=openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_INTEGER)),
+    responses={
+        204: 'Lessons successfully deleted.',
+        400: 'Invalid input data: one error object per ID.',
+        401: 'Unauthorized: Valid JWT token required for admin users.',
+        403: 'Forbidden: User is not an admin.'
+    }
+)
+
 # LessonPublicAPIView Decorators
 public_retrieve_lesson_swagger = swagger_auto_schema(
     operation_summary='Retrieve Lesson Details (Public)',
@@ -458,12 +617,12 @@ public_list_lesson_swagger = swagger_auto_schema(
     operation_description=(
         'This endpoint allows public access to retrieve a list of all lesson records. '
         'The response includes details for each lesson, such as ID, season, title, and other lesson information. '
-        'Optional search functionality is available using the "search" query parameter to filter by title. '
+        'Optional search functionality is available using the "search" query parameter to run a full-text search of titles. '
         'No authentication is required for this operation.'
     ),
     tags=['public.lesson'],
     manual_parameters=[
-        openapi.Parameter('search', openapi.IN_QUERY, description="Filter lessons by title (partial match).", type=openapi.TYPE_STRING)
+        openapi.Parameter('search', openapi.IN_QUERY, description="Full-text search in lesson titles (prefix match).", type=openapi.TYPE_STRING)
     ],
     responses={
         200: LessonSerializer(many=True)
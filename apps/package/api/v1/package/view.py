@@ -1,10 +1,22 @@
+from django.db.models import Prefetch
+from django.http import Http404, HttpResponseRedirect
 from django.utils.decorators import method_decorator
+from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters
-from rest_framework.viewsets import ModelViewSet, ReadOnlyModelViewSet
+from rest_framework.decorators import action
+from rest_framework.mixins import RetrieveModelMixin
+from rest_framework.viewsets import GenericViewSet, ModelViewSet, ReadOnlyModelViewSet
 from rest_framework.permissions import IsAdminUser, AllowAny
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from apps.core.authentication import CachedJWTAuthentication
+from apps.core.conditional import ConditionalGetMixin, ConditionalRetrieveMixin
+from apps.core.search import FullTextSearchFilter
+from apps.package.bulk import CatalogBulkMixin
+from apps.package.cache import CatalogCacheMixin, CatalogCacheRetrieveMixin
+from apps.package.images import record_variants, render_variants, variant_setting
+from apps.package.models.insights import FAQ
 from apps.package.models.package import Course, Season, Lesson
-from apps.package.serializers.package import CourseSerializer, SeasonSerializer, LessonSerializer
+from apps.package.serializers.package import CourseSerializer, SeasonSerializer, LessonSerializer, \
+    CourseCatalogSerializer
 from .swagger_decorator import (
     admin_create_course_swagger,
     admin_retrieve_course_swagger,
@@ -14,12 +26,17 @@ from .swagger_decorator import (
     admin_list_course_swagger,
     public_retrieve_course_swagger,
     public_list_course_swagger,
+    public_course_banner_variant_swagger,
+    public_retrieve_course_catalog_swagger,
     admin_create_season_swagger,
     admin_retrieve_season_swagger,
     admin_update_season_swagger,
     admin_partial_update_season_swagger,
     admin_destroy_season_swagger,
     admin_list_season_swagger,
+    admin_bulk_create_season_swagger,
+    admin_bulk_update_season_swagger,
+    admin_bulk_destroy_season_swagger,
     public_retrieve_season_swagger,
     public_list_season_swagger,
     admin_create_lesson_swagger,
@@ -28,6 +45,9 @@ from .swagger_decorator import (
     admin_partial_update_lesson_swagger,
     admin_destroy_lesson_swagger,
     admin_list_lesson_swagger,
+    admin_bulk_create_lesson_swagger,
+    admin_bulk_update_lesson_swagger,
+    admin_bulk_destroy_lesson_swagger,
     public_retrieve_lesson_swagger,
     public_list_lesson_swagger,
 )
@@ -42,25 +62,91 @@ class CourseAdminAPIView(ModelViewSet):
     """
     Admin-only API ViewSet for managing Course records.
     """
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [CachedJWTAuthentication]
     permission_classes = [IsAdminUser]
     serializer_class = CourseSerializer
-    queryset = Course.objects.all()
-    filter_backends = [filters.SearchFilter]
-    search_fields = ['title']
+    cursor_ordering = 'id'
+    queryset = Course.objects.prefetch_related('teachers', 'categories')
+    filter_backends = [FullTextSearchFilter]
+    search_document = 'course'
 
 @method_decorator(name='retrieve', decorator=public_retrieve_course_swagger)
 @method_decorator(name='list', decorator=public_list_course_swagger)
-class CoursePublicAPIView(ReadOnlyModelViewSet):
+@method_decorator(name='banner_variant', decorator=public_course_banner_variant_swagger)
+class CoursePublicAPIView(ConditionalGetMixin, CatalogCacheMixin, ReadOnlyModelViewSet):
     """
     Public API ViewSet for viewing Course records.
+    Sort by popularity or length with `?ordering=-subscriber_count` / `?ordering=total_minutes` etc.,
+    filter by length with `?total_minutes__lte=`, `?lesson_count__gte=`.
     """
     authentication_classes = []
     permission_classes = [AllowAny]
+    catalog_resource = 'course'
     serializer_class = CourseSerializer
-    queryset = Course.objects.all()
-    filter_backends = [filters.SearchFilter]
-    search_fields = ['title']
+    cursor_ordering = 'id'
+    cursor_ordering_options = [
+        'subscriber_count', '-subscriber_count', 'lesson_count', '-lesson_count',
+        'total_minutes', '-total_minutes', 'comment_count', '-comment_count',
+    ]
+    queryset = Course.objects.prefetch_related('teachers', 'categories')
+    filter_backends = [FullTextSearchFilter, DjangoFilterBackend]
+    search_document = 'course'
+    filterset_fields = {
+        'lesson_count': ['gte', 'lte'],
+        'total_minutes': ['gte', 'lte'],
+        'subscriber_count': ['gte'],
+    }
+
+    @action(detail=True, methods=['get'], url_path=r'banner/(?P<width>\d+)/(?P<fmt>[a-z]+)', url_name='banner-variant')
+    def banner_variant(self, request, pk=None, width=None, fmt=None):
+        """
+        Redirect to a banner variant, building and storing it first if the worker has not done so yet.
+        """
+        width = int(width)
+        if width not in variant_setting('WIDTHS') or fmt not in variant_setting('FORMATS'):
+            raise Http404
+        course = Course.objects.only('banner', 'banner_variants').filter(pk=pk).first()
+        if course is None or not course.banner:
+            raise Http404
+
+        storage = course.banner.storage
+        name = course.banner_variants.get(fmt, {}).get(str(width))
+        if not name:
+            try:
+                names = render_variants(storage, course.banner.name, [(width, fmt)])
+            except Exception:
+                # Unreadable image: serve the original rather than an error
+                return HttpResponseRedirect(course.banner.url)
+            record_variants(course.pk, course.banner.name, names)
+            name = names[(width, fmt)]
+
+        response = HttpResponseRedirect(storage.url(name))
+        response['Cache-Control'] = 'public, max-age=3600'
+        return response
+
+@method_decorator(name='retrieve', decorator=public_retrieve_course_catalog_swagger)
+class CourseCatalogPublicAPIView(
+    ConditionalRetrieveMixin, CatalogCacheRetrieveMixin, RetrieveModelMixin, GenericViewSet
+):
+    """
+    Public read-only API ViewSet returning a whole course page (course, seasons, lessons,
+    teachers, categories, FAQs) in six queries regardless of the course size.
+    """
+    authentication_classes = []
+    permission_classes = [AllowAny]
+    catalog_resource = 'course-catalog'
+    serializer_class = CourseCatalogSerializer
+    queryset = Course.objects.prefetch_related(
+        Prefetch(
+            'seasons',
+            queryset=Season.objects.order_by('name', 'id').prefetch_related(
+                Prefetch('lessons', queryset=Lesson.objects.order_by('title', 'id'))
+            ),
+        ),
+        'teachers',
+        'categories',
+        Prefetch('faqs', queryset=FAQ.objects.order_by('question', 'id')),
+    )
 
 @method_decorator(name='create', decorator=admin_create_season_swagger)
 @method_decorator(name='retrieve', decorator=admin_retrieve_season_swagger)
@@ -68,29 +154,39 @@ class CoursePublicAPIView(ReadOnlyModelViewSet):
 @method_decorator(name='partial_update', decorator=admin_partial_update_season_swagger)
 @method_decorator(name='destroy', decorator=admin_destroy_season_swagger)
 @method_decorator(name='list', decorator=admin_list_season_swagger)
-class SeasonAdminAPIView(ModelViewSet):
+@method_decorator(name='bulk_create', decorator=admin_bulk_create_season_swagger)
+@method_decorator(name='bulk_update', decorator=admin_bulk_update_season_swagger)
+@method_decorator(name='bulk_destroy', decorator=admin_bulk_destroy_season_swagger)
+class SeasonAdminAPIView(CatalogBulkMixin, ModelViewSet):
     """
     Admin-only API ViewSet for managing Season records.
+    `bulk/` creates (POST), updates (PATCH) or deletes (DELETE) a list of seasons in one transaction.
     """
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [CachedJWTAuthentication]
     permission_classes = [IsAdminUser]
+    catalog_resource = 'season'
     serializer_class = SeasonSerializer
+    cursor_ordering = 'id'
     queryset = Season.objects.all()
     filter_backends = [filters.SearchFilter]
-    search_fields = ['title']
+    search_fields = ['name']
 
 @method_decorator(name='retrieve', decorator=public_retrieve_season_swagger)
 @method_decorator(name='list', decorator=public_list_season_swagger)
-class SeasonPublicAPIView(ReadOnlyModelViewSet):
+class SeasonPublicAPIView(ConditionalGetMixin, CatalogCacheMixin, ReadOnlyModelViewSet):
     """
     Public API ViewSet for viewing Season records.
+    Filter by course with `?course=<id>`.
     """
     authentication_classes = []
     permission_classes = [AllowAny]
+    catalog_resource = 'season'
     serializer_class = SeasonSerializer
+    cursor_ordering = 'id'
     queryset = Season.objects.all()
-    filter_backends = [filters.SearchFilter]
-    search_fields = ['title']
+    filter_backends = [filters.SearchFilter, DjangoFilterBackend]
+    search_fields = ['name']
+    filterset_fields = ['course']
 
 @method_decorator(name='create', decorator=admin_create_lesson_swagger)
 @method_decorator(name='retrieve', decorator=admin_retrieve_lesson_swagger)
@@ -98,26 +194,36 @@ class SeasonPublicAPIView(ReadOnlyModelViewSet):
 @method_decorator(name='partial_update', decorator=admin_partial_update_lesson_swagger)
 @method_decorator(name='destroy', decorator=admin_destroy_lesson_swagger)
 @method_decorator(name='list', decorator=admin_list_lesson_swagger)
-class LessonAdminAPIView(ModelViewSet):
+@method_decorator(name='bulk_create', decorator=admin_bulk_create_lesson_swagger)
+@method_decorator(name='bulk_update', decorator=admin_bulk_update_lesson_swagger)
+@method_decorator(name='bulk_destroy', decorator=admin_bulk_destroy_lesson_swagger)
+class LessonAdminAPIView(CatalogBulkMixin, ModelViewSet):
     """
     Admin-only API ViewSet for managing Lesson records.
+    `bulk/` creates (POST), updates (PATCH) or deletes (DELETE) a list of lessons in one transaction.
     """
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [CachedJWTAuthentication]
     permission_classes = [IsAdminUser]
+    catalog_resource = 'lesson'
     serializer_class = LessonSerializer
+    cursor_ordering = 'id'
     queryset = Lesson.objects.all()
-    filter_backends = [filters.SearchFilter]
-    search_fields = ['title']
+    filter_backends = [FullTextSearchFilter]
+    search_document = 'lesson'
 
 @method_decorator(name='retrieve', decorator=public_retrieve_lesson_swagger)
 @method_decorator(name='list', decorator=public_list_lesson_swagger)
-class LessonPublicAPIView(ReadOnlyModelViewSet):
+class LessonPublicAPIView(ConditionalGetMixin, CatalogCacheMixin, ReadOnlyModelViewSet):
     """
     Public API ViewSet for viewing Lesson records.
+    Filter by season with `?season=<id>` or by course with `?season__course=<id>`.
     """
     authentication_classes = []
     permission_classes = [AllowAny]
+    catalog_resource = 'lesson'
     serializer_class = LessonSerializer
+    cursor_ordering = 'id'
     queryset = Lesson.objects.all()
-    filter_backends = [filters.SearchFilter]
-    search_fields = ['title']
\ No newline at end of file
+    filter_backends = [FullTextSearchFilter, DjangoFilterBackend]
+    search_document = 'lesson'
+    filterset_fields = ['season', 'season__course']
\ No newline at end of file
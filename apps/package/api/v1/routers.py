@@ -3,13 +3,14 @@ from rest_framework.routers import DefaultRouter
 from apps.package.api.v1.insights.view import CategoryAdminAPIView, FAQAdminAPIView, FAQPublicAPIView, \
     CommentAdminAPIView, CommentPublicAPIView, CategoryPublicAPIView
 from apps.package.api.v1.package.view import CourseAdminAPIView, CoursePublicAPIView, SeasonAdminAPIView, \
-    SeasonPublicAPIView, LessonPublicAPIView, LessonAdminAPIView
+    SeasonPublicAPIView, LessonPublicAPIView, LessonAdminAPIView, CourseCatalogPublicAPIView
 
 router = DefaultRouter()
 
 # package apis
 router.register('admin/course', CourseAdminAPIView, basename='admin-course')
 router.register('public/course', CoursePublicAPIView, basename='public-course')
+router.register('public/course-catalog', CourseCatalogPublicAPIView, basename='public-course-catalog')
 
 router.register('admin/season', SeasonAdminAPIView, basename='admin-season')
 router.register('public/season', SeasonPublicAPIView, basename='public-season')
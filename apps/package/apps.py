@@ -5,3 +5,6 @@ class PackageConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.package'
     label = 'package'
+
+    def ready(self):
+        from apps.package import signals  # noqa: F401
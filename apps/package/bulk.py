@@ -0,0 +1,31 @@
+from apps.core.bulk import BulkModelMixin
+from apps.core.search import index_objects
+from apps.package.cache import invalidate
+from apps.package.models.package import Lesson
+from apps.package.stats import recompute
+
+
+class CatalogBulkMixin(BulkModelMixin):
+    """
+    Bulk endpoints for seasons and lessons. After the write it does once for all rows what
+    apps.package.signals and the search signals do per saved row: refresh the cached responses,
+    the course statistics and the search documents (`search_document`, if set).
+    """
+    catalog_resource = None
+    search_document = None
+
+    def bulk_affected(self, pks):
+        """
+        Courses the rows belong to before the write, so moving rows also refreshes the old course.
+        """
+        model = self.get_queryset().model
+        field = 'season__course_id' if model is Lesson else 'course_id'
+        return set(model.objects.filter(pk__in=pks).values_list(field, flat=True))
+
+    def bulk_refresh(self, pks, affected):
+        course_ids = affected | self.bulk_affected(pks)
+        invalidate(self.catalog_resource, pks)
+        invalidate('course-catalog', course_ids)
+        recompute(course_ids)
+        if self.search_document:
+            index_objects(self.search_document, self.get_queryset().model.objects.filter(pk__in=pks))
@@ -0,0 +1,133 @@
+import hashlib
+import secrets
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponse
+from rest_framework.renderers import JSONRenderer
+
+
+def catalog_cache_setting(key, default):
+    return getattr(settings, 'CATALOG_CACHE', {}).get(key, default)
+
+
+def get_catalog_cache():
+    return caches[catalog_cache_setting('CACHE_ALIAS', 'default')]
+
+
+def _versions(keys):
+    """
+    Current version token for each key. Missing (or evicted) versions get a fresh random token,
+    so entries stored under an earlier token can never be served again.
+    """
+    cache = get_catalog_cache()
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, secrets.token_hex(6), None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def _request_digest(request):
+    # Responses contain absolute pagination links, so scheme and host are part of the key
+    query = sorted(request.query_params.lists())
+    raw = f'{request.scheme}://{request.get_host()}{request.path}?{query}'
+    return hashlib.md5(raw.encode()).hexdigest()
+
+
+def list_key(resource, request):
+    version, = _versions([f'catalog:{resource}:list'])
+    return f'catalog:{resource}:list:{version}:{_request_digest(request)}'
+
+
+def object_key(resource, pk, request):
+    every, obj = _versions([f'catalog:{resource}:all', f'catalog:{resource}:obj:{pk}'])
+    return f'catalog:{resource}:obj:{pk}:{every}:{obj}:{_request_digest(request)}'
+
+
+def invalidate(resource, object_ids=(), everything=False):
+    """
+    Make cached responses for `resource` stale: every list, the given objects, and with
+    `everything` every object. Runs after the surrounding transaction commits, so a concurrent
+    request cannot re-cache the old rows under the new version.
+    """
+    keys = [f'catalog:{resource}:list', *(f'catalog:{resource}:obj:{pk}' for pk in object_ids)]
+    if everything:
+        keys.append(f'catalog:{resource}:all')
+
+    def bump():
+        get_catalog_cache().set_many({key: secrets.token_hex(6) for key in keys}, None)
+
+    transaction.on_commit(bump)
+
+
+class CatalogCacheResponseMixin:
+    """
+    Serves public catalog responses from pre-rendered JSON bytes.
+    A hit returns the stored bytes without touching the ORM or the serializer. Entries are keyed
+    by `catalog_resource`, object and query string, and invalidated by apps.package.signals.
+    The key also serves as the ETag of ConditionalGetMixin (see get_etag). Use CatalogCacheListMixin /
+    CatalogCacheRetrieveMixin (or CatalogCacheMixin for both), which only wrap the action the viewset has.
+    """
+    catalog_resource = None
+
+    def get_catalog_key(self, request, **kwargs):
+        """
+        Cache key of the response. It holds the current version tokens, so it changes with every
+        save, delete or m2m change of the rows behind the response. Looked up once per request.
+        """
+        key = getattr(self, '_catalog_key', None)
+        if key is None:
+            pk = kwargs.get(self.lookup_url_kwarg or self.lookup_field)
+            if pk is None:
+                key = list_key(self.catalog_resource, request)
+            else:
+                key = object_key(self.catalog_resource, pk, request)
+            self._catalog_key = key
+        return key
+
+    def get_etag(self, request, **kwargs):
+        """
+        Strong ETag of the JSON response, known before the response is built.
+        """
+        if not isinstance(request.accepted_renderer, JSONRenderer):
+            return None
+        return '"%s"' % hashlib.md5(self.get_catalog_key(request, **kwargs).encode()).hexdigest()
+
+    def cached_response(self, request, handler, *args, **kwargs):
+        renderer = request.accepted_renderer
+        # The browsable API and other formats are rendered normally
+        if not isinstance(renderer, JSONRenderer):
+            return handler(request, *args, **kwargs)
+
+        cache = get_catalog_cache()
+        key = self.get_catalog_key(request, **kwargs)
+        body = cache.get(key)
+        if body is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            body = renderer.render(response.data, request.accepted_media_type, self.get_renderer_context())
+            cache.set(key, body, catalog_cache_setting('TIMEOUT', 60 * 60 * 24))
+
+        return HttpResponse(body, content_type=request.accepted_media_type)
+
+
+class CatalogCacheListMixin(CatalogCacheResponseMixin):
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(request, super().list, *args, **kwargs)
+
+
+class CatalogCacheRetrieveMixin(CatalogCacheResponseMixin):
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(request, super().retrieve, *args, **kwargs)
+
+
+class CatalogCacheMixin(CatalogCacheListMixin, CatalogCacheRetrieveMixin):
+    """
+    Cached `list` and `retrieve`, for read-only model viewsets.
+    """
@@ -0,0 +1,118 @@
+import io
+import posixpath
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from apps.package.cache import invalidate
+from apps.package.models.package import Course
+
+VARIANT_DEFAULTS = {
+    'WIDTHS': [320, 640, 960, 1280],
+    'FORMATS': ['webp', 'jpeg'],
+    'QUALITY': {'webp': 80, 'jpeg': 82},
+    'WORKERS': 4,
+    'POLL_INTERVAL': 5,
+}
+
+EXTENSIONS = {'webp': 'webp', 'jpeg': 'jpg'}
+
+
+def variant_setting(key):
+    """
+    Read a value from settings.BANNER_VARIANTS, falling back to VARIANT_DEFAULTS.
+    """
+    return getattr(settings, 'BANNER_VARIANTS', {}).get(key, VARIANT_DEFAULTS[key])
+
+
+def variant_name(source_name, width, fmt):
+    """
+    Storage name of a variant, next to the original: courses/banners/variants/<file>/<width>.<ext>.
+    Derived from the source name, so a replaced banner never reuses the old variants.
+    """
+    directory, filename = posixpath.split(source_name)
+    return posixpath.join(directory, 'variants', filename, f'{width}.{EXTENSIONS[fmt]}')
+
+
+def render_variants(storage, source_name, sizes):
+    """
+    Resize the source once per width and encode each requested format.
+    `sizes` is a list of (width, format); returns {(width, format): storage name}.
+    Pillow releases the GIL while decoding, resizing and encoding, so this runs well in threads.
+    """
+    with storage.open(source_name, 'rb') as source:
+        original = ImageOps.exif_transpose(Image.open(source))
+        original.load()
+
+    names = {}
+    for width in sorted({width for width, _ in sizes}):
+        # Never upscale: narrow originals are only re-encoded
+        target_width = min(width, original.width)
+        resized = original.resize(
+            (target_width, max(round(original.height * target_width / original.width), 1)), Image.LANCZOS
+        ) if target_width != original.width else original
+
+        for fmt in [fmt for w, fmt in sizes if w == width]:
+            image = resized
+            if fmt == 'jpeg' and image.mode != 'RGB':
+                image = image.convert('RGB')
+            elif fmt == 'webp' and image.mode not in ('RGB', 'RGBA'):
+                image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+
+            buffer = io.BytesIO()
+            image.save(buffer, format=fmt.upper(), quality=variant_setting('QUALITY')[fmt], optimize=True)
+            name = variant_name(source_name, width, fmt)
+            if storage.exists(name):
+                storage.delete(name)
+            names[(width, fmt)] = storage.save(name, ContentFile(buffer.getvalue()))
+    return names
+
+
+def record_variants(course_id, source_name, names, finished=False):
+    """
+    Merge generated variant names into Course.banner_variants, unless the banner changed meanwhile.
+    The row is locked so the background worker and lazy requests do not overwrite each other's entries.
+    """
+    with transaction.atomic():
+        course = Course.objects.select_for_update().only('banner', 'banner_variants').filter(pk=course_id).first()
+        if course is None or course.banner.name != source_name:
+            return False
+        variants = course.banner_variants or {}
+        for (width, fmt), name in names.items():
+            variants.setdefault(fmt, {})[str(width)] = name
+        fields = {'banner_variants': variants, 'update_at': timezone.now()}
+        if finished:
+            fields['banner_variants_pending'] = False
+        Course.objects.filter(pk=course_id).update(**fields)
+
+    # update() skips the signals, so refresh the pre-rendered catalog explicitly
+    invalidate('course', [course_id])
+    invalidate('course-catalog', [course_id])
+    return True
+
+
+def banner_srcset(course, request=None):
+    """
+    {format: {width: url}} for the course banner. Variants that are not generated yet point at the
+    lazy endpoint, which builds them on first request and redirects to the stored file.
+    """
+    if not course.banner:
+        return {}
+    generated = course.banner_variants or {}
+    storage = course.banner.storage
+    srcset = {}
+    for fmt in variant_setting('FORMATS'):
+        urls = {}
+        for width in variant_setting('WIDTHS'):
+            name = generated.get(fmt, {}).get(str(width))
+            if name:
+                url = storage.url(name)
+            else:
+                url = reverse('public-course-banner-variant', args=[course.pk, width, fmt])
+            urls[str(width)] = request.build_absolute_uri(url) if request else url
+        srcset[fmt] = urls
+    return srcset
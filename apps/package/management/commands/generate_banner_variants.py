@@ -0,0 +1,63 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from apps.package.images import record_variants, render_variants, variant_setting
+from apps.package.models.package import Course
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate the resized WebP/JPEG variants of course banners that were uploaded or replaced. '
+        'Variants that are requested before this runs are built lazily by the API.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, help='Resize threads (default: BANNER_VARIANTS["WORKERS"]).')
+        parser.add_argument('--once', action='store_true', help='Process every pending banner, then exit.')
+        parser.add_argument(
+            '--all', action='store_true', help='Regenerate every banner, e.g. after changing the configured widths.'
+        )
+
+    def handle(self, *args, **options):
+        workers = options['workers'] or variant_setting('WORKERS')
+        sizes = [(width, fmt) for width in variant_setting('WIDTHS') for fmt in variant_setting('FORMATS')]
+        if options['all']:
+            Course.objects.exclude(banner='').update(banner_variants_pending=True)
+
+        self.stdout.write(f'Banner worker started with {workers} thread(s)')
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            try:
+                while True:
+                    courses = list(
+                        Course.objects.filter(banner_variants_pending=True).exclude(banner='').only('pk', 'banner')[
+                            :workers * 4
+                        ]
+                    )
+                    if courses:
+                        self.process(executor, courses, sizes)
+                        continue
+                    if options['once']:
+                        break
+                    time.sleep(variant_setting('POLL_INTERVAL'))
+            except KeyboardInterrupt:
+                pass
+
+    def process(self, executor, courses, sizes):
+        # Only the resizing runs in threads; the database is updated from this thread
+        jobs = [
+            (course, executor.submit(render_variants, course.banner.storage, course.banner.name, sizes))
+            for course in courses
+        ]
+        for course, future in jobs:
+            try:
+                if record_variants(course.pk, course.banner.name, future.result(), finished=True):
+                    self.stdout.write(f'Course {course.pk}: {len(sizes)} banner variant(s)')
+            except Exception:
+                # Unreadable image: stop retrying, requests fall back to the original banner
+                logger.exception('Generating banner variants for course %s failed', course.pk)
+                Course.objects.filter(pk=course.pk, banner=course.banner.name).update(banner_variants_pending=False)
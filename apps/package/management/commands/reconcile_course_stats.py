@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from apps.package.stats import STAT_FIELDS, recompute, stale_courses
+
+
+class Command(BaseCommand):
+    help = (
+        'Recompute Course.lesson_count, total_minutes, subscriber_count and comment_count from the lessons, '
+        'subscriptions and comments in one UPDATE. The signals keep them current; run this after bulk imports, '
+        'queryset updates or raw SQL, which bypass the signals (e.g. nightly from cron).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--course', type=int, action='append', dest='course_ids', help='Only these courses.')
+        parser.add_argument('--dry-run', action='store_true', help='Only list the courses that drifted.')
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            stale = stale_courses(options['course_ids'])
+            for course in stale.values('pk', *STAT_FIELDS, *(f'actual_{field}' for field in STAT_FIELDS)):
+                drift = ', '.join(
+                    f'{field} {course[field]} -> {course[f"actual_{field}"]}'
+                    for field in STAT_FIELDS if course[field] != course[f'actual_{field}']
+                )
+                self.stdout.write(f'Course {course["pk"]}: {drift}')
+            self.stdout.write(f'{len(stale)} course(s) would be corrected.')
+            return
+
+        updated = recompute(options['course_ids'])
+        self.stdout.write(self.style.SUCCESS(f'Corrected the statistics of {updated} course(s).'))
@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.urls import reverse
+
+from apps.package.models.insights import Category, FAQ
+from apps.package.models.package import Course, Season, Lesson
+
+# (URL basename, model) of every cached public endpoint
+CATALOG_ENDPOINTS = [
+    ('public-course', Course),
+    ('public-season', Season),
+    ('public-lesson', Lesson),
+    ('public-category', Category),
+    ('public-faq', FAQ),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        'Render the public catalog endpoints into the cache, so the first visitors after a deploy '
+        'do not pay for rendering. Responses embed absolute links, so pass the host clients use.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='localhost', help='Host name the API is served under.')
+        parser.add_argument('--https', action='store_true', help='Warm the https variant of the URLs.')
+        parser.add_argument('--pages', type=int, default=1, help='List pages to render per endpoint.')
+        parser.add_argument('--lists-only', action='store_true', help='Skip the per-object detail responses.')
+
+    def handle(self, *args, **options):
+        self.client = Client(HTTP_HOST=options['host'])
+        self.secure = options['https']
+        rendered = 0
+
+        for basename, model in CATALOG_ENDPOINTS:
+            url = reverse(f'{basename}-list')
+            for _ in range(options['pages']):
+                data = self.fetch(url)
+                rendered += 1
+                url = data.get('next')
+                if not url:
+                    break
+
+            if not options['lists_only']:
+                for pk in model.objects.values_list('pk', flat=True).iterator():
+                    self.fetch(reverse(f'{basename}-detail', args=[pk]))
+                    rendered += 1
+
+        for pk in Course.objects.values_list('pk', flat=True).iterator():
+            self.fetch(reverse('public-course-catalog-detail', args=[pk]))
+            rendered += 1
+
+        self.stdout.write(self.style.SUCCESS(f'Rendered {rendered} catalog response(s) into the cache.'))
+
+    def fetch(self, url):
+        response = self.client.get(url, HTTP_ACCEPT='application/json', secure=self.secure)
+        if response.status_code != 200:
+            raise CommandError(f'GET {url} returned {response.status_code}.')
+        return response.json()
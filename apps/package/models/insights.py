@@ -1,7 +1,10 @@
 from django.contrib.auth.models import User
+from django.contrib.postgres.indexes import OpClass
 from django.db import models
+from django.db.models.functions import Upper
 from django.utils.translation import gettext_lazy as _
 
+from apps.core.indexes import PostgresGinIndex
 from apps.core.models import BaseModel
 
 
@@ -10,6 +13,8 @@ class Category(BaseModel):
     Represents a category for organizing courses.
     Stores the category title and enables association with multiple courses.
     """
+    slug_source = 'title'
+
     title = models.CharField(
         max_length=255,
         verbose_name=_("Category Title"),
@@ -20,6 +25,10 @@ class Category(BaseModel):
         verbose_name = _("Category")
         verbose_name_plural = _("Categories")
         ordering = ['title']
+        indexes = [
+            models.Index(fields=['title'], name='category_title_idx'),
+            PostgresGinIndex(OpClass(Upper('title'), name='gin_trgm_ops'), name='category_title_trgm'),
+        ]
 
     def __str__(self):
         return self.title
@@ -30,6 +39,8 @@ class FAQ(BaseModel):
     Represents a Frequently Asked Question (FAQ) related to a course.
     Stores the question, answer, and associated course.
     """
+    slug_source = 'question'
+
     question = models.TextField(
         verbose_name=_("Question"),
         help_text=_("The question text for the FAQ.")
@@ -49,7 +60,7 @@ class FAQ(BaseModel):
     class Meta:
         verbose_name = _("FAQ")
         verbose_name_plural = _("FAQs")
-        ordering = ['course', 'question']
+        ordering = ['course_id', 'question']
 
     def __str__(self):
         return f"FAQ: {self.question[:50]}"
@@ -71,6 +82,7 @@ class Comment(BaseModel):
         'package.Course',
         on_delete=models.CASCADE,
         related_name='comments',
+        db_index=False,  # Covered by the composite index in Meta.indexes
         verbose_name=_("Course"),
         help_text=_("The course this comment is associated with.")
     )
@@ -87,7 +99,11 @@ class Comment(BaseModel):
     class Meta:
         verbose_name = _("Comment")
         verbose_name_plural = _("Comments")
-        ordering = ['course', '-created_at']
+        ordering = ['course_id', '-created_at']
+        indexes = [
+            models.Index(fields=['course', '-created_at'], name='comment_course_created_idx'),
+            PostgresGinIndex(OpClass(Upper('comment_text'), name='gin_trgm_ops'), name='comment_text_trgm'),
+        ]
 
     def __str__(self):
         return f"Comment by {self.user.username} on {self.course.title}"
\ No newline at end of file
@@ -1,6 +1,9 @@
+from django.contrib.postgres.indexes import OpClass
 from django.db import models
+from django.db.models.functions import Upper
 from django.utils.translation import gettext_lazy as _
 
+from apps.core.indexes import PostgresGinIndex
 from apps.core.models import Teacher, BaseModel
 
 
@@ -9,6 +12,8 @@ class Course(BaseModel):
     Represents a course in the educational platform.
     Stores course metadata, pricing, and relationships with categories and teachers.
     """
+    slug_source = 'title'
+
     title = models.CharField(
         max_length=255,
         verbose_name=_("Course Title"),
@@ -23,6 +28,19 @@ class Course(BaseModel):
         verbose_name=_("Banner Image"),
         help_text=_("Banner image for the course.")
     )
+    banner_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        verbose_name=_("Banner Variants"),
+        help_text=_("Storage names of the resized banner variants, by format and width.")
+    )
+    banner_variants_pending = models.BooleanField(
+        default=True,
+        editable=False,
+        verbose_name=_("Banner Variants Pending"),
+        help_text=_("Set when the banner changed and its variants still have to be generated.")
+    )
     has_installment_payment = models.BooleanField(
         default=True,
         verbose_name=_("Supports Installment Payment"),
@@ -61,10 +79,50 @@ class Course(BaseModel):
         help_text=_("Teachers assigned to this course.")
     )
 
+    # Maintained by apps.package.stats from the Lesson, Subscription and Comment signals;
+    # `manage.py reconcile_course_stats` recomputes them
+    lesson_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name=_("Lesson Count"),
+        help_text=_("Number of lessons in all seasons of the course.")
+    )
+    total_minutes = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name=_("Total Minutes"),
+        help_text=_("Sum of the lesson durations in minutes.")
+    )
+    subscriber_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name=_("Subscriber Count"),
+        help_text=_("Number of subscriptions to the course.")
+    )
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name=_("Comment Count"),
+        help_text=_("Number of comments on the course.")
+    )
+
     class Meta:
         verbose_name = _("Course")
         verbose_name_plural = _("Courses")
         ordering = ['title']
+        indexes = [
+            models.Index(fields=['title'], name='course_title_idx'),
+            # `?ordering=[-]<stat>` on the public list, read forwards or backwards (see KeysetPagination);
+            # id keeps the keyset order total
+            models.Index(fields=['subscriber_count', 'id'], name='course_popularity_idx'),
+            models.Index(fields=['lesson_count', 'id'], name='course_lesson_count_idx'),
+            models.Index(fields=['total_minutes', 'id'], name='course_total_minutes_idx'),
+            models.Index(fields=['comment_count', 'id'], name='course_comment_count_idx'),
+            # Only the few courses waiting for `generate_banner_variants` are indexed
+            models.Index(
+                fields=['id'], condition=models.Q(banner_variants_pending=True), name='course_variants_pending_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.title
@@ -75,6 +133,8 @@ class Season(BaseModel):
     Represents a season within a course.
     A season is a collection of lessons under a specific course.
     """
+    slug_source = 'name'
+
     name = models.CharField(
         max_length=100,
         verbose_name=_("Season Name"),
@@ -84,6 +144,7 @@ class Season(BaseModel):
         Course,
         on_delete=models.CASCADE,
         related_name='seasons',
+        db_index=False,  # Covered by the composite index in Meta.indexes
         verbose_name=_("Course"),
         help_text=_("The course this season belongs to.")
     )
@@ -91,7 +152,12 @@ class Season(BaseModel):
     class Meta:
         verbose_name = _("Season")
         verbose_name_plural = _("Seasons")
-        ordering = ['course', 'name']
+        # By the column itself: 'course' would join Course and sort by its title first
+        ordering = ['course_id', 'name']
+        indexes = [
+            models.Index(fields=['course', 'name'], name='season_course_name_idx'),
+            PostgresGinIndex(OpClass(Upper('name'), name='gin_trgm_ops'), name='season_name_trgm'),
+        ]
 
     def __str__(self):
         return f"{self.course.title} - {self.name}"
@@ -102,6 +168,8 @@ class Lesson(BaseModel):
     Represents a single lesson within a season.
     Stores lesson metadata including video link and duration.
     """
+    slug_source = 'title'
+
     title = models.CharField(
         max_length=255,
         verbose_name=_("Lesson Title"),
@@ -124,6 +192,7 @@ class Lesson(BaseModel):
         Season,
         on_delete=models.CASCADE,
         related_name='lessons',
+        db_index=False,  # Covered by the composite index in Meta.indexes
         verbose_name=_("Season"),
         help_text=_("The season this lesson belongs to.")
     )
@@ -131,7 +200,10 @@ class Lesson(BaseModel):
     class Meta:
         verbose_name = _("Lesson")
         verbose_name_plural = _("Lessons")
-        ordering = ['season', 'title']
+        ordering = ['season_id', 'title']
+        indexes = [
+            models.Index(fields=['season', 'title'], name='lesson_season_title_idx'),
+        ]
 
     def __str__(self):
         return f"{self.season} - {self.title}"
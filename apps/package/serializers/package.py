@@ -1,19 +1,31 @@
 from rest_framework import serializers
+from apps.core.bulk import BulkListSerializer
+from apps.core.serializers import TeacherSerializer
+from apps.core.uploads import ChunkedUploadSerializerMixin
+from apps.package.images import banner_srcset
 from apps.package.models.package import Course,Season,Lesson
+from apps.package.serializers.insights import CategorySerializer, FAQSerializer
 
 
 
 
 
-class CourseSerializer(serializers.ModelSerializer):
+class CourseSerializer(ChunkedUploadSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for Course model.
     Converts Course instances to JSON and validates input data.
+    The banner can also be sent through the chunked upload API and attached with `banner_upload`.
+    `banner_srcset` lists the resized banner variants as {format: {width: url}}.
     """
-    
+    chunked_upload_fields = {'banner': 'course.banner'}
+    banner_srcset = serializers.SerializerMethodField()
+
     class Meta:
         model = Course
-        fields = '__all__'  # Include all fields from the Course model
+        exclude = ['banner_variants', 'banner_variants_pending']  # Exposed through `banner_srcset`
+
+    def get_banner_srcset(self, obj):
+        return banner_srcset(obj, self.context.get('request'))
 
         
 class SeasonSerializer(serializers.ModelSerializer):
@@ -24,6 +36,7 @@ class SeasonSerializer(serializers.ModelSerializer):
     class Meta:
         model = Season
         fields = '__all__'  # Include all fields from the Season model
+        list_serializer_class = BulkListSerializer  # many=True writes with bulk_create/bulk_update
         
 
 class LessonSerializer(serializers.ModelSerializer):
@@ -34,4 +47,49 @@ class LessonSerializer(serializers.ModelSerializer):
     class Meta:
         model = Lesson
         fields = '__all__'  # Include all fields from the Lesson model
-        
+        list_serializer_class = BulkListSerializer  # many=True writes with bulk_create/bulk_update
+
+
+class CatalogLessonSerializer(serializers.ModelSerializer):
+    """
+    Lesson as nested in the course catalog.
+    """
+    class Meta:
+        model = Lesson
+        fields = ['id', 'slug', 'title', 'video_url', 'duration_minutes', 'is_free']
+
+
+class CatalogSeasonSerializer(serializers.ModelSerializer):
+    """
+    Season with its lessons, as nested in the course catalog.
+    """
+    lessons = CatalogLessonSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Season
+        fields = ['id', 'slug', 'name', 'lessons']
+
+
+class CourseCatalogSerializer(serializers.ModelSerializer):
+    """
+    Read-only course page: the course with its seasons, lessons, teachers, categories and FAQs.
+    Expects the queryset from CourseCatalogPublicAPIView, which prefetches the relations.
+    `lesson_count` and `total_minutes` are the statistics maintained on Course.
+    """
+    seasons = CatalogSeasonSerializer(many=True, read_only=True)
+    teachers = TeacherSerializer(many=True, read_only=True)
+    categories = CategorySerializer(many=True, read_only=True)
+    faqs = FAQSerializer(many=True, read_only=True)
+    banner_srcset = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Course
+        fields = [
+            'id', 'slug', 'title', 'description', 'banner', 'banner_srcset',
+            'current_price', 'discounted_price', 'has_installment_payment', 'installment_payment_count',
+            'total_hours', 'lesson_count', 'total_minutes', 'subscriber_count', 'comment_count',
+            'teachers', 'categories', 'seasons', 'faqs',
+        ]
+
+    def get_banner_srcset(self, obj):
+        return banner_srcset(obj, self.context.get('request'))
@@ -0,0 +1,182 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from apps.core.models import Teacher
+from apps.package.cache import invalidate
+from apps.package.models.insights import Category, Comment, FAQ
+from apps.package.models.package import Course, Season, Lesson
+from apps.package.stats import adjust, recompute
+
+
+def _course_ids(model, **lookup):
+    """
+    Ids of the courses whose catalog page shows the matching Season/Lesson/FAQ rows.
+    """
+    field = 'season__course_id' if model is Lesson else 'course_id'
+    return set(model.objects.filter(**lookup).values_list(field, flat=True))
+
+
+@receiver(pre_save, sender=Season)
+@receiver(pre_save, sender=Lesson)
+@receiver(pre_save, sender=FAQ)
+def remember_previous_course(sender, instance, raw=False, **kwargs):
+    """
+    Keep the course the row belonged to before the save, so moving it also refreshes the old page.
+    """
+    if instance.pk and not raw:
+        instance._catalog_course_ids = _course_ids(sender, pk=instance.pk)
+
+
+@receiver(post_save, sender=Season)
+@receiver(post_save, sender=Lesson)
+@receiver(post_save, sender=FAQ)
+@receiver(post_delete, sender=Season)
+@receiver(post_delete, sender=Lesson)
+@receiver(post_delete, sender=FAQ)
+def invalidate_course_child(sender, instance, **kwargs):
+    resource = {Season: 'season', Lesson: 'lesson', FAQ: 'faq'}[sender]
+    invalidate(resource, [instance.pk])
+
+    if sender is Lesson:
+        # On cascade deletes the season row may already be gone; the course delete covers that case
+        course_ids = _course_ids(Season, pk=instance.season_id)
+    else:
+        course_ids = {instance.course_id}
+    course_ids |= getattr(instance, '_catalog_course_ids', set())
+    invalidate('course-catalog', course_ids)
+
+
+@receiver(pre_save, sender=Course)
+def reset_banner_variants(sender, instance, raw=False, **kwargs):
+    """
+    A new or replaced banner needs new variants (see `generate_banner_variants`); the old files are removed.
+    """
+    if raw:
+        return
+    previous = Course.objects.filter(pk=instance.pk).values_list('banner', 'banner_variants').first() if instance.pk else None
+    if previous is not None and previous[0] == instance.banner.name:
+        return
+
+    instance.banner_variants = {}
+    instance.banner_variants_pending = bool(instance.banner)
+    if previous:
+        storage = instance.banner.storage
+        stale = [name for widths in previous[1].values() for name in widths.values()]
+
+        def delete_stale():
+            for name in stale:
+                storage.delete(name)
+
+        transaction.on_commit(delete_stale)
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+def invalidate_course(sender, instance, **kwargs):
+    invalidate('course', [instance.pk])
+    invalidate('course-catalog', [instance.pk])
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Teacher)
+@receiver(post_delete, sender=Teacher)
+def invalidate_course_relation(sender, instance, created=False, **kwargs):
+    """
+    Categories and teachers are embedded in every catalog page that links them.
+    A new row is not linked to any course yet; deleting one also drops its id from course responses.
+    """
+    if sender is Category:
+        invalidate('category', [instance.pk])
+    if created:
+        return
+    invalidate('course-catalog', everything=True)
+    if kwargs.get('signal') is post_delete:
+        invalidate('course', everything=True)
+
+
+@receiver(m2m_changed, sender=Course.categories.through)
+@receiver(m2m_changed, sender=Course.teachers.through)
+def invalidate_course_links(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        invalidate('course', [instance.pk])
+        invalidate('course-catalog', [instance.pk])
+    elif pk_set:
+        invalidate('course', pk_set)
+        invalidate('course-catalog', pk_set)
+    else:
+        # post_clear from the category/teacher side does not say which courses were linked
+        invalidate('course', everything=True)
+        invalidate('course-catalog', everything=True)
+
+
+def _season_course_id(season_id):
+    return Season.objects.filter(pk=season_id).values_list('course_id', flat=True).first()
+
+
+@receiver(pre_save, sender=Lesson)
+def remember_lesson_stats(sender, instance, raw=False, **kwargs):
+    """
+    Course and duration before the save, to move them between the course statistics.
+    """
+    if instance.pk and not raw:
+        instance._stats_previous = Lesson.objects.filter(pk=instance.pk).values_list(
+            'season__course_id', 'duration_minutes'
+        ).first()
+
+
+@receiver(post_save, sender=Lesson)
+def count_lesson(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    course_id = _season_course_id(instance.season_id)
+    previous = getattr(instance, '_stats_previous', None)
+    if created or previous is None:
+        adjust(course_id, lesson_count=1, total_minutes=instance.duration_minutes)
+    elif previous[0] != course_id:
+        adjust(previous[0], lesson_count=-1, total_minutes=-previous[1])
+        adjust(course_id, lesson_count=1, total_minutes=instance.duration_minutes)
+    else:
+        adjust(course_id, total_minutes=instance.duration_minutes - previous[1])
+
+
+@receiver(post_delete, sender=Lesson)
+def uncount_lesson(sender, instance, **kwargs):
+    # Lessons are deleted before their season and course, so the season row still exists on cascades
+    adjust(_season_course_id(instance.season_id), lesson_count=-1, total_minutes=-instance.duration_minutes)
+
+
+@receiver(post_save, sender=Season)
+def recount_moved_season(sender, instance, created, raw=False, **kwargs):
+    """
+    A season moved to another course takes all its lessons along.
+    """
+    previous = getattr(instance, '_catalog_course_ids', set())
+    if not created and not raw and previous - {instance.course_id}:
+        recompute(previous | {instance.course_id})
+
+
+@receiver(pre_save, sender=Comment)
+def remember_comment_course(sender, instance, raw=False, **kwargs):
+    if instance.pk and not raw:
+        instance._stats_course_id = Comment.objects.filter(pk=instance.pk).values_list('course_id', flat=True).first()
+
+
+@receiver(post_save, sender=Comment)
+def count_comment(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_stats_course_id', None)
+    if created or previous is None:
+        adjust(instance.course_id, comment_count=1)
+    elif previous != instance.course_id:
+        adjust(previous, comment_count=-1)
+        adjust(instance.course_id, comment_count=1)
+
+
+@receiver(post_delete, sender=Comment)
+def uncount_comment(sender, instance, **kwargs):
+    adjust(instance.course_id, comment_count=-1)
@@ -0,0 +1,80 @@
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from apps.package.cache import invalidate
+from apps.package.models.insights import Comment
+from apps.package.models.package import Course, Lesson
+
+STAT_FIELDS = ('lesson_count', 'total_minutes', 'subscriber_count', 'comment_count')
+
+
+def adjust(course_id, **deltas):
+    """
+    Add `deltas` ({stat field: change}) to one course's statistics in a single UPDATE.
+    F() expressions make concurrent writers add up instead of overwriting each other.
+    """
+    # Never below zero, even if the counters drifted before the last reconciliation
+    changes = {field: Greatest(F(field) + delta, 0) for field, delta in deltas.items() if delta}
+    if course_id is None or not changes:
+        return
+    # update_at moves too, as it would on save()
+    Course.objects.filter(pk=course_id).update(**changes, update_at=timezone.now())
+    invalidate('course', [course_id])
+    invalidate('course-catalog', [course_id])
+
+
+def _aggregate(queryset, course_field, aggregate):
+    """
+    Correlated subquery computing `aggregate` over the rows of `queryset` that belong to the outer course.
+    """
+    return Coalesce(
+        Subquery(
+            queryset.filter(**{course_field: OuterRef('pk')}).order_by().values(course_field)
+            .annotate(value=aggregate).values('value'),
+            output_field=IntegerField(),
+        ),
+        0,
+    )
+
+
+def actual_stats():
+    """
+    {stat field: expression computing its true value} for use in Course querysets.
+    """
+    from apps.payment.models.subscription import Subscription
+
+    return {
+        'lesson_count': _aggregate(Lesson.objects.all(), 'season__course', Count('pk')),
+        'total_minutes': _aggregate(Lesson.objects.all(), 'season__course', Sum('duration_minutes')),
+        'subscriber_count': _aggregate(Subscription.objects.all(), 'course', Count('pk')),
+        'comment_count': _aggregate(Comment.objects.all(), 'course', Count('pk')),
+    }
+
+
+def stale_courses(course_ids=None):
+    """
+    Courses (limited to `course_ids` when given) whose statistics differ from the real counts.
+    """
+    queryset = Course.objects.all() if course_ids is None else Course.objects.filter(pk__in=course_ids)
+    return queryset.annotate(**{f'actual_{field}': expression for field, expression in actual_stats().items()}).filter(
+        Q(*[~Q(**{field: F(f'actual_{field}')}) for field in STAT_FIELDS], _connector=Q.OR)
+    )
+
+
+def recompute(course_ids=None):
+    """
+    Rewrite the statistics that drifted from the real counts in one set-based UPDATE.
+    Returns the number of courses that were corrected.
+    """
+    updated = Course.objects.filter(pk__in=stale_courses(course_ids).values('pk')).update(
+        **actual_stats(), update_at=timezone.now()
+    )
+    if updated:
+        if course_ids is None:
+            invalidate('course', everything=True)
+            invalidate('course-catalog', everything=True)
+        else:
+            invalidate('course', course_ids)
+            invalidate('course-catalog', course_ids)
+    return updated
@@ -1,3 +1,245 @@
+from django.contrib.auth.models import User
+from django.core.cache import caches
 from django.test import TestCase
+from django.urls import NoReverseMatch, reverse
 
-# Create your tests here.
+from apps.core.authentication import AuthRefreshToken
+from apps.core.models import Teacher
+from apps.package.api.v1.package.view import CourseCatalogPublicAPIView
+from apps.package.models.insights import Comment
+from apps.package.models.package import Course, Lesson, Season
+from apps.package.stats import recompute, stale_courses
+
+
+def create_course(title='Algebra', seasons=1, lessons=2, duration=10):
+    course = Course.objects.create(title=title, description='', banner='courses/banners/algebra.jpg')
+    for season_index in range(seasons):
+        season = Season.objects.create(name=f'Season {season_index}', course=course)
+        for lesson_index in range(lessons):
+            Lesson.objects.create(
+                title=f'Lesson {lesson_index}', video_url='https://example.com/v.mp4',
+                duration_minutes=duration, season=season,
+            )
+    return course
+
+
+class CourseCatalogTests(TestCase):
+
+    def setUp(self):
+        caches['default'].clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.course = create_course()
+        self.url = reverse('public-course-catalog-detail', args=[self.course.pk])
+
+    def test_retrieve_only(self):
+        # The router only generates routes for the actions the viewset has
+        self.assertFalse(hasattr(CourseCatalogPublicAPIView, 'list'))
+        with self.assertRaises(NoReverseMatch):
+            reverse('public-course-catalog-list')
+        self.assertEqual(self.client.get('/api/v1/package/public/course-catalog/').status_code, 404)
+
+    def test_not_modified_without_queries(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['seasons'][0]['lessons']), 2)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+
+class CatalogCacheTests(TestCase):
+    """
+    Public catalog responses come from the cache until a write invalidates them.
+    """
+
+    def setUp(self):
+        caches['default'].clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.course = create_course()
+        self.list_url = reverse('public-course-list')
+        self.catalog_url = reverse('public-course-catalog-detail', args=[self.course.pk])
+
+    def test_hits_do_not_query(self):
+        first = self.client.get(self.list_url)
+        with self.assertNumQueries(0):
+            second = self.client.get(self.list_url)
+        self.assertEqual(first.content, second.content)
+
+    def test_course_save_refreshes_list_and_catalog(self):
+        self.client.get(self.list_url)
+        self.client.get(self.catalog_url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.course.title = 'Geometry'
+            self.course.save()
+        self.assertEqual(self.client.get(self.list_url).json()['results'][0]['title'], 'Geometry')
+        self.assertEqual(self.client.get(self.catalog_url).json()['title'], 'Geometry')
+
+    def test_lesson_changes_refresh_the_catalog(self):
+        self.client.get(self.catalog_url)
+        lesson = Lesson.objects.first()
+        with self.captureOnCommitCallbacks(execute=True):
+            lesson.title = 'Renamed'
+            lesson.save()
+        lessons = self.client.get(self.catalog_url).json()['seasons'][0]['lessons']
+        self.assertIn('Renamed', [item['title'] for item in lessons])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            lesson.delete()
+        self.assertEqual(len(self.client.get(self.catalog_url).json()['seasons'][0]['lessons']), 1)
+
+    def test_linking_a_teacher_refreshes_the_catalog(self):
+        self.client.get(self.catalog_url)
+        with self.captureOnCommitCallbacks(execute=True):
+            teacher = Teacher.objects.create(full_name='Teacher', about='')
+            self.course.teachers.add(teacher)
+        self.assertEqual([item['id'] for item in self.client.get(self.catalog_url).json()['teachers']], [teacher.pk])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            teacher.full_name = 'Renamed'
+            teacher.save()
+        self.assertEqual(self.client.get(self.catalog_url).json()['teachers'][0]['full_name'], 'Renamed')
+
+
+class CourseStatsTests(TestCase):
+    """
+    The counters on Course follow lesson and comment writes, and `recompute` repairs any drift.
+    """
+
+    def setUp(self):
+        self.course = create_course(lessons=3, duration=10)
+        self.other = create_course(title='Geometry', lessons=1, duration=5)
+
+    def assertStats(self, course, **expected):
+        course.refresh_from_db()
+        self.assertEqual({field: getattr(course, field) for field in expected}, expected)
+
+    def test_lessons(self):
+        self.assertStats(self.course, lesson_count=3, total_minutes=30)
+
+        lesson = Lesson.objects.filter(season__course=self.course).first()
+        lesson.duration_minutes = 25
+        lesson.save()
+        self.assertStats(self.course, lesson_count=3, total_minutes=45)
+
+        lesson.delete()
+        self.assertStats(self.course, lesson_count=2, total_minutes=20)
+
+        moved = Lesson.objects.filter(season__course=self.course).first()
+        moved.season = self.other.seasons.first()
+        moved.save()
+        self.assertStats(self.course, lesson_count=1, total_minutes=10)
+        self.assertStats(self.other, lesson_count=2, total_minutes=15)
+        self.assertFalse(stale_courses().exists())
+
+    def test_comments(self):
+        user = User.objects.create(username='09120000000')
+        comment = Comment.objects.create(user=user, course=self.course, comment_text='Good')
+        self.assertStats(self.course, comment_count=1)
+        comment.course = self.other
+        comment.save()
+        self.assertStats(self.course, comment_count=0)
+        self.assertStats(self.other, comment_count=1)
+        comment.delete()
+        self.assertStats(self.other, comment_count=0)
+
+    def test_counters_stay_above_zero_and_recompute_repairs_them(self):
+        Course.objects.filter(pk=self.course.pk).update(lesson_count=0, total_minutes=0)
+        Lesson.objects.filter(season__course=self.course).first().delete()
+        self.assertStats(self.course, lesson_count=0, total_minutes=0)
+
+        self.assertEqual(list(stale_courses().values_list('pk', flat=True)), [self.course.pk])
+        self.assertEqual(recompute(), 1)
+        self.assertStats(self.course, lesson_count=2, total_minutes=20)
+        self.assertEqual(recompute(), 0)
+
+
+class CourseOrderingTests(TestCase):
+
+    def setUp(self):
+        caches['default'].clear()
+        self.minutes = {create_course(title=f'Course {value}', lessons=1, duration=value).pk: value
+                        for value in (30, 10, 30, 20, 30)}
+
+    def pages(self, ordering):
+        url, ids = reverse('public-course-list'), []
+        params = {'ordering': ordering, 'page_size': 2}
+        while url:
+            body = self.client.get(url, params).json()
+            ids += [item['id'] for item in body['results']]
+            url, params = body['next'], None
+        return ids
+
+    def test_ties_follow_the_requested_direction(self):
+        by_minutes = sorted(self.minutes, key=lambda pk: (self.minutes[pk], pk))
+        self.assertEqual(self.pages('total_minutes'), by_minutes)
+        self.assertEqual(self.pages('-total_minutes'), by_minutes[::-1])
+
+
+class LessonBulkTests(TestCase):
+    """
+    `bulk/` writes all items or none, with errors aligned to the payload.
+    """
+
+    def setUp(self):
+        self.course = create_course(lessons=2, duration=10)
+        self.season = self.course.seasons.get()
+        self.lessons = list(Lesson.objects.order_by('pk'))
+        self.url = reverse('admin-lesson-bulk-create')
+        user = User.objects.create(username='09120000000', is_staff=True)
+        self.client.defaults['HTTP_AUTHORIZATION'] = f'Bearer {AuthRefreshToken.for_user(user).access_token}'
+
+    def send(self, method, data):
+        return getattr(self.client, method)(self.url, data, content_type='application/json')
+
+    def lesson(self, **fields):
+        return {
+            'title': 'New', 'video_url': 'https://example.com/v.mp4', 'duration_minutes': 5,
+            'season': self.season.pk, **fields,
+        }
+
+    def test_create(self):
+        response = self.send('post', [self.lesson(), self.lesson(duration_minutes=-1)])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()[0], {})
+        self.assertIn('duration_minutes', response.json()[1])
+        self.assertEqual(Lesson.objects.count(), 2)
+
+        response = self.send('post', [self.lesson(), self.lesson(title='Other')])
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(all(item['slug'] for item in response.json()))
+        self.course.refresh_from_db()
+        self.assertEqual((self.course.lesson_count, self.course.total_minutes), (4, 30))
+
+    def test_conflicting_rows(self):
+        # Each slug is free in the database, but the two items collide with each other
+        response = self.send('post', [self.lesson(slug='same'), self.lesson(slug='same')])
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(Lesson.objects.count(), 2)
+
+    def test_update(self):
+        first, second = self.lessons
+        response = self.send('patch', [{'id': first.pk, 'duration_minutes': 30}, {'id': 0, 'title': 'Missing'}])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), [{}, {'id': ['Not found.']}])
+
+        response = self.send('patch', [{'id': first.pk, 'duration_minutes': 30}, {'id': second.pk, 'title': 'Renamed'}])
+        self.assertEqual(response.status_code, 200)
+        second.refresh_from_db()
+        self.assertEqual(second.title, 'Renamed')
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.total_minutes, 40)
+
+        response = self.send('patch', [{'id': first.pk, 'slug': 'same'}, {'id': second.pk, 'slug': 'same'}])
+        self.assertEqual(response.status_code, 409)
+
+    def test_destroy(self):
+        first, second = self.lessons
+        response = self.send('delete', [first.pk, 0])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), [{}, {'id': ['Not found.']}])
+        self.assertEqual(Lesson.objects.count(), 2)
+
+        self.assertEqual(self.send('delete', [first.pk]).status_code, 204)
+        self.course.refresh_from_db()
+        self.assertEqual((self.course.lesson_count, self.course.total_minutes), (1, 10))
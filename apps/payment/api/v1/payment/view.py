@@ -2,7 +2,7 @@ from django.utils.decorators import method_decorator
 from rest_framework import filters
 from rest_framework.viewsets import ModelViewSet, ReadOnlyModelViewSet
 from rest_framework.permissions import IsAdminUser, IsAuthenticated
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from apps.core.authentication import CachedJWTAuthentication
 from apps.payment.models.payment import Transaction
 from apps.payment.serializers.payment import PaymentSerializer
 from .swagger_decorator import (
@@ -27,9 +27,10 @@ class TransactionAdminAPIView(ModelViewSet):
     """
     Admin-only API ViewSet for managing Transaction records.
     """
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [CachedJWTAuthentication]
     permission_classes = [IsAdminUser]
     serializer_class = PaymentSerializer
+    cursor_ordering = '-id'
     queryset = Transaction.objects.all()
     filter_backends = [filters.SearchFilter]
     search_fields = ['user__username']
@@ -41,9 +42,10 @@ class TransactionUserAPIView(ReadOnlyModelViewSet):
     """
     Authenticated user API ViewSet for viewing own Transaction records.
     """
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [CachedJWTAuthentication]
     permission_classes = [IsAuthenticated]
     serializer_class = PaymentSerializer
+    cursor_ordering = '-id'
 
     def get_queryset(self):
         """
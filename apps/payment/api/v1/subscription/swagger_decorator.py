@@ -265,12 +265,12 @@ admin_list_installment_payment_swagger = swagger_auto_schema(
     operation_description=(
         'This endpoint allows administrators to retrieve a list of all installment payment records. '
         'The response includes details for each payment, such as ID, user, subscription, amount, and other payment information. '
-        'Optional search functionality is available using the "search" query parameter to filter by user username. '
+        'Optional search functionality is available using the "search" query parameter to filter by the subscriber username. '
         'This operation is restricted to admin users only and requires JWT authentication.'
     ),
     tags=['admin.installment_payment'],
     manual_parameters=[
-        openapi.Parameter('search', openapi.IN_QUERY, description="Filter installment payments by user username (partial match).", type=openapi.TYPE_STRING)
+        openapi.Parameter('search', openapi.IN_QUERY, description="Filter installment payments by the subscriber username (partial match).", type=openapi.TYPE_STRING)
     ],
     responses={
         200: InstallmentPaymentSerializer(many=True),
@@ -421,12 +421,12 @@ admin_list_immediate_payment_swagger = swagger_auto_schema(
     operation_description=(
         'This endpoint allows administrators to retrieve a list of all immediate payment records. '
         'The response includes details for each payment, such as ID, user, subscription, amount, and other payment information. '
-        'Optional search functionality is available using the "search" query parameter to filter by user username. '
+        'Optional search functionality is available using the "search" query parameter to filter by the subscriber username. '
         'This operation is restricted to admin users only and requires JWT authentication.'
     ),
     tags=['admin.immediate_payment'],
     manual_parameters=[
-        openapi.Parameter('search', openapi.IN_QUERY, description="Filter immediate payments by user username (partial match).", type=openapi.TYPE_STRING)
+        openapi.Parameter('search', openapi.IN_QUERY, description="Filter immediate payments by the subscriber username (partial match).", type=openapi.TYPE_STRING)
     ],
     responses={
         200: ImmediatePaymentSerializer(many=True),
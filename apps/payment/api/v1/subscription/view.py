@@ -2,7 +2,7 @@ from django.utils.decorators import method_decorator
 from rest_framework import filters
 from rest_framework.viewsets import ModelViewSet, ReadOnlyModelViewSet
 from rest_framework.permissions import IsAdminUser, IsAuthenticated
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from apps.core.authentication import CachedJWTAuthentication
 from apps.payment.models.subscription import Subscription, InstallmentPayment, ImmediatePayment
 from apps.payment.serializers.subscription import SubscriptionSerializer, InstallmentPaymentSerializer, ImmediatePaymentSerializer
 from .swagger_decorator import (
@@ -42,9 +42,10 @@ class SubscriptionAdminAPIView(ModelViewSet):
     """
     Admin-only API ViewSet for managing Subscription records.
     """
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [CachedJWTAuthentication]
     permission_classes = [IsAdminUser]
     serializer_class = SubscriptionSerializer
+    cursor_ordering = '-id'
     queryset = Subscription.objects.all()
     filter_backends = [filters.SearchFilter]
     search_fields = ['user__username']
@@ -56,9 +57,10 @@ class SubscriptionUserAPIView(ReadOnlyModelViewSet):
     """
     Authenticated user API ViewSet for viewing own Subscription records.
     """
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [CachedJWTAuthentication]
     permission_classes = [IsAuthenticated]
     serializer_class = SubscriptionSerializer
+    cursor_ordering = '-id'
 
     def get_queryset(self):
         """
@@ -77,12 +79,13 @@ class InstallmentPaymentAdminAPIView(ModelViewSet):
     """
     Admin-only API ViewSet for managing InstallmentPayment records.
     """
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [CachedJWTAuthentication]
     permission_classes = [IsAdminUser]
     serializer_class = InstallmentPaymentSerializer
+    cursor_ordering = 'id'
     queryset = InstallmentPayment.objects.all()
     filter_backends = [filters.SearchFilter]
-    search_fields = ['user__username']
+    search_fields = ['subscription__user__username']
 
 
 @method_decorator(name='retrieve', decorator=user_retrieve_installment_payment_swagger)
@@ -91,15 +94,16 @@ class InstallmentPaymentUserAPIView(ReadOnlyModelViewSet):
     """
     Authenticated user API ViewSet for viewing own InstallmentPayment records.
     """
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [CachedJWTAuthentication]
     permission_classes = [IsAuthenticated]
     serializer_class = InstallmentPaymentSerializer
+    cursor_ordering = 'id'
 
     def get_queryset(self):
         """
         Restrict queryset to the authenticated user's installment payments.
         """
-        return InstallmentPayment.objects.filter(user=self.request.user)
+        return InstallmentPayment.objects.filter(subscription__user=self.request.user)
 
 
 @method_decorator(name='create', decorator=admin_create_immediate_payment_swagger)
@@ -112,12 +116,13 @@ class ImmediatePaymentAdminAPIView(ModelViewSet):
     """
     Admin-only API ViewSet for managing ImmediatePayment records.
     """
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [CachedJWTAuthentication]
     permission_classes = [IsAdminUser]
     serializer_class = ImmediatePaymentSerializer
+    cursor_ordering = '-id'
     queryset = ImmediatePayment.objects.all()
     filter_backends = [filters.SearchFilter]
-    search_fields = ['user__username']
+    search_fields = ['subscription__user__username']
 
 
 @method_decorator(name='retrieve', decorator=user_retrieve_immediate_payment_swagger)
@@ -126,12 +131,13 @@ class ImmediatePaymentUserAPIView(ReadOnlyModelViewSet):
     """
     Authenticated user API ViewSet for viewing own ImmediatePayment records.
     """
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [CachedJWTAuthentication]
     permission_classes = [IsAuthenticated]
     serializer_class = ImmediatePaymentSerializer
+    cursor_ordering = '-id'
 
     def get_queryset(self):
         """
         Restrict queryset to the authenticated user's immediate payments.
         """
-        return ImmediatePayment.objects.filter(user=self.request.user)
\ No newline at end of file
+        return ImmediatePayment.objects.filter(subscription__user=self.request.user)
\ No newline at end of file
@@ -31,6 +31,10 @@ class Transaction(BaseModel):
         verbose_name = _("Transaction")
         verbose_name_plural = _("Transactions")
         # ordering = ['-created_at']
+        indexes = [
+            # The user's own transactions, newest first (cursor pagination on -id)
+            models.Index(fields=['user', '-id'], name='transaction_user_id_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.description} ({self.amount})"
\ No newline at end of file
@@ -50,6 +50,9 @@ class Subscription(BaseModel):
         verbose_name = _("Subscription")
         verbose_name_plural = _("Subscriptions")
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at'], name='subscription_created_idx'),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=['user', 'course'],
@@ -91,6 +94,13 @@ class InstallmentPayment(BaseModel):
         verbose_name = _("Installment Payment")
         verbose_name_plural = _("Installment Payments")
         ordering = ['payment_due_date']
+        indexes = [
+            models.Index(fields=['payment_due_date'], name='installment_due_idx'),
+            # Overdue/upcoming lookups only ever look at unpaid installments, a small slice of the table
+            models.Index(
+                fields=['payment_due_date'], condition=models.Q(is_paid=False), name='installment_unpaid_due_idx'
+            ),
+        ]
 
     def __str__(self):
         return f"Installment for {self.subscription} due {self.payment_due_date}"
@@ -122,6 +132,9 @@ class ImmediatePayment(BaseModel):
         verbose_name = _("Immediate Payment")
         verbose_name_plural = _("Immediate Payments")
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at'], name='immediate_created_idx'),
+        ]
 
     def __str__(self):
         return f"Immediate payment for {self.subscription}"
\ No newline at end of file
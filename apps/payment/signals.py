@@ -0,0 +1,63 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from apps.core.metrics import PAYMENT_AMOUNT, PAYMENTS_CREATED
+from apps.package.stats import adjust
+from apps.payment.models.payment import Transaction
+from apps.payment.models.subscription import ImmediatePayment, InstallmentPayment, Subscription
+
+# `kind` label of each payment model in PAYMENTS_CREATED / PAYMENT_AMOUNT
+PAYMENT_KINDS = {
+    Subscription: 'subscription',
+    InstallmentPayment: 'installment',
+    ImmediatePayment: 'immediate',
+    Transaction: 'transaction',
+}
+
+
+@receiver(pre_save, sender=Subscription)
+def remember_subscription_course(sender, instance, raw=False, **kwargs):
+    if instance.pk and not raw:
+        instance._stats_course_id = Subscription.objects.filter(pk=instance.pk).values_list(
+            'course_id', flat=True
+        ).first()
+
+
+@receiver(post_save, sender=Subscription)
+def count_subscription(sender, instance, created, raw=False, **kwargs):
+    """
+    Keep Course.subscriber_count current (see apps.package.stats).
+    """
+    if raw:
+        return
+    previous = getattr(instance, '_stats_course_id', None)
+    if created or previous is None:
+        adjust(instance.course_id, subscriber_count=1)
+    elif previous != instance.course_id:
+        adjust(previous, subscriber_count=-1)
+        adjust(instance.course_id, subscriber_count=1)
+
+
+@receiver(post_delete, sender=Subscription)
+def uncount_subscription(sender, instance, **kwargs):
+    adjust(instance.course_id, subscriber_count=-1)
+
+
+def record_payment(kind, amount):
+    PAYMENTS_CREATED.inc(kind)
+    if amount is not None:
+        PAYMENT_AMOUNT.inc(kind, amount=amount)
+
+
+@receiver(post_save, sender=Subscription)
+@receiver(post_save, sender=InstallmentPayment)
+@receiver(post_save, sender=ImmediatePayment)
+@receiver(post_save, sender=Transaction)
+def count_payment(sender, instance, created, raw=False, **kwargs):
+    """
+    Count new payment records once their transaction commits (bulk_create is not counted).
+    """
+    if created and not raw:
+        kind, amount = PAYMENT_KINDS[sender], getattr(instance, 'amount', None)
+        transaction.on_commit(lambda: record_payment(kind, amount))
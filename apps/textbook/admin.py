@@ -4,7 +4,8 @@ from django.utils.translation import gettext_lazy as _
 
 @admin.register(TextBook)
 class TextBookAdmin(admin.ModelAdmin):
-    list_display = ("title", "pdf_file")  # Fields displayed in list view
+    list_display = ("title", "pdf_file", "processing_status", "page_count")  # Fields displayed in list view
+    list_filter = ("processing_status",)
     search_fields = ("title", "description")     # Searchable fields in admin
     help_text=_("Teachers associated with this course.")
     
\ No newline at end of file
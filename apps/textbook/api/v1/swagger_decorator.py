@@ -1,6 +1,6 @@
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
-from apps.textbook.serializers import TextBookSerializer
+from apps.textbook.serializers import TextBookSerializer, TextBookProcessingStatusSerializer
 
 # TextBookAdminAPIView Decorators
 admin_create_textbook_swagger = swagger_auto_schema(
@@ -8,13 +8,15 @@ admin_create_textbook_swagger = swagger_auto_schema(
     operation_description=(
         'This endpoint allows administrators to create a new textbook record. '
         'The request must include required fields such as title and other textbook details. '
-        'The response returns the created textbook details. '
+        'The response is returned as soon as the file is stored, with "processing_status" set to "pending"; '
+        'page count, linearized copy and thumbnail are produced in the background. '
+        'Poll the URL in the "Location" header for the processing status. '
         'This operation is restricted to admin users only and requires JWT authentication.'
     ),
     tags=['admin.textbook'],
     request_body=TextBookSerializer,
     responses={
-        201: TextBookSerializer,
+        202: TextBookSerializer,
         400: 'Invalid input data.',
         401: 'Unauthorized: Valid JWT token required for admin users.',
         403: 'Forbidden: User is not an admin.'
@@ -109,12 +111,12 @@ admin_list_textbook_swagger = swagger_auto_schema(
     operation_description=(
         'This endpoint allows administrators to retrieve a list of all textbook records. '
         'The response includes details for each textbook, such as ID, title, and other textbook information. '
-        'Optional search functionality is available using the "search" query parameter to filter by title. '
+        'Optional search functionality is available using the "search" query parameter to run a full-text search of titles and descriptions. '
         'This operation is restricted to admin users only and requires JWT authentication.'
     ),
     tags=['admin.textbook'],
     manual_parameters=[
-        openapi.Parameter('search', openapi.IN_QUERY, description="Filter textbooks by title (partial match).", type=openapi.TYPE_STRING)
+        openapi.Parameter('search', openapi.IN_QUERY, description="Full-text search in textbook titles and descriptions (prefix match).", type=openapi.TYPE_STRING)
     ],
     responses={
         200: TextBookSerializer(many=True),
@@ -123,6 +125,26 @@ admin_list_textbook_swagger = swagger_auto_schema(
     }
 )
 
+admin_processing_status_textbook_swagger = swagger_auto_schema(
+    operation_summary='Textbook Processing Status (Admin)',
+    operation_description=(
+        'This endpoint returns the background processing state of an uploaded textbook: '
+        '"pending", "processing", "ready" or "failed" (with "processing_error"), '
+        'and once ready its page count, file size, linearized copy and thumbnail. '
+        'This operation is restricted to admin users only and requires JWT authentication.'
+    ),
+    tags=['admin.textbook'],
+    manual_parameters=[
+        openapi.Parameter('id', openapi.IN_PATH, description="The unique ID of the textbook.", type=openapi.TYPE_INTEGER)
+    ],
+    responses={
+        200: TextBookProcessingStatusSerializer,
+        401: 'Unauthorized: Valid JWT token required for admin users.',
+        403: 'Forbidden: User is not an admin.',
+        404: 'Not Found: Textbook with the specified ID does not exist.'
+    }
+)
+
 # TextBookPublicAPIView Decorators
 user_retrieve_textbook_swagger = swagger_auto_schema(
     operation_summary='Retrieve Textbook Details (Authenticated)',
@@ -147,15 +169,38 @@ user_list_textbook_swagger = swagger_auto_schema(
     operation_description=(
         'This endpoint allows authenticated users to retrieve a list of all textbook records. '
         'The response includes details for each textbook, such as ID, title, and other textbook information. '
-        'Optional search functionality is available using the "search" query parameter to filter by title. '
+        'Optional search functionality is available using the "search" query parameter to run a full-text search of titles and descriptions. '
         'This operation requires JWT authentication.'
     ),
     tags=['textbook'],
     manual_parameters=[
-        openapi.Parameter('search', openapi.IN_QUERY, description="Filter textbooks by title (partial match).", type=openapi.TYPE_STRING)
+        openapi.Parameter('search', openapi.IN_QUERY, description="Full-text search in textbook titles and descriptions (prefix match).", type=openapi.TYPE_STRING)
     ],
     responses={
         200: TextBookSerializer(many=True),
         401: 'Unauthorized: Valid JWT token required.'
     }
-)
\ No newline at end of file
+)
+user_download_textbook_swagger = swagger_auto_schema(
+    operation_summary='Download Textbook PDF (Authenticated)',
+    operation_description=(
+        'This endpoint allows authenticated users to download the PDF file of a specific textbook by ID. '
+        'Single byte ranges are supported through the "Range" header (e.g. "bytes=0-1048575"), so readers '
+        'can load large textbooks page by page; "If-Range" is honoured. '
+        'Depending on the server configuration the file is sent by the application or by the web server '
+        '(X-Accel-Redirect / X-Sendfile). '
+        'This operation requires JWT authentication.'
+    ),
+    tags=['textbook'],
+    manual_parameters=[
+        openapi.Parameter('id', openapi.IN_PATH, description="The unique ID of the textbook to download.", type=openapi.TYPE_INTEGER),
+        openapi.Parameter('Range', openapi.IN_HEADER, description="Optional byte range, e.g. bytes=0-1048575.", type=openapi.TYPE_STRING, required=False)
+    ],
+    responses={
+        200: 'The whole PDF file.',
+        206: 'The requested byte range of the PDF file.',
+        401: 'Unauthorized: Valid JWT token required.',
+        404: 'Not Found: Textbook with the specified ID does not exist.',
+        416: 'Range Not Satisfiable: The requested range is outside the file.'
+    }
+)
@@ -1,10 +1,17 @@
+from django.urls import reverse
 from django.utils.decorators import method_decorator
-from rest_framework import filters
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet, ReadOnlyModelViewSet
 from rest_framework.permissions import IsAdminUser, IsAuthenticated
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from apps.core.authentication import CachedJWTAuthentication
+from apps.core.conditional import ConditionalGetMixin
+from apps.core.search import FullTextSearchFilter
+from apps.textbook.download import PdfRenderer, textbook_pdf_response
 from apps.textbook.models import TextBook
-from apps.textbook.serializers import TextBookSerializer
+from apps.textbook.serializers import TextBookSerializer, TextBookProcessingStatusSerializer
 from .swagger_decorator import (
     admin_create_textbook_swagger,
     admin_retrieve_textbook_swagger,
@@ -12,8 +19,10 @@ from .swagger_decorator import (
     admin_partial_update_textbook_swagger,
     admin_destroy_textbook_swagger,
     admin_list_textbook_swagger,
+    admin_processing_status_textbook_swagger,
     user_retrieve_textbook_swagger,
     user_list_textbook_swagger,
+    user_download_textbook_swagger,
 )
 
 
@@ -23,27 +32,56 @@ from .swagger_decorator import (
 @method_decorator(name='partial_update', decorator=admin_partial_update_textbook_swagger)
 @method_decorator(name='destroy', decorator=admin_destroy_textbook_swagger)
 @method_decorator(name='list', decorator=admin_list_textbook_swagger)
+@method_decorator(name='processing_status', decorator=admin_processing_status_textbook_swagger)
 class TextBookAdminAPIView(ModelViewSet):
     """
     Admin-only API ViewSet for managing TextBook records.
+    Uploaded PDFs are processed in the background by the `run_textbook_worker` command.
     """
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [CachedJWTAuthentication]
     permission_classes = [IsAdminUser]
     serializer_class = TextBookSerializer
+    cursor_ordering = '-id'
     queryset = TextBook.objects.all()
-    filter_backends = [filters.SearchFilter]
-    search_fields = ['title']
+    filter_backends = [FullTextSearchFilter]
+    search_document = 'textbook'
+
+    def create(self, request, *args, **kwargs):
+        """
+        Store the upload and return right away; processing happens off the request thread.
+        """
+        response = super().create(request, *args, **kwargs)
+        response.status_code = status.HTTP_202_ACCEPTED
+        response['Location'] = reverse('textbook-admin-processing-status', args=[response.data['id']])
+        return response
+
+    @action(detail=True, methods=['get'], url_path='processing-status')
+    def processing_status(self, request, *args, **kwargs):
+        """
+        Lightweight endpoint for polling the processing state after an upload.
+        """
+        textbook = self.get_object()
+        return Response(TextBookProcessingStatusSerializer(textbook, context=self.get_serializer_context()).data)
 
 
 @method_decorator(name='retrieve', decorator=user_retrieve_textbook_swagger)
 @method_decorator(name='list', decorator=user_list_textbook_swagger)
-class TextBookPublicAPIView(ReadOnlyModelViewSet):
+@method_decorator(name='download', decorator=user_download_textbook_swagger)
+class TextBookPublicAPIView(ConditionalGetMixin, ReadOnlyModelViewSet):
     """
-    Authenticated user API ViewSet for viewing TextBook records.
+    Authenticated user API ViewSet for viewing TextBook records and downloading their PDF files.
     """
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [CachedJWTAuthentication]
     permission_classes = [IsAuthenticated]
     serializer_class = TextBookSerializer
+    cursor_ordering = '-id'
     queryset = TextBook.objects.all()
-    filter_backends = [filters.SearchFilter]
-    search_fields = ['title']
\ No newline at end of file
+    filter_backends = [FullTextSearchFilter]
+    search_document = 'textbook'
+
+    @action(detail=True, methods=['get'], renderer_classes=[JSONRenderer, PdfRenderer])
+    def download(self, request, *args, **kwargs):
+        """
+        Stream the textbook PDF, honouring single-range `Range` requests.
+        """
+        return textbook_pdf_response(request, self.get_object())
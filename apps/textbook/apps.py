@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class TextbookConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.textbook'
+
+    def ready(self):
+        from apps.textbook import signals  # noqa: F401
@@ -0,0 +1,175 @@
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.http import FileResponse, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+# Delivery modes:
+#   'stream'           - Django streams the file (sendfile through wsgi.file_wrapper when the server has it)
+#   'x-accel-redirect' - nginx serves the file from an `internal` location mapped to MEDIA_ROOT
+#   'x-sendfile'       - Apache mod_xsendfile / lighttpd serve the file from its filesystem path
+DOWNLOAD_MODES = ('stream', 'x-accel-redirect', 'x-sendfile')
+
+
+def download_setting(key, default):
+    return getattr(settings, 'TEXTBOOK_DOWNLOAD', {}).get(key, default)
+
+
+class FileRange:
+    """
+    Read-only view of `length` bytes of an open file starting at `start`.
+    `fileno()` is exposed so servers with a sendfile-capable `wsgi.file_wrapper` (e.g. gunicorn) can
+    send the range straight from the page cache; they stop after Content-Length bytes.
+    """
+
+    def __init__(self, file, start, length):
+        self.file = file
+        self.file.seek(start)
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size) if size else b''
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+
+def parse_range(header, size):
+    """
+    Return `(start, end)` (inclusive) of a single `bytes=` range, `None` to send the whole file,
+    or raise ValueError when the range cannot be satisfied.
+    Multi-range requests are answered with the whole file, which RFC 9110 allows.
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        return None
+
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+        if start >= size or (last and int(last) < start):
+            raise ValueError(header)
+    elif last:
+        # Suffix range: the last N bytes
+        if not int(last):
+            raise ValueError(header)
+        start, end = max(size - int(last), 0), size - 1
+    else:
+        return None
+    return start, end
+
+
+def file_etag(textbook, size):
+    return f'"{textbook.pk}-{size}-{int(textbook.update_at.timestamp())}"'
+
+
+def if_range_matches(request, etag, last_modified):
+    """
+    A conditional range only applies while the file is unchanged; otherwise the whole file is sent.
+    """
+    if_range = request.headers.get('If-Range')
+    if not if_range:
+        return True
+    if if_range.startswith('"') or if_range.startswith('W/'):
+        return if_range == etag
+    since = parse_http_date_safe(if_range)
+    return since is not None and int(last_modified) <= since
+
+
+def served_file(textbook):
+    """
+    The linearized copy once processing is done, so viewers can show page 1 early; the upload until then.
+    """
+    if textbook.processing_status == 'ready' and textbook.linearized_file:
+        return textbook.linearized_file
+    return textbook.pdf_file
+
+
+def textbook_pdf_response(request, textbook):
+    """
+    Build the download response for `textbook.pdf_file` in the configured delivery mode.
+    """
+    field = served_file(textbook)
+    filename = textbook.pdf_file.name.rsplit('/', 1)[-1]
+    mode = download_setting('MODE', 'stream')
+    if mode not in DOWNLOAD_MODES:
+        raise ImproperlyConfigured(f"TEXTBOOK_DOWNLOAD['MODE'] must be one of {DOWNLOAD_MODES}, not {mode!r}.")
+
+    if mode == 'x-accel-redirect':
+        # nginx handles Range and conditional headers itself
+        response = HttpResponse(content_type='application/pdf')
+        response['X-Accel-Redirect'] = download_setting('ACCEL_PREFIX', '/protected-media/') + quote(field.name)
+    elif mode == 'x-sendfile':
+        response = HttpResponse(content_type='application/pdf')
+        response['X-Sendfile'] = field.path
+    else:
+        return _stream_response(request, textbook, filename)
+
+    response['Content-Disposition'] = f'inline; filename="{filename}"'
+    return response
+
+
+def _stream_response(request, textbook, filename):
+    field = served_file(textbook)
+    size = field.size
+    etag = file_etag(textbook, size)
+    last_modified = textbook.update_at.timestamp()
+
+    not_modified = get_conditional_response(request, etag=etag, last_modified=int(last_modified))
+    if not_modified is not None:
+        return not_modified
+
+    byte_range = None
+    range_header = request.headers.get('Range')
+    if range_header and if_range_matches(request, etag, last_modified):
+        try:
+            byte_range = parse_range(range_header, size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+
+    file = field.storage.open(field.name, 'rb')
+    if byte_range is None:
+        response = FileResponse(file, content_type='application/pdf', filename=filename)
+    else:
+        start, end = byte_range
+        response = FileResponse(
+            FileRange(file, start, end - start + 1), status=206, content_type='application/pdf', filename=filename
+        )
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = end - start + 1
+
+    response.block_size = download_setting('CHUNK_SIZE', 64 * 1024)
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    return response
+
+
+class PdfRenderer(BaseRenderer):
+    """
+    Lets clients ask for `Accept: application/pdf` on the download action.
+    The file itself is returned as a Django response and never passes through a renderer,
+    only error payloads do, and those are rendered as JSON.
+    """
+    media_type = 'application/pdf'
+    format = 'pdf'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return JSONRenderer().render(data)
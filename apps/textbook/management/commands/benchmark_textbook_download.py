@@ -0,0 +1,91 @@
+import os
+import random
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from apps.core.authentication import AuthRefreshToken
+from apps.textbook.download import DOWNLOAD_MODES
+from apps.textbook.models import TextBook
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the textbook download modes in-process: how long a worker is busy per request and how many '
+        'bytes it copies itself. In the accelerated modes the web server sends the file, so the worker time '
+        'is what a request costs the app server; measure end-to-end throughput against nginx/Apache separately.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--textbook', type=int, help='Benchmark an existing textbook instead of a generated file.')
+        parser.add_argument('--size-mb', type=int, default=50, help='Size of the generated PDF (default: 50).')
+        parser.add_argument('--requests', type=int, default=20, help='Requests per mode and kind (default: 20).')
+        parser.add_argument('--range-kb', type=int, default=1024, help='Size of each ranged request (default: 1024).')
+        parser.add_argument('--mode', action='append', dest='modes', choices=DOWNLOAD_MODES, help='Only these modes.')
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(is_active=True).first()
+        if user is None:
+            raise CommandError('At least one active user is needed to authenticate the requests.')
+        client = Client(HTTP_AUTHORIZATION=f'Bearer {AuthRefreshToken.for_user(user).access_token}')
+
+        if options['textbook']:
+            textbook = TextBook.objects.filter(pk=options['textbook']).first()
+            if textbook is None:
+                raise CommandError(f'Textbook {options["textbook"]} does not exist.')
+            generated = False
+        else:
+            textbook = TextBook(title='download benchmark', description='generated by benchmark_textbook_download')
+            textbook.pdf_file.save(
+                'benchmark.pdf', ContentFile(b'%PDF-1.4\n' + os.urandom(options['size_mb'] * 1024 * 1024))
+            )
+            generated = True
+
+        try:
+            size = textbook.pdf_file.size
+            url = reverse('textbook-user-download', args=[textbook.pk])
+            range_size = options['range_kb'] * 1024
+            self.stdout.write(f'Textbook {textbook.pk}: {size / 1024 / 1024:.1f} MiB, {options["requests"]} request(s) per row\n')
+            self.stdout.write(f'{"mode":<18}{"kind":<8}{"worker ms/req":>15}{"p95 ms":>10}{"copied MiB/req":>16}{"MiB/s":>10}')
+
+            for mode in options['modes'] or DOWNLOAD_MODES:
+                config = {**getattr(settings, 'TEXTBOOK_DOWNLOAD', {}), 'MODE': mode}
+                with override_settings(TEXTBOOK_DOWNLOAD=config):
+                    self.report(mode, 'full', [self.fetch(client, url) for _ in range(options['requests'])])
+                    ranges = []
+                    for _ in range(options['requests']):
+                        start = random.randrange(0, max(size - range_size, 1))
+                        ranges.append(self.fetch(client, url, HTTP_RANGE=f'bytes={start}-{start + range_size - 1}'))
+                    self.report(mode, 'range', ranges)
+        finally:
+            if generated:
+                textbook.pdf_file.delete(save=False)
+                textbook.delete()
+
+    def fetch(self, client, url, **headers):
+        """
+        Time a request until the worker has produced the whole body, as a WSGI server would consume it.
+        """
+        started = time.perf_counter()
+        response = client.get(url, **headers)
+        if response.status_code not in (200, 206):
+            raise CommandError(f'GET {url} returned {response.status_code}.')
+        copied = sum(len(chunk) for chunk in response.streaming_content) if response.streaming else len(response.content)
+        response.close()
+        return time.perf_counter() - started, copied
+
+    def report(self, mode, kind, samples):
+        durations = sorted(duration for duration, _ in samples)
+        copied = statistics.mean(size for _, size in samples)
+        mean = statistics.mean(durations)
+        p95 = durations[min(int(len(durations) * 0.95), len(durations) - 1)]
+        self.stdout.write(
+            f'{mode:<18}{kind:<8}{mean * 1000:>15.2f}{p95 * 1000:>10.2f}'
+            f'{copied / 1024 / 1024:>16.2f}{copied / 1024 / 1024 / mean:>10.1f}'
+        )
@@ -0,0 +1,69 @@
+import logging
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from apps.textbook.processing import (
+    analyze_pdf, claim_textbooks, local_copy, mark_failed, processing_setting, save_results,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        'Post-process uploaded textbook PDFs: page count and size, a linearized copy and a cover thumbnail. '
+        'The PDF work runs in a pool of worker processes.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, help='Worker processes (default: TEXTBOOK_PROCESSING["WORKERS"]).')
+        parser.add_argument('--once', action='store_true', help='Process every pending textbook, then exit.')
+
+    def handle(self, *args, **options):
+        workers = options['workers'] or processing_setting('WORKERS')
+        batch_size = max(processing_setting('BATCH_SIZE'), workers)
+        poll_interval = processing_setting('POLL_INTERVAL')
+
+        self.stdout.write(f'Textbook worker started with {workers} process(es)')
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            try:
+                while True:
+                    textbooks = claim_textbooks(batch_size)
+                    if textbooks:
+                        self.process(executor, textbooks)
+                        continue
+                    if options['once']:
+                        break
+                    time.sleep(poll_interval)
+            except KeyboardInterrupt:
+                pass
+
+    def process(self, executor, textbooks):
+        jobs = []
+        with tempfile.TemporaryDirectory() as workdir:
+            for textbook in textbooks:
+                try:
+                    source, temporary = local_copy(textbook.pdf_file)
+                except Exception as e:
+                    logger.exception('Could not read the PDF of textbook %s', textbook.pk)
+                    mark_failed(textbook, e)
+                    continue
+                linearized = os.path.join(workdir, f'{textbook.pk}.pdf')
+                future = executor.submit(analyze_pdf, source, linearized, processing_setting('THUMBNAIL_WIDTH'))
+                jobs.append((textbook, future, linearized, source if temporary else None))
+
+            for textbook, future, linearized, temporary_source in jobs:
+                try:
+                    result = future.result()
+                    if save_results(textbook, linearized, result):
+                        self.stdout.write(f'Textbook {textbook.pk}: {result["page_count"]} page(s)')
+                except Exception as e:
+                    logger.exception('Processing textbook %s failed', textbook.pk)
+                    mark_failed(textbook, e)
+                finally:
+                    if temporary_source:
+                        os.unlink(temporary_source)
@@ -6,11 +6,37 @@ class TextBook(BaseModel):
     Stores information about textbooks.
     Each textbook has a title, body (description/content),
     and an uploaded PDF file.
+    Uploaded files are post-processed by the `run_textbook_worker` command
+    (page count, linearized copy, cover thumbnail).
     """
+    slug_source = 'title'
+
+    PROCESSING_STATUS_CHOICES = [
+        ("pending", "Pending"),        # Waiting to be picked up by a worker
+        ("processing", "Processing"),  # Claimed by a worker
+        ("ready", "Ready"),            # Metadata, linearized copy and thumbnail are available
+        ("failed", "Failed"),          # Gave up after the maximum number of attempts
+    ]
+
     title = models.CharField(max_length=255)  # Title of the textbook
     description = models.TextField()                 # Description or content
-    pdf_file = models.FileField(upload_to="textbooks/", verbose_name="PDF File")  
+    pdf_file = models.FileField(upload_to="textbooks/", verbose_name="PDF File")
     # FileField with upload path set to 'media/textbooks/'
 
+    processing_status = models.CharField(max_length=10, choices=PROCESSING_STATUS_CHOICES, default="pending")
+    processing_attempts = models.PositiveIntegerField(default=0)  # Number of processing attempts so far
+    processing_locked_at = models.DateTimeField(null=True, blank=True)  # When a worker claimed the textbook
+    processing_error = models.TextField(blank=True, default="")  # Error from the last failed attempt
+    processed_at = models.DateTimeField(null=True, blank=True)
+    page_count = models.PositiveIntegerField(null=True, blank=True)
+    file_size = models.PositiveBigIntegerField(null=True, blank=True)  # Size of the uploaded PDF in bytes
+    linearized_file = models.FileField(upload_to="textbooks/linearized/", null=True, blank=True)  # "Fast web view" copy
+    thumbnail = models.ImageField(upload_to="textbooks/thumbnails/", null=True, blank=True)  # Cover (first page)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["processing_status", "processing_locked_at"]),
+        ]
+
     def __str__(self):
         return f'Title: {self.title}'
@@ -0,0 +1,156 @@
+import io
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.base import ContentFile
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.textbook.models import TextBook
+
+PROCESSING_DEFAULTS = {
+    'WORKERS': 2,
+    'BATCH_SIZE': 4,
+    'MAX_ATTEMPTS': 3,
+    'LEASE_TIMEOUT': 600,
+    'POLL_INTERVAL': 2,
+    'THUMBNAIL_WIDTH': 480,
+}
+
+
+def processing_setting(key):
+    """
+    Read a value from settings.TEXTBOOK_PROCESSING, falling back to PROCESSING_DEFAULTS.
+    """
+    return getattr(settings, 'TEXTBOOK_PROCESSING', {}).get(key, PROCESSING_DEFAULTS[key])
+
+
+def analyze_pdf(source_path, linearized_path, thumbnail_width):
+    """
+    CPU-bound part of the pipeline. Runs in a worker process and touches neither the ORM nor storage.
+    Writes the linearized copy to `linearized_path` and returns the metadata and the JPEG cover.
+    """
+    # Imported here so web processes do not need the PDF libraries
+    import pikepdf
+    import pypdfium2
+
+    with pikepdf.open(source_path) as pdf:
+        page_count = len(pdf.pages)
+        # Linearized ("fast web view") files put the first page and the page index up front,
+        # so viewers using Range requests can render page 1 before the rest arrives
+        pdf.save(linearized_path, linearize=True)
+
+    document = pypdfium2.PdfDocument(source_path)
+    try:
+        page = document[0]
+        width = page.get_width()
+        image = page.render(scale=thumbnail_width / width).to_pil().convert('RGB')
+    finally:
+        document.close()
+
+    thumbnail = io.BytesIO()
+    image.save(thumbnail, format='JPEG', quality=82, optimize=True, progressive=True)
+    return {
+        'page_count': page_count,
+        'file_size': os.path.getsize(source_path),
+        'thumbnail': thumbnail.getvalue(),
+    }
+
+
+def claim_textbooks(batch_size):
+    """
+    Atomically claim up to `batch_size` textbooks waiting for processing.
+    Textbooks left in "processing" by a worker that died are reclaimed after the lease timeout.
+    """
+    now = timezone.now()
+    lease_expired = now - timedelta(seconds=processing_setting('LEASE_TIMEOUT'))
+
+    with transaction.atomic():
+        queryset = TextBook.objects.filter(
+            Q(processing_status='pending') | Q(processing_status='processing', processing_locked_at__lt=lease_expired)
+        ).order_by('id')
+
+        if connection.features.has_select_for_update_skip_locked:
+            queryset = queryset.select_for_update(skip_locked=True)
+
+        ids = list(queryset.values_list('id', flat=True)[:batch_size])
+        TextBook.objects.filter(id__in=ids).update(processing_status='processing', processing_locked_at=now)
+
+    return list(TextBook.objects.filter(id__in=ids))
+
+
+def local_copy(field_file):
+    """
+    Path of the file on the local filesystem, copying it to a temporary file for remote storages.
+    Returns `(path, is_temporary)`.
+    """
+    try:
+        return field_file.path, False
+    except NotImplementedError:
+        with field_file.open('rb') as source, tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as target:
+            shutil.copyfileobj(source, target)
+        return target.name, True
+
+
+def save_results(textbook, linearized_path, result):
+    """
+    Store the outputs of `analyze_pdf` and mark the textbook ready.
+    Nothing is recorded if the PDF was replaced while it was being processed; the new file is queued anyway.
+    """
+    fields = [textbook.linearized_file, textbook.thumbnail]
+    previous = [field.name for field in fields]
+    basename = os.path.splitext(os.path.basename(textbook.pdf_file.name))[0]
+    with open(linearized_path, 'rb') as linearized:
+        textbook.linearized_file.save(f'{basename}.pdf', File(linearized), save=False)
+    textbook.thumbnail.save(f'{basename}.jpg', ContentFile(result['thumbnail']), save=False)
+
+    now = timezone.now()
+    updated = TextBook.objects.filter(
+        pk=textbook.pk, pdf_file=textbook.pdf_file.name, processing_status='processing'
+    ).update(
+        linearized_file=textbook.linearized_file.name,
+        thumbnail=textbook.thumbnail.name,
+        page_count=result['page_count'],
+        file_size=result['file_size'],
+        processing_status='ready',
+        processing_error='',
+        processing_locked_at=None,
+        processed_at=now,
+        update_at=now,
+    )
+
+    stale = previous if updated else [field.name for field in fields]
+    for field, name in zip(fields, stale):
+        if name:
+            field.storage.delete(name)
+    return bool(updated)
+
+
+def mark_failed(textbook, error):
+    """
+    Record a failed attempt; the textbook is retried until TEXTBOOK_PROCESSING['MAX_ATTEMPTS'].
+    """
+    attempts = textbook.processing_attempts + 1
+    TextBook.objects.filter(pk=textbook.pk, pdf_file=textbook.pdf_file.name, processing_status='processing').update(
+        processing_attempts=attempts,
+        processing_error=str(error),
+        processing_locked_at=None,
+        processing_status='failed' if attempts >= processing_setting('MAX_ATTEMPTS') else 'pending',
+        update_at=timezone.now(),
+    )
+
+
+def reset_processing(textbook):
+    """
+    Queue the textbook for processing again, e.g. after its PDF was replaced.
+    Downloads use the uploaded file until the new outputs are ready.
+    """
+    textbook.processing_status = 'pending'
+    textbook.processing_attempts = 0
+    textbook.processing_error = ''
+    textbook.processing_locked_at = None
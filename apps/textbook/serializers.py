@@ -1,9 +1,29 @@
 from rest_framework import serializers
 
+from apps.core.uploads import ChunkedUploadSerializerMixin
 from apps.textbook.models import TextBook
 
+# Filled in by the `run_textbook_worker` command
+PROCESSING_FIELDS = [
+    'processing_status', 'processing_error', 'processed_at', 'page_count', 'file_size', 'linearized_file', 'thumbnail',
+]
 
-class TextBookSerializer(serializers.ModelSerializer):
+
+class TextBookSerializer(ChunkedUploadSerializerMixin, serializers.ModelSerializer):
+    # Large PDFs can be sent through the chunked upload API and attached with `pdf_file_upload`
+    chunked_upload_fields = {'pdf_file': 'textbook.pdf_file'}
+
+    class Meta:
+        model = TextBook
+        exclude = ['processing_attempts', 'processing_locked_at']
+        read_only_fields = PROCESSING_FIELDS
+
+
+class TextBookProcessingStatusSerializer(serializers.ModelSerializer):
+    """
+    Processing state of an uploaded textbook, for clients polling after an upload.
+    """
     class Meta:
         model = TextBook
-        fields = '__all__'
+        fields = ['id', *PROCESSING_FIELDS]
+        read_only_fields = fields
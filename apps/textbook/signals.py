@@ -0,0 +1,18 @@
+from django.db.models.signals import pre_save
+from django.dispatch import receiver
+
+from apps.textbook.models import TextBook
+from apps.textbook.processing import reset_processing
+
+
+@receiver(pre_save, sender=TextBook)
+def reprocess_replaced_pdf(sender, instance, raw=False, update_fields=None, **kwargs):
+    """
+    A replaced PDF has to be processed again, however it was saved (API, admin or code);
+    until then downloads use the new file instead of the old linearized copy.
+    """
+    if raw or not instance.pk or (update_fields is not None and 'pdf_file' not in update_fields):
+        return
+    previous = TextBook.objects.filter(pk=instance.pk).values_list('pdf_file', flat=True).first()
+    if previous is not None and previous != instance.pdf_file.name:
+        reset_processing(instance)
@@ -1,3 +1,84 @@
-from django.test import TestCase
+import tempfile
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from apps.core.authentication import AuthRefreshToken
+from apps.textbook.download import parse_range
+from apps.textbook.models import TextBook
+
+
+class ParseRangeTests(SimpleTestCase):
+
+    def test_satisfiable_ranges(self):
+        cases = {
+            'bytes=0-99': (0, 99),
+            'bytes=900-': (900, 999),
+            'bytes=990-5000': (990, 999),  # End clamped to the file
+            'bytes=-100': (900, 999),      # Suffix: the last 100 bytes
+            'bytes=-5000': (0, 999),
+            ' bytes=5-5 ': (5, 5),
+        }
+        for header, expected in cases.items():
+            self.assertEqual(parse_range(header, 1000), expected, header)
+
+    def test_whole_file(self):
+        for header in ('bytes=0-1,5-6', 'items=0-1', 'bytes=-', 'bytes=a-b', ''):
+            self.assertIsNone(parse_range(header, 1000), header)
+
+    def test_unsatisfiable_ranges(self):
+        for header in ('bytes=1000-', 'bytes=1000-1001', 'bytes=5-2', 'bytes=-0'):
+            with self.assertRaises(ValueError, msg=header):
+                parse_range(header, 1000)
+
+
+@override_settings(TEXTBOOK_DOWNLOAD={'MODE': 'stream'})
+class DownloadTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.media_root = tempfile.TemporaryDirectory()
+        cls.enterClassContext(override_settings(MEDIA_ROOT=cls.media_root.name))
+        cls.addClassCleanup(cls.media_root.cleanup)
+        super().setUpClass()
+
+    def setUp(self):
+        self.content = bytes(range(256)) * 4
+        self.textbook = TextBook(title='Algebra', description='')
+        self.textbook.pdf_file.save('algebra.pdf', ContentFile(self.content))
+        self.url = reverse('textbook-user-download', args=[self.textbook.pk])
+        user = User.objects.create(username='09120000000')
+        self.client.defaults['HTTP_AUTHORIZATION'] = f'Bearer {AuthRefreshToken.for_user(user).access_token}'
+
+    def get(self, headers=None):
+        return self.client.get(self.url, headers=headers)
+
+    def test_whole_file(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.content)
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+
+    def test_range(self):
+        response = self.get({'Range': 'bytes=10-19'})
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], 'bytes 10-19/1024')
+        self.assertEqual(response['Content-Length'], '10')
+        self.assertEqual(b''.join(response.streaming_content), self.content[10:20])
+
+    def test_unsatisfiable_range(self):
+        response = self.get({'Range': 'bytes=2000-'})
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */1024')
+
+    def test_if_range(self):
+        etag = self.get()['ETag']
+        self.assertEqual(self.get({'Range': 'bytes=0-9', 'If-Range': etag}).status_code, 206)
+        # The file changed since the client's copy: send all of it
+        self.assertEqual(self.get({'Range': 'bytes=0-9', 'If-Range': '"stale"'}).status_code, 200)
+
+    def test_not_modified(self):
+        etag = self.get()['ETag']
+        self.assertEqual(self.get({'If-None-Match': etag}).status_code, 304)
@@ -44,17 +44,21 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 
     # Third-party apps
     'corsheaders',
     'rest_framework',
     'drf_yasg',
     'rest_framework_simplejwt',
+    'rest_framework_simplejwt.token_blacklist',
     'django_filters',
 
 ]
 
 MIDDLEWARE = [
+    'apps.core.profiling.ProfilingMiddleware',  # First, to time the whole request; off unless PROFILING['ENABLED']
+    'apps.core.metrics.MetricsMiddleware',
     'django.middleware.common.CommonMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
@@ -129,3 +133,264 @@ MEDIA_ROOT = f'{BASE_DIR}/media/'
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# Set REDIS_URL when running more than one process; the local-memory cache is per process.
+# OTP codes and rate-limit counters live in the 'otp' alias, so the catalog entries filling 'default'
+# cannot evict them. REDIS_OTP_URL can point it at a Redis database that never evicts (noeviction).
+
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        },
+        'otp': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ.get('REDIS_OTP_URL', os.environ['REDIS_URL']),
+            'KEY_PREFIX': 'otp',
+        },
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        },
+        'otp': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'otp',
+            'OPTIONS': {
+                'MAX_ENTRIES': 100_000,
+            },
+        },
+    }
+
+
+# OTP storage
+# CacheOtpStore keeps codes out of the database; DatabaseOtpStore uses the OtpCode table.
+
+OTP_STORE = {
+    'BACKEND': os.environ.get('OTP_STORE_BACKEND', 'apps.core.otp.CacheOtpStore'),
+    'CACHE_ALIAS': 'otp',
+    'TTL': 120,             # Seconds a code stays valid
+    'MAX_ATTEMPTS': 5,      # Wrong codes allowed before the code is discarded
+}
+
+
+# JWT authentication cache
+# CachedJWTAuthentication keeps validated tokens in a per-process LRU and builds a new user for every
+# request from the token claims (username, is_active, is_staff, is_superuser).
+# Claims are only trusted when CACHE_ALIAS is shared (Redis), since edits are announced through it;
+# with the local-memory cache users are loaded from the database once per token and MAX_AGE.
+# MAX_AGE bounds how long another process may serve a stale user after an admin edits it.
+
+JWT_AUTH_CACHE = {
+    'MAX_SIZE': 10_000,
+    'MAX_AGE': 60,
+    'CACHE_ALIAS': 'default',
+}
+
+
+# Refresh token blacklist
+# Checked through an in-memory Bloom filter; run `manage.py prune_token_blacklist` periodically.
+
+JWT_BLACKLIST = {
+    'FALSE_POSITIVE_RATE': 0.01,
+    'EXACT_CACHE_SIZE': 1024,   # Bloom filter hits remembered per process
+    'REBUILD_INTERVAL': 3600,   # Seconds between full rebuilds of the filter
+    'CACHE_ALIAS': 'default',
+}
+
+
+# Auth rate limits
+# Scopes are '<view throttle_scope>.<ip|phone>'; rates are '<requests>/<period>', e.g. '3/10m'.
+# Use LocalRateLimitBackend only when running a single process.
+
+RATE_LIMIT = {
+    'BACKEND': os.environ.get('RATE_LIMIT_BACKEND', 'apps.core.ratelimit.CacheRateLimitBackend'),
+    'CACHE_ALIAS': 'otp',
+    'RATES': {
+        'send_otp.phone': '3/5m',
+        'send_otp.ip': '20/h',
+        'verify_otp.phone': '10/5m',
+        'verify_otp.ip': '60/h',
+    },
+}
+
+
+# Outbound SMS
+# Messages are queued in the database by the request path and delivered by `manage.py run_sms_worker`.
+# Bodies are cleared once a message is sent or given up on; run `manage.py prune_sms_queue` periodically.
+
+SMS_DEFAULT_PROVIDER = os.environ.get('SMS_DEFAULT_PROVIDER', 'default')
+
+SMS_PROVIDERS = {
+    'default': {
+        'BACKEND': 'apps.core.sms.providers.HttpSmsProvider',
+        'URL': os.environ.get('SMS_PROVIDER_URL', ''),
+        'BULK_URL': os.environ.get('SMS_PROVIDER_BULK_URL', ''),
+        'BULK_SIZE': 100,
+        'CONCURRENCY': int(os.environ.get('SMS_PROVIDER_CONCURRENCY', 4)),
+        'CONNECT_TIMEOUT': 3,
+        'READ_TIMEOUT': 10,
+        'BREAKER_FAILURE_THRESHOLD': 5,  # Consecutive failures before the circuit opens
+        'BREAKER_RESET_TIMEOUT': 30,     # Seconds before a trial call is let through
+    },
+    'console': {
+        'BACKEND': 'apps.core.sms.providers.ConsoleSmsProvider',
+    },
+    # Local stand-in started with `manage.py run_fake_sms_provider`
+    'fake': {
+        'BACKEND': 'apps.core.sms.providers.HttpSmsProvider',
+        'URL': 'http://127.0.0.1:8025/send',
+        'BULK_URL': 'http://127.0.0.1:8025/bulk',
+        'BULK_SIZE': 100,
+        'CONCURRENCY': 4,
+    },
+}
+
+SMS_QUEUE = {
+    'BATCH_SIZE': 100,
+    'MAX_ATTEMPTS': 5,
+    'RETRY_BACKOFF': 5,         # Seconds before the first retry, doubled after every failure
+    'RETRY_BACKOFF_MAX': 600,
+    'LEASE_TIMEOUT': 120,       # Reclaim messages from workers that died mid-send
+    'POLL_INTERVAL': 1,
+    'STATS_INTERVAL': 60,       # Seconds between provider stats log lines
+    'RETENTION': 604800,        # Seconds (7 days) sent and failed messages are kept by `prune_sms_queue`
+}
+
+
+# Public catalog cache
+# Pre-rendered JSON of the public course/season/lesson/category/FAQ endpoints, invalidated by
+# apps.package.signals. Fill it after a deploy with `manage.py warm_catalog_cache`.
+
+CATALOG_CACHE = {
+    'CACHE_ALIAS': 'default',
+    'TIMEOUT': 60 * 60 * 24,
+}
+
+
+# Textbook PDF downloads
+# MODE 'stream' sends files from Django (Range supported, sendfile through the WSGI server's file wrapper).
+# 'x-accel-redirect' hands them to nginx: add an `internal` location at ACCEL_PREFIX aliased to MEDIA_ROOT.
+# 'x-sendfile' hands them to Apache mod_xsendfile / lighttpd by filesystem path.
+
+TEXTBOOK_DOWNLOAD = {
+    'MODE': os.environ.get('TEXTBOOK_DOWNLOAD_MODE', 'stream'),
+    'ACCEL_PREFIX': '/protected-media/',
+    'CHUNK_SIZE': 64 * 1024,
+}
+
+
+# Textbook PDF processing
+# Done by `manage.py run_textbook_worker` (page count, linearized copy, cover thumbnail).
+
+TEXTBOOK_PROCESSING = {
+    'WORKERS': int(os.environ.get('TEXTBOOK_PROCESSING_WORKERS', 2)),  # Worker processes
+    'BATCH_SIZE': 4,
+    'MAX_ATTEMPTS': 3,
+    'LEASE_TIMEOUT': 600,       # Reclaim textbooks from workers that died mid-processing
+    'POLL_INTERVAL': 2,
+    'THUMBNAIL_WIDTH': 480,
+}
+
+
+# Resumable chunked uploads
+# Start a session at /api/v1/core/admin/uploads/, PATCH the chunks, then pass its token as `<field>_upload`.
+# Chunks are written in place under MEDIA_ROOT, so this needs the filesystem storage; the proxy's
+# request body limit (e.g. nginx client_max_body_size) must allow MAX_CHUNK_SIZE.
+# Run `manage.py cleanup_expired_uploads` periodically.
+
+CHUNKED_UPLOAD = {
+    'CHUNK_SIZE': 8 * 1024 * 1024,       # Suggested to clients
+    'MAX_CHUNK_SIZE': 32 * 1024 * 1024,
+    'EXPIRES': 60 * 60 * 24,             # Seconds an unfinished upload is kept
+    'TARGETS': {
+        'course.banner': {
+            'FIELD': 'package.Course.banner',
+            'MAX_SIZE': 20 * 1024 * 1024,
+            'EXTENSIONS': ['jpg', 'jpeg', 'png', 'webp'],
+        },
+        'textbook.pdf_file': {
+            'FIELD': 'textbook.TextBook.pdf_file',
+            'MAX_SIZE': 1024 * 1024 * 1024,
+            'EXTENSIONS': ['pdf'],
+        },
+    },
+}
+
+
+# Course banner variants
+# Resized copies listed in `banner_srcset`; generated by `manage.py generate_banner_variants`,
+# or on the first request of a variant that is still missing.
+
+BANNER_VARIANTS = {
+    'WIDTHS': [320, 640, 960, 1280],
+    'FORMATS': ['webp', 'jpeg'],
+    'QUALITY': {'webp': 80, 'jpeg': 82},
+    'WORKERS': 4,               # Resize threads
+    'POLL_INTERVAL': 5,
+}
+
+# Full-text search
+# One search document per object of each type below, kept in sync by signals (apps.core.search).
+# PostgreSQL stores a tsvector, SQLite an FTS5 table. Run `manage.py rebuild_search_index` after
+# changing this or after bulk imports, which bypass the signals. The database must be UTF-8.
+
+SEARCH = {
+    'CONFIG': 'simple',         # PostgreSQL text search configuration; there is no Persian one
+    'LIMIT': 20,
+    'MAX_LIMIT': 100,
+    'DOCUMENTS': {
+        'course': {'MODEL': 'package.Course', 'TITLE': 'title', 'BODY': ['description']},
+        'lesson': {'MODEL': 'package.Lesson', 'TITLE': 'title'},
+        'faq': {'MODEL': 'package.FAQ', 'TITLE': 'question', 'BODY': ['answer']},
+        # AUTHENTICATED: left out of /api/v1/core/search/ for anonymous users
+        'textbook': {'MODEL': 'textbook.TextBook', 'TITLE': 'title', 'BODY': ['description'], 'AUTHENTICATED': True},
+    },
+}
+
+# Bulk admin endpoints
+# POST/PATCH/DELETE <admin endpoint>/bulk/ write a list of rows in one transaction (apps.core.bulk).
+
+BULK = {
+    'MAX_ITEMS': 500,           # Rows per request
+}
+
+# Request profiling
+# Opt-in (PROFILING_ENABLED=1): apps.core.profiling.ProfilingMiddleware sends the query count, database,
+# serializer and total time of each request as a Server-Timing header, logs them to `apps.core.profiling`
+# and warns about query fingerprints repeated N_PLUS_ONE_THRESHOLD times. Admins read the rolling per-view
+# aggregate of the answering process at /api/v1/core/admin/profiling/. Disabled, it costs nothing.
+
+PROFILING = {
+    'ENABLED': os.environ.get('PROFILING_ENABLED') == '1',
+    'SAMPLE_RATE': float(os.environ.get('PROFILING_SAMPLE_RATE', 1.0)),  # Fraction of requests profiled
+    'SERVER_TIMING': True,
+    'N_PLUS_ONE_THRESHOLD': 5,  # Same query shape this often in one request
+    'WINDOW': 1000,             # Requests per view in the aggregate
+}
+
+# Prometheus metrics
+# Request latency and query counts per view action, OTP outcomes, SMS provider latency, JWT auth cache
+# hits and payment creation (apps.core.metrics), scraped at /metrics. Under a pre-fork server (gunicorn),
+# set MULTIPROCESS_DIR to a directory shared by the workers and empty it before the server starts:
+# each process writes its values there every FLUSH_INTERVAL seconds and a scrape adds them up.
+# With TOKEN set, scrapers must send `Authorization: Bearer <token>`.
+
+METRICS = {
+    'ENABLED': os.environ.get('METRICS_ENABLED', '1') == '1',
+    'MULTIPROCESS_DIR': os.environ.get('METRICS_MULTIPROCESS_DIR', ''),
+    'FLUSH_INTERVAL': 5,        # Seconds
+    'TOKEN': os.environ.get('METRICS_TOKEN', ''),
+}
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {'console': {'class': 'logging.StreamHandler'}},
+    'loggers': {'apps.core.profiling': {'handlers': ['console'], 'level': 'INFO', 'propagate': False}},
+}
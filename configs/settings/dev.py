@@ -49,10 +49,15 @@ CORS_ALLOW_METHODS = [
 # JWT token settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.core.authentication.CachedJWTAuthentication',
     ),
+    'DEFAULT_PAGINATION_CLASS': 'apps.core.pagination.KeysetPagination',
+    'PAGE_SIZE': 20,
 }
 
+# Upper bound for the `page_size` query parameter
+PAGINATION_MAX_PAGE_SIZE = 100
+
 
 SIMPLE_JWT = {
 
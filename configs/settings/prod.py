@@ -0,0 +1,113 @@
+from datetime import timedelta
+
+from configs.settings.base import *
+
+DEBUG = False
+
+SECRET_KEY = os.environ['PROD_SECRET_KEY']
+
+ALLOWED_HOSTS = [host for host in os.environ.get('PROD_ALLOWED_HOSTS', '').split(',') if host]
+
+
+# Database
+# https://docs.djangoproject.com/en/5.1/ref/databases/#persistent-connections
+# https://docs.djangoproject.com/en/5.1/ref/databases/#connection-pool
+# Without PROD_DB_POOL every worker thread keeps its connection open for PROD_DB_CONN_MAX_AGE seconds
+# instead of connecting on each request. With PROD_DB_POOL=1 the process shares a psycopg 3 pool
+# (needs `psycopg[pool]`; psycopg2 has no pool support), which also caps the connections per process
+# at MAX_SIZE: keep workers * MAX_SIZE below the server's max_connections.
+# Health checks drop a connection that died while idle before a request uses it.
+# Measure with `manage.py benchmark_requests`; see "Database connections" in README.md.
+
+PROD_DB_POOL = os.environ.get('PROD_DB_POOL') == '1'
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': os.environ.get('PROD_DB_NAME'),
+        'USER': os.environ.get('PROD_DB_USER'),
+        'PASSWORD': os.environ.get('PROD_DB_PASSWORD'),
+        'HOST': os.environ.get('PROD_DB_HOST'),
+        'PORT': os.environ.get('PROD_DB_PORT'),
+        # The pool keeps the connections itself; Django refuses a persistent connection on top of it
+        'CONN_MAX_AGE': 0 if PROD_DB_POOL else int(os.environ.get('PROD_DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {},
+    }
+}
+
+if PROD_DB_POOL:
+    # CONN_HEALTH_CHECKS makes Django check each connection as it is taken from the pool
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'min_size': int(os.environ.get('PROD_DB_POOL_MIN_SIZE', 2)),
+        'max_size': int(os.environ.get('PROD_DB_POOL_MAX_SIZE', 10)),
+        'timeout': int(os.environ.get('PROD_DB_POOL_TIMEOUT', 10)),  # Seconds to wait for a free connection
+        'max_idle': 300,
+    }
+
+
+# Cache
+# OTP codes, rate limits, token change stamps, the refresh token blacklist and the catalog cache have to
+# be shared by every worker process; the local-memory fallback of base.py would silently break them.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ['REDIS_URL'],
+    },
+    'otp': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ.get('REDIS_OTP_URL', os.environ['REDIS_URL']),
+        'KEY_PREFIX': 'otp',
+    },
+}
+
+# /metrics is only served to scrapers sending `Authorization: Bearer <METRICS_TOKEN>`
+METRICS = {**METRICS, 'TOKEN': os.environ['METRICS_TOKEN']}
+
+# CORS Configuration
+CORS_ALLOWED_ORIGINS = [origin for origin in os.environ.get('PROD_CORS_ALLOWED_ORIGINS', '').split(',') if origin]
+
+
+CORS_ALLOW_HEADERS = [
+    "accept",
+    "authorization",
+    "content-type",
+    "user-agent",
+    "x-csrftoken",
+    "x-requested-with",
+]
+
+CORS_ALLOW_METHODS = [
+    "GET",
+    "POST",
+    "PUT",
+    "PATCH",
+    "DELETE",
+    "OPTIONS",
+]
+
+# JWT token settings
+REST_FRAMEWORK = {
+    'DEFAULT_AUTHENTICATION_CLASSES': (
+        'apps.core.authentication.CachedJWTAuthentication',
+    ),
+    'DEFAULT_PAGINATION_CLASS': 'apps.core.pagination.KeysetPagination',
+    'PAGE_SIZE': 20,
+}
+
+# Upper bound for the `page_size` query parameter
+PAGINATION_MAX_PAGE_SIZE = 100
+
+
+SIMPLE_JWT = {
+
+    'ACCESS_TOKEN_LIFETIME': timedelta(days=15),
+    'SLIDING_TOKEN_REFRESH_LIFETIME': timedelta(days=15),
+    'SLIDING_TOKEN_LIFETIME': timedelta(days=30),
+    'SLIDING_TOKEN_REFRESH_LIFETIME_LATE_USER': timedelta(days=15),
+    'SLIDING_TOKEN_LIFETIME_LATE_USER': timedelta(days=30),
+    'BLACKLIST_AFTER_ROTATION': True,
+    'ROTATE_REFRESH_TOKENS': False,
+
+}
@@ -22,6 +22,8 @@ from drf_yasg import openapi
 from drf_yasg.views import get_schema_view
 from rest_framework import permissions
 
+from apps.core.views import metrics_view
+
 schema_view = get_schema_view(
    openapi.Info(
       title="Hosein Academy Title",
@@ -47,6 +49,9 @@ urlpatterns = [
     path('api/v1/payment/', include('apps.payment.api.v1.routers')),
     path('api/v1/textbook/', include('apps.textbook.api.v1.routers')),
 
+    # Prometheus scrape endpoint
+    path('metrics', metrics_view, name='metrics'),
+
 ]
 
 if settings.DEBUG: